@@ -1,27 +1,46 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from .auth_jwt import verify_token
-from db.database import get_db
+from .user_cache import AuthenticatedUser, user_cache
+from db.database import get_async_db
 from db.models import User
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+async def load_authenticated_user(db: AsyncSession, username: str) -> Optional[AuthenticatedUser]:
+    """
+    Get the user snapshot for a token subject, from the cache or the database
+    """
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+    
+    result = await db.execute(select(User).where(User.username == username))
+    db_user = result.scalars().first()
+    if db_user is None:
+        return None
+    
+    user = AuthenticatedUser.from_model(db_user)
+    user_cache.set(username, user)
+    return user
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
     """
     Get current user from JWT token
     """
     # Verify token and get username
     username = verify_token(token)
     
-    # Get user from database
-    user = db.query(User).filter(User.username == username).first()
+    # Get user from cache or database
+    user = await load_authenticated_user(db, username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,8 +57,8 @@ async def get_current_user(
     return user
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     Get current active user (additional dependency for extra security)
     """
@@ -53,8 +72,8 @@ async def get_current_active_user(
 # Optional: For routes that may or may not require authentication
 async def get_current_user_optional(
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[AuthenticatedUser]:
     """
     Get current user from JWT token (optional - returns None if no token)
     """
@@ -63,7 +82,7 @@ async def get_current_user_optional(
     
     try:
         username = verify_token(token)
-        user = db.query(User).filter(User.username == username).first()
+        user = await load_authenticated_user(db, username)
         return user if user and user.is_active else None
     except:
         return None
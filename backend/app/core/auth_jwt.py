@@ -1,9 +1,13 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import hashlib
+import threading
+import time
 import jwt
 from fastapi import HTTPException, status
 from pydantic import BaseModel
-from .config import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+from .config import settings, JWT_SECRET_KEY, JWT_ALGORITHM, JWT_ACCESS_TOKEN_EXPIRE_MINUTES
 
 # Use configuration from settings
 SECRET_KEY = JWT_SECRET_KEY
@@ -17,6 +21,67 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
 
+class VerifiedTokenCache:
+    """
+    Memoizes successful token verifications so a token forwarded several times
+    per page load is HMAC-verified once. Keyed by the SHA-256 of the token,
+    each entry expires at the token's own exp claim; LRU-bounded in size.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Return the cached subject for a still-valid token, or None"""
+        key = self.key_for(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, subject: str, expires_at: float) -> None:
+        """Cache a verified subject until expires_at (epoch seconds)"""
+        if self.max_size <= 0:
+            return
+        key = self.key_for(token)
+        with self._lock:
+            self._entries[key] = (expires_at, subject)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Counters for the /metrics endpoint"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.jwt_verify_cache_size)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Create a JWT access token
@@ -33,8 +98,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_token(token: str) -> str:
     """
-    Verify JWT token and return username
+    Verify JWT token and return username (memoized until the token expires)
     """
+    cached_username = verified_token_cache.get(token)
+    if cached_username is not None:
+        return cached_username
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -44,6 +113,8 @@ def verify_token(token: str) -> str:
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if "exp" in payload:
+            verified_token_cache.set(token, username, float(payload["exp"]))
         return username
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -51,7 +122,7 @@ def verify_token(token: str) -> str:
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
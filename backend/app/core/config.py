@@ -1,6 +1,6 @@
 # backend/app/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Union
+from typing import List, Literal, Union
 import os
 
 class Settings(BaseSettings):
@@ -16,6 +16,35 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "your-secret-key-change-this-in-production"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 30
+    jwt_verify_cache_size: int = 10_000  # Verified tokens memoized until their exp, 0 disables
+
+    # Authenticated-user cache (get_current_user)
+    auth_user_cache_size: int = 10_000          # Max cached users, 0 disables the cache
+    auth_user_cache_ttl_seconds: float = 60.0   # Bounds staleness across worker processes
+
+    # Password hashing pool (PBKDF2 runs off the event loop)
+    password_hash_workers: int = 4       # Hashes running in parallel per process
+    password_hash_max_queue: int = 16    # Hashes allowed to wait; beyond that logins get 429
+
+    # Password hash algorithm and cost for new hashes; older hashes are upgraded on login.
+    # Tune with `python -m jobs.calibrate_password_hash --target-ms 250`
+    password_hash_scheme: Literal["pbkdf2-sha256", "scrypt", "argon2id"] = "pbkdf2-sha256"  # argon2id needs argon2-cffi
+    password_pbkdf2_iterations: int = 600_000
+    password_scrypt_ln: int = 15                 # N = 2**ln; memory is 128 * N * r bytes
+    password_scrypt_r: int = 8
+    password_scrypt_p: int = 1
+    password_argon2_memory_kib: int = 65_536
+    password_argon2_time_cost: int = 3
+    password_argon2_parallelism: int = 4
+
+    # Login lockout and auditing (lockouts come from a sliding window, audit rows are written in batches)
+    login_throttle_redis_url: str = ""     # e.g. redis://redis:6379/0 to share lockouts across workers; empty = in-memory
+    web_concurrency: int = 1               # Worker processes (WEB_CONCURRENCY, as read by uvicorn/gunicorn); > 1 requires the Redis throttle
+    login_audit_batch_size: int = 200      # login_attempts rows per INSERT
+    login_audit_flush_interval: float = 1.0  # Seconds between audit flushes
+    login_audit_max_queue: int = 10_000    # Queued attempts beyond this are dropped (and counted)
+    login_attempt_retention_days: int = 90      # Older attempts are purged by jobs.purge_login_attempts
+    login_attempt_purge_batch_size: int = 1000  # Rows deleted per transaction
     
     # Database Configuration
     db_host: str = "mysql"
@@ -23,6 +52,30 @@ class Settings(BaseSettings):
     db_password: str = "budget_password"
     db_name: str = "budget_db"
 
+    # Database Pool Configuration (applies to both the sync and async engines)
+    db_pool_size: int = 10              # Connections kept open in the pool
+    db_max_overflow: int = 20           # Extra connections allowed under burst load
+    db_pool_timeout: float = 30.0       # Seconds to wait for a free connection
+    db_pool_recycle: int = 3600         # Recycle connections after 1 hour
+    db_pool_use_lifo: bool = True       # Reuse the most recent connection so idle ones can expire
+    db_pool_pre_ping: bool = True       # SELECT 1 on checkout; disable to rely on recycle + disconnect handling
+
+    # Streaming import/export configuration
+    import_chunk_size: int = 1000  # Rows inserted and committed per chunk
+    export_batch_size: int = 1000  # Rows fetched per server-side cursor batch
+
+    # Upstream services (one pooled HTTP client each, shared for the app's lifetime)
+    graph_service_url: str = "http://graph_microservice:8002"
+    llm_service_url: str = "http://llm_microservice:8001"
+    upstream_max_connections: int = 100           # Per upstream
+    upstream_max_keepalive_connections: int = 20  # Idle connections kept open per upstream
+    upstream_keepalive_expiry: float = 30.0       # Seconds an idle connection is kept
+    upstream_connect_timeout: float = 5.0
+    upstream_pool_timeout: float = 5.0            # Seconds to wait for a free pooled connection
+    upstream_read_timeout: float = 30.0
+    llm_read_timeout: float = 120.0               # LLM generation is slow
+    upstream_http2: bool = False                  # Requires the h2 package (httpx[http2])
+
     # Model configuration - This is the KEY FIX!
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,25 @@
+# backend/app/core/etag.py
+"""
+ETags derived from a response's inputs rather than its body.
+When a response is a pure function of a few stored values, hashing those values
+lets the handler answer 304 before doing the expensive part (e.g. an upstream call).
+The graph service is built as its own image, so it keeps an identical copy in
+graph_microservice/app/etag.py; change both together.
+"""
+
+from datetime import datetime
+import hashlib
+import json
+from typing import Optional
+
+def input_etag(kind: str, **inputs) -> str:
+    """Quoted strong ETag for an endpoint name and its inputs; the current year is always included"""
+    payload = json.dumps([kind, datetime.now().year, inputs], sort_keys=True, default=str)
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header lists etag (weak or strong) or is *"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return any(candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates)
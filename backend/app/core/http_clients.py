@@ -0,0 +1,167 @@
+# backend/app/core/http_clients.py
+"""
+One pooled httpx.AsyncClient per upstream service, shared for the app's lifetime.
+
+Clients are opened in the FastAPI lifespan (or lazily on first use) and closed
+on shutdown, so keep-alive connections are reused across requests instead of
+paying TCP setup on every call. Each client's transport records request
+latency (time to response headers), errors and in-flight requests, and the
+connection pool is inspected for /metrics.
+"""
+
+from typing import Dict
+import threading
+import time
+
+import httpx
+
+from core.config import settings
+
+class UpstreamMetrics:
+    """Request counters, in-flight gauge and a latency histogram for one upstream"""
+
+    # Histogram bucket upper bounds in milliseconds
+    LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters"""
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.server_errors = 0
+            self.in_flight = 0
+            self.latency_counts = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+            self.latency_sum_ms = 0.0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, elapsed_seconds: float, status_code: int = None):
+        """Record one completed request (status_code is None for transport errors)"""
+        elapsed_ms = elapsed_seconds * 1000
+        bucket = len(self.LATENCY_BUCKETS_MS)
+        for index, upper_bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if elapsed_ms <= upper_bound:
+                bucket = index
+                break
+
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.latency_counts[bucket] += 1
+            self.latency_sum_ms += elapsed_ms
+            if status_code is None:
+                self.errors += 1
+            elif status_code >= 500:
+                self.server_errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for upper_bound, count in zip(self.LATENCY_BUCKETS_MS, self.latency_counts):
+                cumulative += count
+                buckets[str(upper_bound)] = cumulative
+            buckets["+Inf"] = cumulative + self.latency_counts[-1]
+
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "server_errors": self.server_errors,
+                "in_flight": self.in_flight,
+                "latency_ms": {
+                    "count": self.requests,
+                    "sum": round(self.latency_sum_ms, 3),
+                    "buckets": buckets,
+                },
+            }
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport that times every request into an UpstreamMetrics"""
+
+    def __init__(self, metrics: UpstreamMetrics, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.metrics.started()
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:  # Includes cancellation, so in_flight never leaks
+            self.metrics.finished(time.perf_counter() - start)
+            raise
+        self.metrics.finished(time.perf_counter() - start, response.status_code)
+        return response
+
+    def pool_usage(self) -> dict:
+        """Open, idle and busy connections in the underlying httpcore pool"""
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"connections": len(connections), "idle": idle, "active": len(connections) - idle}
+
+class UpstreamClients:
+    """Registry of named upstream clients built from settings"""
+
+    def __init__(self, upstreams: Dict[str, dict]):
+        self.upstreams = upstreams
+        self.metrics = {name: UpstreamMetrics(name) for name in upstreams}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        config = self.upstreams[name]
+        limits = httpx.Limits(
+            max_connections=settings.upstream_max_connections,
+            max_keepalive_connections=settings.upstream_max_keepalive_connections,
+            keepalive_expiry=settings.upstream_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            config["read_timeout"],
+            connect=settings.upstream_connect_timeout,
+            pool=settings.upstream_pool_timeout,
+        )
+        transport = InstrumentedTransport(self.metrics[name], limits=limits, http2=settings.upstream_http2)
+        return httpx.AsyncClient(base_url=config["base_url"], timeout=timeout, transport=transport)
+
+    def open(self):
+        """Create every client (called from the lifespan at startup)"""
+        for name in self.upstreams:
+            self.get(name)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for an upstream, creating it on first use"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._create(name)
+        return client
+
+    async def aclose(self):
+        """Close every client and its pooled connections (called on shutdown)"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict:
+        result = {}
+        for name, config in self.upstreams.items():
+            client = self._clients.get(name)
+            transport = client._transport if client is not None else None
+            result[name] = {
+                "base_url": config["base_url"],
+                "open": client is not None and not client.is_closed,
+                "pool": transport.pool_usage() if isinstance(transport, InstrumentedTransport) else None,
+                **self.metrics[name].snapshot(),
+            }
+        return result
+
+# Global registry used by the routers
+upstream_clients = UpstreamClients({
+    "graph": {"base_url": settings.graph_service_url, "read_timeout": settings.upstream_read_timeout},
+    "llm": {"base_url": settings.llm_service_url, "read_timeout": settings.llm_read_timeout},
+})
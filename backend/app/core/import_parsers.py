@@ -0,0 +1,102 @@
+# backend/app/core/import_parsers.py
+"""
+Incremental parsers for transaction uploads.
+
+The request body is consumed chunk by chunk and turned into one record at a
+time, so a 100k-row file never has to be held in memory. Each parser yields
+(row_index, record, error) tuples: record is a dict of raw field values, or
+None with an error message when the row could not be parsed.
+"""
+
+from typing import AsyncIterator, Optional, Tuple
+from fastapi import HTTPException
+import codecs
+import csv
+import json
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+def resolve_import_format(requested_format: Optional[str], content_type: Optional[str]) -> str:
+    """Pick the upload format from the explicit query parameter or the Content-Type header"""
+    if requested_format:
+        return requested_format
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CONTENT_TYPE_FORMATS:
+        return CONTENT_TYPE_FORMATS[media_type]
+    raise HTTPException(
+        status_code=415,
+        detail=f"Upload must be one of {', '.join(SUPPORTED_FORMATS)} (set Content-Type or ?format=)"
+    )
+
+async def iter_lines(byte_stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream incrementally and yield complete lines"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in byte_stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Parse CSV lines (first line is the header) into dict records"""
+    header = None
+    pending = ""
+    row_index = 0
+    async for line in lines:
+        # A quoted field may contain newlines: keep reading until the quotes balance
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+
+        if len(values) != len(header):
+            yield row_index, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield row_index, dict(zip(header, (value.strip() for value in values))), None
+        row_index += 1
+
+    if pending.strip():
+        yield row_index, None, "Unterminated quoted field"
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Parse one JSON object per line"""
+    row_index = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_index, None, f"Invalid JSON: {e.msg}"
+        else:
+            if isinstance(record, dict):
+                yield row_index, record, None
+            else:
+                yield row_index, None, "Each line must be a JSON object"
+        row_index += 1
+
+def parse_records(byte_stream: AsyncIterator[bytes], import_format: str):
+    """Build the record generator for an upload format"""
+    lines = iter_lines(byte_stream)
+    if import_format == "csv":
+        return iter_csv_records(lines)
+    return iter_ndjson_records(lines)
@@ -0,0 +1,41 @@
+# backend/app/core/ledger_export.py
+"""
+Encoders for streaming a balance ledger as CSV or NDJSON.
+Each batch of rows from crud.transactions.stream_ledger is turned into one
+bytes chunk, so the response body is produced as the cursor is read.
+"""
+
+from typing import AsyncIterator, List
+import csv
+import io
+import json
+
+LEDGER_COLUMNS = ("type", "id", "description", "amount", "created_at")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def _serialize_row(row: tuple) -> dict:
+    record = dict(zip(LEDGER_COLUMNS, row))
+    if record["created_at"] is not None:
+        record["created_at"] = record["created_at"].isoformat()
+    return record
+
+async def encode_ledger(batches: AsyncIterator[List[tuple]], export_format: str) -> AsyncIterator[bytes]:
+    """Encode ledger row batches into CSV (with header) or NDJSON chunks"""
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(LEDGER_COLUMNS)
+        yield buffer.getvalue().encode()
+
+        async for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(_serialize_row(row).values() for row in batch)
+            yield buffer.getvalue().encode()
+    else:
+        async for batch in batches:
+            yield "".join(json.dumps(_serialize_row(row)) + "\n" for row in batch).encode()
@@ -0,0 +1,133 @@
+# backend/app/core/login_audit.py
+"""
+Batched, asynchronous writes of login attempts to the login_attempts audit table.
+
+Logins enqueue an attempt and return; a background thread inserts queued
+attempts in one multi-row INSERT per batch, every flush interval or as soon as
+a batch fills. Lockout decisions come from core.login_throttle, so nothing
+waits on these writes. If the queue is full (the database is down or far
+behind), attempts are dropped and counted rather than blocking logins.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+import logging
+import queue
+import threading
+
+from sqlalchemy import insert
+
+from core.config import settings
+from db.database import SessionLocal
+from db.models import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+class LoginAuditWriter:
+    """
+    Queue + writer thread with counters for /metrics
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._flush_lock = threading.Lock()  # One batch insert at a time
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # Set on stop, or when a full batch is waiting
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent; record() also starts it on first use)"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._wake.clear()
+                self._thread = threading.Thread(target=self._run, name="login-audit-writer", daemon=True)
+                self._thread.start()
+
+    def record(self, user_id: int, ip_address: str, success: bool) -> None:
+        """Queue one attempt, timestamped now (UTC, like the lockout window queries)"""
+        self.start()
+        try:
+            self._queue.put_nowait({
+                "user_id": user_id,
+                "ip_address": ip_address,
+                "success": success,
+                "attempted_at": datetime.utcnow(),
+            })
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Login audit queue full - dropped attempt for user {user_id}")
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def _drain(self, limit: int) -> List[dict]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def flush(self) -> int:
+        """Write everything queued so far in batches and return how many rows were inserted"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                rows = self._drain(self.batch_size)
+                if not rows:
+                    return written
+                db = SessionLocal()
+                try:
+                    db.execute(insert(LoginAttempt), rows)
+                    db.commit()
+                    written += len(rows)
+                    self.written += len(rows)
+                    self.batches += 1
+                except Exception as e:
+                    db.rollback()
+                    self.failed += len(rows)
+                    logger.error(f"Failed to write {len(rows)} login attempts: {str(e)}")
+                finally:
+                    db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Sleep for the flush interval, or until record() sees a full batch waiting
+            if self._queue.qsize() < self.batch_size:
+                self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the thread and write whatever is still queued"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        """Counters for the /metrics endpoint"""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+login_audit = LoginAuditWriter(
+    batch_size=settings.login_audit_batch_size,
+    flush_interval=settings.login_audit_flush_interval,
+    max_queue=settings.login_audit_max_queue,
+)
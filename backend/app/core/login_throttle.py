@@ -0,0 +1,208 @@
+# backend/app/core/login_throttle.py
+"""
+Sliding-window failed-login counter for account lockout decisions.
+
+authenticate_user used to COUNT login_attempts rows on every attempt. The
+counter keeps the recent failure timestamps per user instead, so a lockout
+check costs no query. By default they live in process memory, which is only
+correct with a single worker process: each process would otherwise allow its
+own `limit` guesses. Set login_throttle_redis_url to share them between workers
+and hosts (needs the redis package); check_configuration() refuses to start
+with WEB_CONCURRENCY > 1 and no shared store. The in-memory store seeds a
+user's window from login_attempts the first time it sees them, so a restart
+does not lift active lockouts.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, Iterable, Optional, Set
+import logging
+import threading
+import time
+import uuid
+
+from core.config import settings
+from core.password_config import PasswordConfig
+
+logger = logging.getLogger(__name__)
+
+try:  # Optional: a shared store needs the redis package
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - depends on the deployment
+    redis = redis_asyncio = None
+
+class ThrottleStoreUnavailable(Exception):
+    """The shared store could not be reached; callers fall back to counting login_attempts"""
+
+class InMemoryThrottleStore:
+    """
+    Per-process failure timestamps. Only the latest `limit` failures per user are
+    kept, which is all a "limit failures within the window" decision needs.
+    Both maps are capped at max_users: users whose failures expired are swept,
+    and users seeded without failures only keep a marker (dropped wholesale when
+    full, which just costs those users one more seed query).
+    """
+
+    shared = False
+
+    def __init__(self, limit: int, window_seconds: float, max_users: int = 100_000):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_users = max_users
+        self._failures: Dict[int, Deque[float]] = {}
+        self._seeded: Set[int] = set()  # Seeded with no recent failures
+        self._lock = threading.Lock()
+
+    def _prune(self, failures: Deque[float], now: float) -> None:
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+
+    def _sweep(self, now: float) -> None:
+        """Drop users whose failures have all expired (called when the map is full)"""
+        for user_id in list(self._failures):
+            failures = self._failures[user_id]
+            self._prune(failures, now)
+            if not failures:
+                del self._failures[user_id]
+
+    def is_known(self, user_id: int) -> bool:
+        with self._lock:
+            return user_id in self._failures or user_id in self._seeded
+
+    def seed(self, user_id: int, timestamps: Iterable[float], now: Optional[float] = None) -> None:
+        """Load failures recorded before this process started (only if none are known yet)"""
+        timestamps = sorted(timestamps)[-self.limit:]
+        with self._lock:
+            if user_id in self._failures or user_id in self._seeded:
+                return
+            if not timestamps:
+                if len(self._seeded) >= self.max_users:
+                    self._seeded.clear()
+                self._seeded.add(user_id)
+                return
+            if len(self._failures) >= self.max_users:
+                self._sweep(time.time() if now is None else now)
+            self._failures[user_id] = deque(timestamps, maxlen=self.limit)
+
+    def add_failure(self, user_id: int, now: float) -> int:
+        with self._lock:
+            if user_id not in self._failures and len(self._failures) >= self.max_users:
+                self._sweep(now)
+            failures = self._failures.setdefault(user_id, deque(maxlen=self.limit))
+            failures.append(now)
+            self._prune(failures, now)
+            return len(failures)
+
+    def count_failures(self, user_id: int, now: float) -> int:
+        with self._lock:
+            failures = self._failures.get(user_id)
+            if failures is None:
+                return 0
+            self._prune(failures, now)
+            return len(failures)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._seeded.clear()
+
+class RedisThrottleStore:
+    """
+    Failure timestamps in one sorted set per user, shared by every worker.
+    Uses the asyncio client so a slow Redis never blocks the event loop; Redis
+    errors are raised as ThrottleStoreUnavailable.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, limit: int, window_seconds: float, prefix: str = "login-failures:"):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.prefix = prefix
+        self._client = redis_asyncio.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    async def add_failure(self, user_id: int, now: float) -> int:
+        key = f"{self.prefix}{user_id}"
+        try:
+            async with self._client.pipeline() as pipeline:
+                # Unique member, timestamp as score: simultaneous failures must not collapse into one
+                pipeline.zadd(key, {f"{now!r}:{uuid.uuid4().hex}": now})
+                pipeline.zremrangebyscore(key, "-inf", now - self.window_seconds)
+                pipeline.zremrangebyrank(key, 0, -self.limit - 1)  # Keep only the latest `limit`
+                pipeline.zcard(key)
+                pipeline.expire(key, int(self.window_seconds) + 1)
+                return (await pipeline.execute())[3]
+        except redis.RedisError as e:
+            raise ThrottleStoreUnavailable(str(e)) from e
+
+    async def count_failures(self, user_id: int, now: float) -> int:
+        try:
+            return await self._client.zcount(f"{self.prefix}{user_id}", f"({now - self.window_seconds}", "+inf")
+        except redis.RedisError as e:
+            raise ThrottleStoreUnavailable(str(e)) from e
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(f"{self.prefix}*"):
+            await self._client.delete(key)
+
+class LoginThrottle:
+    """
+    Lockout decisions from a sliding window of failed logins:
+    a user is locked out while `limit` failures fall within the last `window_seconds`.
+    """
+
+    def __init__(self, store, limit: int, window_seconds: float):
+        self.store = store
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    def ensure_seeded(self, user_id: int, load_failures: Callable[[datetime], Iterable[datetime]]) -> None:
+        """
+        Seed a user the in-memory store has not seen yet; load_failures(cutoff) returns the
+        attempted_at (UTC) of failures since cutoff. Costs one query per user per process.
+        """
+        if self.store.shared or self.store.is_known(user_id):
+            return
+        cutoff = datetime.utcnow() - timedelta(seconds=self.window_seconds)
+        timestamps = [attempted_at.replace(tzinfo=timezone.utc).timestamp() for attempted_at in load_failures(cutoff)]
+        self.store.seed(user_id, timestamps)
+
+    async def record_failure(self, user_id: int, now: Optional[float] = None) -> int:
+        """Count a failed attempt and return the failures now in the window"""
+        now = time.time() if now is None else now
+        if self.store.shared:
+            return await self.store.add_failure(user_id, now)
+        return self.store.add_failure(user_id, now)
+
+    async def failed_attempts(self, user_id: int, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        if self.store.shared:
+            return await self.store.count_failures(user_id, now)
+        return self.store.count_failures(user_id, now)
+
+    async def is_locked_out(self, user_id: int, now: Optional[float] = None) -> bool:
+        return await self.failed_attempts(user_id, now) >= self.limit
+
+    def check_configuration(self) -> None:
+        """
+        Fail fast at startup: per-process windows under several workers would let an
+        attacker make `limit` guesses per worker, so more than one worker needs the shared store.
+        """
+        if not self.store.shared and settings.web_concurrency > 1:
+            raise RuntimeError(
+                f"WEB_CONCURRENCY={settings.web_concurrency} needs a shared login throttle: "
+                "set login_throttle_redis_url (and install redis)"
+            )
+
+def create_login_throttle() -> LoginThrottle:
+    """Redis-backed when login_throttle_redis_url is set and redis is installed, else in-memory"""
+    limit = PasswordConfig.MAX_LOGIN_ATTEMPTS
+    window_seconds = PasswordConfig.LOCKOUT_DURATION_MINUTES * 60
+    if settings.login_throttle_redis_url:
+        if redis_asyncio is not None:
+            return LoginThrottle(RedisThrottleStore(settings.login_throttle_redis_url, limit, window_seconds), limit, window_seconds)
+        logger.warning("login_throttle_redis_url is set but the redis package is missing - using the in-memory store")
+    return LoginThrottle(InMemoryThrottleStore(limit, window_seconds), limit, window_seconds)
+
+login_throttle = create_login_throttle()
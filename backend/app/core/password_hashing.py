@@ -1,127 +1,251 @@
+from abc import ABC, abstractmethod
 import hashlib
 import secrets
 import base64
-from typing import Tuple
+import time
+from typing import Dict, Optional, Tuple
 import logging
 
+from core.config import settings
+
 logger = logging.getLogger(__name__)
 
+try:  # Optional: Argon2id needs the argon2-cffi package
+    from argon2.low_level import Type as Argon2Type, hash_secret_raw as argon2_hash_secret_raw
+except ImportError:  # pragma: no cover - depends on the deployment
+    argon2_hash_secret_raw = None
+
+class HashScheme(ABC):
+    """
+    One password hashing algorithm. Hashes are stored as "$<name>$<params>$<salt>$<hash>"
+    (salt and hash base64 encoded), so the algorithm and its cost travel with each hash.
+    """
+
+    name: str = ""
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def current_params(self) -> dict:
+        """Cost parameters configured for this deployment"""
+
+    def format_params(self, params: dict) -> str:
+        return ",".join(f"{key}={value}" for key, value in params.items())
+
+    def parse_params(self, text: str) -> dict:
+        return {key: int(value) for key, value in (item.split("=", 1) for item in text.split(","))}
+
+    @abstractmethod
+    def derive(self, password: str, salt: bytes, params: dict, length: int) -> bytes:
+        """Derive `length` bytes of hash from the password, salt and cost parameters"""
+
+class Pbkdf2Scheme(HashScheme):
+    """PBKDF2-HMAC-SHA256; params: iterations (stored bare, e.g. $pbkdf2-sha256$600000$...)"""
+
+    name = "pbkdf2-sha256"
+
+    def current_params(self) -> dict:
+        return {"iterations": settings.password_pbkdf2_iterations}
+
+    def format_params(self, params: dict) -> str:
+        return str(params["iterations"])
+
+    def parse_params(self, text: str) -> dict:
+        return {"iterations": int(text)}
+
+    def derive(self, password: str, salt: bytes, params: dict, length: int) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password.encode('utf-8'), salt, params["iterations"], length)
+
+class ScryptScheme(HashScheme):
+    """scrypt from hashlib; params: ln (log2 of N), r, p"""
+
+    name = "scrypt"
+
+    def current_params(self) -> dict:
+        return {"ln": settings.password_scrypt_ln, "r": settings.password_scrypt_r, "p": settings.password_scrypt_p}
+
+    def derive(self, password: str, salt: bytes, params: dict, length: int) -> bytes:
+        n, r, p = 1 << params["ln"], params["r"], params["p"]
+        # Memory is 128 * N * r bytes; allow it plus headroom instead of OpenSSL's 32 MiB default
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r, dklen=length)
+
+class Argon2idScheme(HashScheme):
+    """Argon2id via argon2-cffi (optional); params: m (KiB), t (passes), p (lanes)"""
+
+    name = "argon2id"
+
+    def is_available(self) -> bool:
+        return argon2_hash_secret_raw is not None
+
+    def current_params(self) -> dict:
+        return {"m": settings.password_argon2_memory_kib, "t": settings.password_argon2_time_cost, "p": settings.password_argon2_parallelism}
+
+    def derive(self, password: str, salt: bytes, params: dict, length: int) -> bytes:
+        if argon2_hash_secret_raw is None:
+            raise RuntimeError("argon2id hashes need the argon2-cffi package")
+        return argon2_hash_secret_raw(
+            password.encode('utf-8'), salt,
+            time_cost=params["t"], memory_cost=params["m"], parallelism=params["p"],
+            hash_len=length, type=Argon2Type.ID,
+        )
+
+HASH_SCHEMES: Dict[str, HashScheme] = {scheme.name: scheme for scheme in (Pbkdf2Scheme(), ScryptScheme(), Argon2idScheme())}
+
 class PasswordHasher:
     """
-    PBKDF2 password hashing with unique salts
+    Password hashing with unique salts and a versioned, self-describing format.
+    New hashes use settings.password_hash_scheme with its configured cost;
+    needs_rehash() tells callers when a stored hash should be upgraded.
+    Legacy "salt:hash" values (PBKDF2-SHA256, 600,000 iterations) still verify.
     """
-    
+
     # PBKDF2 configuration - following OWASP recommendations
     ALGORITHM = 'sha256'
-    ITERATIONS = 600_000  # OWASP 2023 recommendation for PBKDF2-SHA256
+    ITERATIONS = 600_000  # OWASP 2023 recommendation for PBKDF2-SHA256 (default and legacy format)
     SALT_LENGTH = 32      # 32 bytes = 256 bits
     HASH_LENGTH = 32      # 32 bytes = 256 bits
-    
+
     @classmethod
     def generate_salt(cls) -> bytes:
         """Generate a cryptographically secure random salt"""
         return secrets.token_bytes(cls.SALT_LENGTH)
-    
+
     @classmethod
-    def hash_password(cls, password: str, salt: bytes = None) -> str:
+    def get_scheme(cls, name: str = None) -> HashScheme:
+        """The named scheme, or the one configured for new hashes"""
+        name = name or settings.password_hash_scheme
+        scheme = HASH_SCHEMES.get(name)
+        if scheme is None:
+            raise ValueError(f"Unknown password hash scheme: {name}")
+        if not scheme.is_available():
+            raise RuntimeError(f"Password hash scheme {name} is not available in this environment")
+        return scheme
+
+    @classmethod
+    def check_configuration(cls) -> None:
+        """
+        Fail fast at startup: the configured scheme must be installed and its cost
+        parameters must hash (e.g. scrypt's memory must fit). Raises ValueError/RuntimeError.
+        """
+        scheme = cls.get_scheme()
+        try:
+            scheme.derive("configuration-check", cls.generate_salt(), scheme.current_params(), cls.HASH_LENGTH)
+        except Exception as e:
+            raise RuntimeError(f"Password hash scheme {scheme.name} rejects its configured parameters: {str(e)}") from e
+
+    @classmethod
+    def hash_password(cls, password: str, salt: bytes = None, scheme: str = None, params: dict = None) -> str:
         """
-        Hash a password using PBKDF2 with a unique salt
-        
+        Hash a password with a unique salt
+
         Args:
             password: The plain text password to hash
             salt: Optional salt (if None, generates a new one)
-            
+            scheme: Optional scheme name (default: settings.password_hash_scheme)
+            params: Optional cost parameters (default: the scheme's configured ones)
+
         Returns:
-            String in format "salt:hash" (both base64 encoded)
+            String in format "$scheme$params$salt$hash" (salt and hash base64 encoded)
         """
         if salt is None:
             salt = cls.generate_salt()
-        
-        # Hash the password using PBKDF2
-        password_hash = hashlib.pbkdf2_hmac(
-            cls.ALGORITHM,
-            password.encode('utf-8'),
-            salt,
-            cls.ITERATIONS,
-            cls.HASH_LENGTH
-        )
-        
+        hash_scheme = cls.get_scheme(scheme)
+        params = params or hash_scheme.current_params()
+
+        password_hash = hash_scheme.derive(password, salt, params, cls.HASH_LENGTH)
+
         # Encode salt and hash as base64 for storage
         salt_b64 = base64.b64encode(salt).decode('utf-8')
         hash_b64 = base64.b64encode(password_hash).decode('utf-8')
-        
-        # Return in format "salt:hash"
-        return f"{salt_b64}:{hash_b64}"
-    
+
+        return f"${hash_scheme.name}${hash_scheme.format_params(params)}${salt_b64}${hash_b64}"
+
+    @classmethod
+    def parse_hash(cls, stored_hash: str) -> Tuple[HashScheme, dict, bytes, bytes]:
+        """
+        Split a stored hash into (scheme, params, salt, hash); raises ValueError if malformed.
+        Legacy "salt:hash" values parse as PBKDF2-SHA256 with 600,000 iterations.
+        """
+        if stored_hash.startswith("$"):
+            parts = stored_hash.split("$")
+            if len(parts) != 5 or parts[1] not in HASH_SCHEMES:
+                raise ValueError("Invalid hash format")
+            _, name, params_text, salt_b64, hash_b64 = parts
+            scheme = HASH_SCHEMES[name]
+            params = scheme.parse_params(params_text)
+        elif ':' in stored_hash:
+            salt_b64, hash_b64 = stored_hash.split(':', 1)
+            scheme = HASH_SCHEMES["pbkdf2-sha256"]
+            params = {"iterations": cls.ITERATIONS}
+        else:
+            raise ValueError("Invalid hash format - missing separator")
+
+        salt = base64.b64decode(salt_b64.encode('utf-8'), validate=True)
+        password_hash = base64.b64decode(hash_b64.encode('utf-8'), validate=True)
+        return scheme, params, salt, password_hash
+
     @classmethod
     def verify_password(cls, password: str, stored_hash: str) -> bool:
         """
         Verify a password against a stored hash
-        
+
         Args:
             password: The plain text password to verify
-            stored_hash: The stored hash in format "salt:hash"
-            
+            stored_hash: The stored hash, versioned or legacy "salt:hash"
+
         Returns:
             True if password matches, False otherwise
         """
         try:
-            # Split the stored hash into salt and hash components
-            if ':' not in stored_hash:
-                logger.warning("Invalid hash format - missing separator")
-                return False
-            
-            salt_b64, hash_b64 = stored_hash.split(':', 1)
-            
-            # Decode the salt and hash from base64
-            salt = base64.b64decode(salt_b64.encode('utf-8'))
-            stored_password_hash = base64.b64decode(hash_b64.encode('utf-8'))
-            
-            # Hash the provided password with the same salt
-            password_hash = hashlib.pbkdf2_hmac(
-                cls.ALGORITHM,
-                password.encode('utf-8'),
-                salt,
-                cls.ITERATIONS,
-                cls.HASH_LENGTH
-            )
-            
+            scheme, params, salt, stored_password_hash = cls.parse_hash(stored_hash)
+
+            # Hash the provided password with the same scheme, cost and salt
+            password_hash = scheme.derive(password, salt, params, len(stored_password_hash))
+
             # Use secrets.compare_digest for timing-safe comparison
             return secrets.compare_digest(password_hash, stored_password_hash)
-            
+
         except Exception as e:
             logger.error(f"Error verifying password: {str(e)}")
             return False
-    
+
+    @classmethod
+    def needs_rehash(cls, stored_hash: str) -> bool:
+        """
+        True if a stored hash uses another scheme or other cost parameters than the ones
+        configured now (legacy "salt:hash" values always need it)
+        """
+        try:
+            scheme, params, _, _ = cls.parse_hash(stored_hash)
+        except Exception:
+            return True
+        if not stored_hash.startswith("$"):
+            return True
+        current = cls.get_scheme()
+        return scheme.name != current.name or params != current.current_params()
+
     @classmethod
     def is_password_hashed(cls, password: str) -> bool:
         """
-        Check if a password is already hashed (contains salt:hash format)
-        
+        Check if a password is already hashed (versioned or legacy salt:hash format)
+
         Args:
             password: The password string to check
-            
+
         Returns:
             True if password appears to be hashed, False otherwise
         """
         if not isinstance(password, str):
             return False
-        
-        # Check if it has the expected format: salt:hash
-        if ':' not in password:
-            return False
-        
+
         try:
-            salt_b64, hash_b64 = password.split(':', 1)
-            
-            # Verify base64 encoding and expected lengths
-            salt = base64.b64decode(salt_b64.encode('utf-8'))
-            password_hash = base64.b64decode(hash_b64.encode('utf-8'))
-            
+            _, _, salt, password_hash = cls.parse_hash(password)
+
             # Check expected lengths
-            return (len(salt) == cls.SALT_LENGTH and 
+            return (len(salt) == cls.SALT_LENGTH and
                    len(password_hash) == cls.HASH_LENGTH)
-                   
+
         except Exception:
             return False
 
@@ -129,25 +253,69 @@ class PasswordHasher:
     def get_hash_info(cls, stored_hash: str) -> dict:
         """
         Get information about a stored hash (for debugging/migration)
-        
+
         Args:
-            stored_hash: The stored hash in format "salt:hash"
-            
+            stored_hash: The stored hash, versioned or legacy "salt:hash"
+
         Returns:
             Dictionary with hash information
         """
         try:
-            salt_b64, hash_b64 = stored_hash.split(':', 1)
-            salt = base64.b64decode(salt_b64.encode('utf-8'))
-            password_hash = base64.b64decode(hash_b64.encode('utf-8'))
-            
+            scheme, params, salt, password_hash = cls.parse_hash(stored_hash)
+            legacy = not stored_hash.startswith("$")
+
             return {
-                "algorithm": cls.ALGORITHM,
-                "iterations": cls.ITERATIONS,
+                "scheme": scheme.name,
+                "algorithm": cls.ALGORITHM if scheme.name == "pbkdf2-sha256" else scheme.name,
+                "iterations": params.get("iterations"),
+                "params": params,
                 "salt_length": len(salt),
                 "hash_length": len(password_hash),
-                "format": "salt:hash (base64)",
+                "format": "salt:hash (base64)" if legacy else "$scheme$params$salt$hash (base64)",
+                "needs_rehash": cls.needs_rehash(stored_hash),
                 "valid": len(salt) == cls.SALT_LENGTH and len(password_hash) == cls.HASH_LENGTH
             }
         except Exception as e:
-            return {"error": str(e), "valid": False}
\ No newline at end of file
+            return {"error": str(e), "valid": False}
+
+    @classmethod
+    def time_verify(cls, scheme: str, params: dict, rounds: int = 3) -> float:
+        """Median seconds to hash one password with these parameters on this machine"""
+        salt = cls.generate_salt()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            cls.get_scheme(scheme).derive("calibration-password", salt, params, cls.HASH_LENGTH)
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2]
+
+    @classmethod
+    def calibrate(cls, scheme: str, target_seconds: float, rounds: int = 3) -> Tuple[dict, float]:
+        """
+        Pick the cost parameters whose verify time is closest to, without going under,
+        target_seconds on this hardware. Memory settings (scrypt r/p, argon2 m/p) are kept
+        from the configuration; the time-like cost (iterations, ln, t) is tuned.
+        Returns (params, measured_seconds).
+        """
+        hash_scheme = cls.get_scheme(scheme)
+        params = dict(hash_scheme.current_params())
+
+        if hash_scheme.name == "pbkdf2-sha256":
+            # Cost is linear in iterations: scale from a probe, then nudge up until the target is met
+            probe = 100_000
+            per_iteration = cls.time_verify(scheme, {"iterations": probe}, rounds) / probe
+            params["iterations"] = max(int(target_seconds / per_iteration), 1)
+            elapsed = cls.time_verify(scheme, params, rounds)
+            while elapsed < target_seconds:
+                params["iterations"] = int(params["iterations"] * max(target_seconds / elapsed, 1.05))
+                elapsed = cls.time_verify(scheme, params, rounds)
+            params["iterations"] = -(-params["iterations"] // 1000) * 1000  # Round up to a readable value
+            return params, cls.time_verify(scheme, params, rounds)
+
+        cost_key, start, limit = ("ln", 10, 22) if hash_scheme.name == "scrypt" else ("t", 1, 64)
+        params[cost_key] = start
+        elapsed = cls.time_verify(scheme, params, rounds)
+        while elapsed < target_seconds and params[cost_key] < limit:
+            params[cost_key] += 1
+            elapsed = cls.time_verify(scheme, params, rounds)
+        return params, elapsed
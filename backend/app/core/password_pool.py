@@ -0,0 +1,127 @@
+# backend/app/core/password_pool.py
+"""
+Bounded worker pool for password hashing.
+
+PBKDF2 with 600,000 iterations takes hundreds of milliseconds; run inline in an
+async handler it stalls every other request on the worker. hashlib releases the
+GIL while it hashes, so a small thread pool runs hashes in parallel off the event
+loop. Admission is bounded: when every worker is busy and max_queue hashes are
+already waiting, new requests get a 429 instead of queueing without limit.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+import asyncio
+import threading
+
+from fastapi import HTTPException
+
+from core.config import settings
+from core.password_hashing import PasswordHasher
+
+class PasswordHashingPool:
+    """
+    Thread pool with an in-flight limit (workers + max_queue) and counters for /metrics
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after_seconds: int = 1):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Slots are released from worker threads when a hash actually ends, so counters are locked
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Hashes admitted at once: one running per worker plus the waiting queue"""
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _release(self, future: Future) -> None:
+        """Done-callback: free the slot once the hash has really finished (or was cancelled before starting)"""
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                return  # Counted as cancelled by the request that gave up on it
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def run(self, function, *args):
+        """
+        Run function(*args) on the pool, or raise 429 when the pool is saturated.
+        A request that is cancelled (e.g. the client disconnected) keeps its slot
+        until its hash stops running, so the pool never holds more than capacity.
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many sign-in requests in progress. Please retry shortly.",
+                    headers={"Retry-After": str(self.retry_after_seconds)},
+                )
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            future = self._get_executor().submit(partial(function, *args))
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+                self.failed += 1
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+            raise
+
+    async def hash_password(self, password: str) -> str:
+        return await self.run(PasswordHasher.hash_password, password)
+
+    async def verify_password(self, password: str, stored_hash: str) -> bool:
+        return await self.run(PasswordHasher.verify_password, password, stored_hash)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (hashes already running finish first)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Counters for the /metrics endpoint"""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+        }
+
+password_pool = PasswordHashingPool(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+)
@@ -0,0 +1,113 @@
+# backend/app/core/user_cache.py
+"""
+In-process cache of authenticated users for get_current_user.
+
+Maps a token subject (username) to a lightweight, session-free snapshot of the
+user so authenticated requests can skip the users lookup. Entries expire after
+a TTL and the least recently used entry is evicted when the cache is full.
+crud.user invalidates entries explicitly when it changes a user; the TTL bounds
+staleness across worker processes.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+import threading
+import time
+
+from core.config import settings
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Snapshot of the user fields used by request handlers and /auth/me"""
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, user) -> "AuthenticatedUser":
+        """Build a snapshot from a db.models.User row"""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_verified=bool(user.is_verified),
+            created_at=user.created_at,
+        )
+
+class UserCache:
+    """
+    Bounded TTL + LRU cache with hit/miss counters
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, username: str) -> Optional[AuthenticatedUser]:
+        """Return the cached snapshot for username, or None on a miss/expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, username: str, user: AuthenticatedUser) -> None:
+        """Cache a snapshot, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[username] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, username: str) -> None:
+        """Drop the entry for username (call whenever the user row changes)"""
+        with self._lock:
+            if self._entries.pop(username, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """Counters for the /metrics endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+user_cache = UserCache(
+    max_size=settings.auth_user_cache_size,
+    ttl_seconds=settings.auth_user_cache_ttl_seconds,
+)
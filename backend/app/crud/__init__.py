@@ -2,4 +2,6 @@ from . import balance
 from . import income
 from . import expense
 from . import suggestion
-from . import user
\ No newline at end of file
+from . import user
+from . import transactions
+from . import pagination
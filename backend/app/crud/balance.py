@@ -1,13 +1,14 @@
 # backend/app/crud/balance.py - Update to use balance-specific validation
 
 import crud
-from sqlalchemy.orm import Session
-from db.models import Balance, User
+from sqlalchemy import select, update, delete, exists, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import Balance, User, Income, Expense, SuggestionCache
 from schemas.balance import BalanceCreate, BalanceUpdate
 from core.validation import validate_balance_amount, validate_id  # Use balance-specific validation
 from fastapi import HTTPException
 
-def create_balance(db: Session, balance: BalanceCreate, user_id: int):
+async def create_balance(db: AsyncSession, balance: BalanceCreate, user_id: int):
     """Create a new balance with validation and user association"""
     # Validate the amount (allows $0)
     validated_amount = validate_balance_amount(balance.amount)
@@ -15,62 +16,208 @@ def create_balance(db: Session, balance: BalanceCreate, user_id: int):
     # Create balance with user association
     db_balance = Balance(amount=validated_amount, user_id=user_id)
     db.add(db_balance)
-    db.commit()
-    db.refresh(db_balance)
+    await db.commit()
+    await db.refresh(db_balance)
     return db_balance
 
 
-def get_user_balances(db: Session, user_id: int):
+async def get_user_balances(db: AsyncSession, user_id: int):
     """Get all balances for a specific user"""
-    return db.query(Balance).filter(Balance.user_id == user_id).all()
+    result = await db.execute(select(Balance).where(Balance.user_id == user_id))
+    return result.scalars().all()
 
-def get_user_primary_balance(db: Session, user_id: int):
+async def get_user_primary_balance(db: AsyncSession, user_id: int):
     """Get the user's first/primary balance"""
-    return db.query(Balance).filter(Balance.user_id == user_id).first()
+    result = await db.execute(select(Balance).where(Balance.user_id == user_id).limit(1))
+    return result.scalars().first()
 
-def get_balance(db: Session, balance_id: int):
+async def get_balance(db: AsyncSession, balance_id: int):
     """Get a balance by ID with validation"""
     validate_id(balance_id, "balance_id")
-    return db.query(Balance).filter(Balance.id == balance_id).first()
+    return await db.get(Balance, balance_id)
 
-def get_balance_for_user(db: Session, balance_id: int, user_id: int):
+async def get_balance_for_user(db: AsyncSession, balance_id: int, user_id: int):
     """Get a balance by ID that belongs to a specific user"""
     validate_id(balance_id, "balance_id")
-    return db.query(Balance).filter(
+    result = await db.execute(select(Balance).where(
         Balance.id == balance_id, 
         Balance.user_id == user_id
-    ).first()
+    ))
+    return result.scalars().first()
 
-def update_balance(db: Session, balance_id: int, balance: BalanceUpdate, user_id: int = None):
-    """Update a balance with validation and optional user ownership check"""
+async def balance_exists(db: AsyncSession, balance_id: int) -> bool:
+    """Check whether a balance exists (used to tell 404 from 403 after an ownership-scoped miss)"""
+    result = await db.execute(select(exists().where(Balance.id == balance_id)))
+    return bool(result.scalar())
+
+async def raise_balance_access_error(db: AsyncSession, balance_id: int):
+    """
+    Called when an ownership-scoped lookup matched nothing:
+    404 if the balance doesn't exist, 403 if it belongs to someone else
+    """
+    if await balance_exists(db, balance_id):
+        raise HTTPException(status_code=403, detail="Access denied to this balance")
+    raise HTTPException(status_code=404, detail="Balance not found")
+
+async def get_owned_balance_or_raise(db: AsyncSession, balance_id: int, user_id: int):
+    """Get a balance owned by user_id in one query, raising 404/403 when it isn't"""
+    db_balance = await get_balance_for_user(db, balance_id, user_id)
+    if db_balance is None:
+        await raise_balance_access_error(db, balance_id)
+    return db_balance
+
+def _ledger_totals(model):
+    """Correlated scalar subqueries for SUM(amount) and COUNT(*) of one ledger table per balance"""
+    total = select(func.coalesce(func.sum(model.amount), 0.0)).where(model.balance_id == Balance.id).scalar_subquery()
+    count = select(func.count(model.id)).where(model.balance_id == Balance.id).scalar_subquery()
+    return total, count
+
+async def get_balance_totals(db: AsyncSession, balance_id: int):
+    """
+    Get a balance's amount with its income/expense totals and counts.
+    Reads the running totals stored on the balance row, so it's a single
+    primary-key lookup however long the ledger is.
+    Returns None if the balance doesn't exist.
+    """
+    result = await db.execute(
+        select(
+            Balance.amount.label("current_balance"),
+            Balance.total_income,
+            Balance.income_count,
+            Balance.total_expense,
+            Balance.expense_count,
+        ).where(Balance.id == balance_id)
+    )
+    row = result.mappings().first()
+    if row is None:
+        return None
+    return {"balance_id": balance_id, **row}
+
+async def repair_balance_totals(db: AsyncSession, balance_id: int = None) -> int:
+    """
+    Recompute the running totals from the incomes/expenses tables, for one
+    balance or all of them. Returns the number of balances rewritten.
+    """
+    total_income, income_count = _ledger_totals(Income)
+    total_expense, expense_count = _ledger_totals(Expense)
+    statement = update(Balance).values(
+        total_income=total_income,
+        income_count=income_count,
+        total_expense=total_expense,
+        expense_count=expense_count,
+    ).execution_options(synchronize_session=False)
+    if balance_id is not None:
+        statement = statement.where(Balance.id == balance_id)
+
+    result = await db.execute(statement)
+    await db.commit()
+    return result.rowcount
+
+async def get_balance_summary(db: AsyncSession, balance_id: int, user_id: int, recent: int = 10):
+    """
+    Everything the dashboard shows for one owned balance in three statements:
+    the balance row (with its running totals) joined to its cached suggestions,
+    then the newest `recent` incomes and expenses as keyset pages.
+    Returns None if the user doesn't own the balance.
+    """
     validate_id(balance_id, "balance_id")
-    
-    # Get balance with optional user check
+    result = await db.execute(
+        select(Balance, SuggestionCache.suggestion_data)
+        .outerjoin(SuggestionCache, SuggestionCache.balance_id == Balance.id)
+        .where(Balance.id == balance_id, Balance.user_id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    db_balance, suggestions = row
+
+    return {
+        "balance": db_balance,
+        "totals": {
+            "total_income": db_balance.total_income,
+            "income_count": db_balance.income_count,
+            "total_expense": db_balance.total_expense,
+            "expense_count": db_balance.expense_count,
+        },
+        "incomes": await crud.income.get_incomes_by_balance(db, balance_id, limit=recent),
+        "expenses": await crud.expense.get_expenses_by_balance(db, balance_id, limit=recent),
+        "suggestions": suggestions,
+    }
+
+def _ownership_filter(balance_id: int, user_id: int = None):
+    """WHERE clause for a balance, optionally scoped to its owner"""
+    criteria = [Balance.id == balance_id]
     if user_id:
-        db_balance = get_balance_for_user(db, balance_id, user_id)
-    else:
-        db_balance = get_balance(db, balance_id)
+        criteria.append(Balance.user_id == user_id)
+    return criteria
+
+async def update_balance(db: AsyncSession, balance_id: int, balance: BalanceUpdate, user_id: int = None):
+    """
+    Update a balance with validation and optional user ownership check.
+    Runs a single UPDATE ... WHERE id = ? AND user_id = ? instead of fetching the row first.
+    Returns None when no balance matched.
+    """
+    validate_id(balance_id, "balance_id")
     
-    if db_balance:
-        update_data = balance.dict(exclude_unset=True)
-        # Validate amount if it's being updated (allows $0)
-        if 'amount' in update_data:
-            update_data['amount'] = validate_balance_amount(update_data['amount'])
-        for key, value in update_data.items():
-            setattr(db_balance, key, value)
-        db.commit()
-        db.refresh(db_balance)
-    return db_balance
+    update_data = balance.dict(exclude_unset=True)
+    # Validate amount if it's being updated (allows $0)
+    if 'amount' in update_data:
+        update_data['amount'] = validate_balance_amount(update_data['amount'])
+    
+    if not update_data:
+        # Nothing to write, just return the current row
+        result = await db.execute(select(Balance).where(*_ownership_filter(balance_id, user_id)))
+        return result.scalars().first()
+    
+    statement = (
+        update(Balance)
+        .where(*_ownership_filter(balance_id, user_id))
+        .values(**update_data)
+    )
+    connection = await db.connection()
+    if connection.dialect.update_returning:
+        # Get the stored row back from the UPDATE itself (sqlite, PostgreSQL)
+        result = await db.execute(
+            statement.returning(Balance),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        db_balance = result.scalars().first()
+        await db.commit()
+        return db_balance
+    
+    result = await db.execute(statement.execution_options(synchronize_session=False))
+    await db.commit()
+    if result.rowcount == 0:
+        return None
+    
+    # No UPDATE ... RETURNING (MySQL, MariaDB): re-read the row so untouched columns come back as stored
+    result = await db.execute(
+        select(Balance).where(Balance.id == balance_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
 
-def delete_balance(db: Session, balance_id: int, user_id: int = None):
-    """Delete a balance with optional user ownership check"""
-    if user_id:
-        db_balance = get_balance_for_user(db, balance_id, user_id)
-    else:
-        db_balance = get_balance(db, balance_id)
+async def delete_balance(db: AsyncSession, balance_id: int, user_id: int = None):
+    """
+    Delete a balance and its transactions with optional user ownership check.
+    Uses ownership-scoped bulk DELETEs in one transaction instead of loading the balance graph.
+    """
+    validate_id(balance_id, "balance_id")
+    owned_balance = select(Balance.id).where(*_ownership_filter(balance_id, user_id))
+    
+    for model in (Income, Expense, SuggestionCache):
+        await db.execute(
+            delete(model)
+            .where(model.balance_id.in_(owned_balance))
+            .execution_options(synchronize_session=False)
+        )
+    result = await db.execute(
+        delete(Balance)
+        .where(*_ownership_filter(balance_id, user_id))
+        .execution_options(synchronize_session=False)
+    )
     
-    if db_balance:
-        db.delete(db_balance)
-        db.commit()
-        return True
-    return False
\ No newline at end of file
+    if result.rowcount == 0:
+        await db.rollback()
+        return False
+    await db.commit()
+    return True
\ No newline at end of file
@@ -1,24 +1,32 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from db.models import Expense, Balance
 from schemas.balance import ExpenseCreate, ExpenseUpdate
 from fastapi import HTTPException
+from typing import Any, Dict, List, Optional
+from crud.transactions import bulk_create, import_records, adjust_balance_totals, update_ledger_row, delete_ledger_row
+from crud.pagination import keyset_page
 
-def get_expense(db: Session, expense_id: int):
-    """Get an expense by ID"""
-    return db.query(Expense).filter(Expense.id == expense_id).first()
+async def get_expense(db: AsyncSession, expense_id: int):
+    """Get an expense by ID (with its balance loaded for ownership checks)"""
+    result = await db.execute(
+        select(Expense).options(selectinload(Expense.balance)).where(Expense.id == expense_id)
+    )
+    return result.scalars().first()
 
-def get_expenses_by_balance(db: Session, balance_id: int):
-    """Get all expenses for a balance"""
-    return db.query(Expense).filter(Expense.balance_id == balance_id).all()
+async def get_expenses_by_balance(db: AsyncSession, balance_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get one page of a balance's expenses, newest first"""
+    return await keyset_page(db, Expense, select(Expense).where(Expense.balance_id == balance_id), cursor, limit)
 
-def get_all_expenses(db: Session, skip: int = 0, limit: int = 100):
-    """Get all expenses with pagination"""
-    return db.query(Expense).offset(skip).limit(limit).all()
+async def get_all_expenses(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100):
+    """Get one page of all expenses, newest first"""
+    return await keyset_page(db, Expense, select(Expense), cursor, limit)
 
-def create_expense(db: Session, expense: ExpenseCreate):
+async def create_expense(db: AsyncSession, expense: ExpenseCreate):
     """Create a new expense"""
     # Verify that the balance exists
-    balance = db.query(Balance).filter(Balance.id == expense.balance_id).first()
+    balance = await db.get(Balance, expense.balance_id)
     if not balance:
         raise HTTPException(status_code=404, detail="Balance not found")
     
@@ -28,36 +36,23 @@ def create_expense(db: Session, expense: ExpenseCreate):
         amount=expense.amount
     )
     db.add(db_expense)
-    db.commit()
-    db.refresh(db_expense)
+    await adjust_balance_totals(db, Expense, expense.balance_id, expense.amount, 1)
+    await db.commit()
+    await db.refresh(db_expense)
     return db_expense
 
-def update_expense(db: Session, expense_id: int, expense: ExpenseUpdate):
-    """Update an expense"""
-    db_expense = get_expense(db, expense_id)
-    if not db_expense:
-        return None
-    
-    update_data = expense.dict(exclude_unset=True)
-    
-    # If balance_id is being updated, verify that the balance exists
-    if "balance_id" in update_data:
-        balance = db.query(Balance).filter(Balance.id == update_data["balance_id"]).first()
-        if not balance:
-            raise HTTPException(status_code=404, detail="Balance not found")
-    
-    for key, value in update_data.items():
-        setattr(db_expense, key, value)
-    
-    db.commit()
-    db.refresh(db_expense)
-    return db_expense
+async def create_expenses_bulk(db: AsyncSession, items: List[Dict[str, Any]], user_id: int, partial: bool = False):
+    """Validate and create many expenses in one transaction (ownership checked once per balance)"""
+    return await bulk_create(db, Expense, ExpenseCreate, items, user_id, partial)
+
+async def import_expenses(db: AsyncSession, records, balance_id: int, chunk_size: int):
+    """Stream parsed upload records into expenses for a balance, committing every chunk_size rows"""
+    return await import_records(db, Expense, ExpenseCreate, records, balance_id, chunk_size)
+
+async def update_expense(db: AsyncSession, expense_id: int, expense: ExpenseUpdate):
+    """Update an expense (its row is locked while the running totals are adjusted)"""
+    return await update_ledger_row(db, Expense, expense_id, expense.dict(exclude_unset=True))
 
-def delete_expense(db: Session, expense_id: int):
+async def delete_expense(db: AsyncSession, expense_id: int):
     """Delete an expense"""
-    db_expense = get_expense(db, expense_id)
-    if db_expense:
-        db.delete(db_expense)
-        db.commit()
-        return True
-    return False
\ No newline at end of file
+    return await delete_ledger_row(db, Expense, expense_id)
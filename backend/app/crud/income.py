@@ -1,24 +1,32 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from db.models import Income, Balance
 from schemas.balance import IncomeCreate, IncomeUpdate
 from fastapi import HTTPException
+from typing import Any, Dict, List, Optional
+from crud.transactions import bulk_create, import_records, adjust_balance_totals, update_ledger_row, delete_ledger_row
+from crud.pagination import keyset_page
 
-def get_income(db: Session, income_id: int):
-    """Get an income by ID"""
-    return db.query(Income).filter(Income.id == income_id).first()
+async def get_income(db: AsyncSession, income_id: int):
+    """Get an income by ID (with its balance loaded for ownership checks)"""
+    result = await db.execute(
+        select(Income).options(selectinload(Income.balance)).where(Income.id == income_id)
+    )
+    return result.scalars().first()
 
-def get_incomes_by_balance(db: Session, balance_id: int):
-    """Get all incomes for a balance"""
-    return db.query(Income).filter(Income.balance_id == balance_id).all()
+async def get_incomes_by_balance(db: AsyncSession, balance_id: int, cursor: Optional[str] = None, limit: int = 100):
+    """Get one page of a balance's incomes, newest first"""
+    return await keyset_page(db, Income, select(Income).where(Income.balance_id == balance_id), cursor, limit)
 
-def get_all_incomes(db: Session, skip: int = 0, limit: int = 100):
-    """Get all incomes with pagination"""
-    return db.query(Income).offset(skip).limit(limit).all()
+async def get_all_incomes(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100):
+    """Get one page of all incomes, newest first"""
+    return await keyset_page(db, Income, select(Income), cursor, limit)
 
-def create_income(db: Session, income: IncomeCreate):
+async def create_income(db: AsyncSession, income: IncomeCreate):
     """Create a new income"""
     # Verify that the balance exists
-    balance = db.query(Balance).filter(Balance.id == income.balance_id).first()
+    balance = await db.get(Balance, income.balance_id)
     if not balance:
         raise HTTPException(status_code=404, detail="Balance not found")
     
@@ -28,36 +36,23 @@ def create_income(db: Session, income: IncomeCreate):
         amount=income.amount
     )
     db.add(db_income)
-    db.commit()
-    db.refresh(db_income)
+    await adjust_balance_totals(db, Income, income.balance_id, income.amount, 1)
+    await db.commit()
+    await db.refresh(db_income)
     return db_income
 
-def update_income(db: Session, income_id: int, income: IncomeUpdate):
-    """Update an income"""
-    db_income = get_income(db, income_id)
-    if not db_income:
-        return None
-    
-    update_data = income.dict(exclude_unset=True)
-    
-    # If balance_id is being updated, verify that the balance exists
-    if "balance_id" in update_data:
-        balance = db.query(Balance).filter(Balance.id == update_data["balance_id"]).first()
-        if not balance:
-            raise HTTPException(status_code=404, detail="Balance not found")
-    
-    for key, value in update_data.items():
-        setattr(db_income, key, value)
-    
-    db.commit()
-    db.refresh(db_income)
-    return db_income
+async def create_incomes_bulk(db: AsyncSession, items: List[Dict[str, Any]], user_id: int, partial: bool = False):
+    """Validate and create many incomes in one transaction (ownership checked once per balance)"""
+    return await bulk_create(db, Income, IncomeCreate, items, user_id, partial)
+
+async def import_incomes(db: AsyncSession, records, balance_id: int, chunk_size: int):
+    """Stream parsed upload records into incomes for a balance, committing every chunk_size rows"""
+    return await import_records(db, Income, IncomeCreate, records, balance_id, chunk_size)
+
+async def update_income(db: AsyncSession, income_id: int, income: IncomeUpdate):
+    """Update an income (its row is locked while the running totals are adjusted)"""
+    return await update_ledger_row(db, Income, income_id, income.dict(exclude_unset=True))
 
-def delete_income(db: Session, income_id: int):
+async def delete_income(db: AsyncSession, income_id: int):
     """Delete an income"""
-    db_income = get_income(db, income_id)
-    if db_income:
-        db.delete(db_income)
-        db.commit()
-        return True
-    return False
\ No newline at end of file
+    return await delete_ledger_row(db, Income, income_id)
@@ -0,0 +1,61 @@
+# backend/app/crud/pagination.py
+"""
+Keyset (cursor) pagination on (created_at, id), newest first.
+The cursor is an opaque urlsafe-base64 token of the last row's key, so deep
+pages cost the same as the first one instead of scanning an OFFSET.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import base64
+import binascii
+import json
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Build the opaque cursor for the row a page ended on"""
+    payload = json.dumps([created_at.isoformat() if created_at else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Parse a cursor token, raising 400 if it was not produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def _after_cursor(model, cursor: str):
+    """WHERE clause selecting the rows that sort after the cursor in (created_at DESC, id DESC) order"""
+    created_at, row_id = decode_cursor(cursor)
+    # Compare against the stored value of the cursor row when it still exists, so the
+    # key matches the column's own precision/format (sqlite keeps whole seconds as text)
+    anchor = func.coalesce(
+        select(model.created_at).where(model.id == row_id).scalar_subquery(),
+        created_at
+    )
+    return or_(
+        model.created_at < anchor,
+        and_(model.created_at == anchor, model.id < row_id)
+    )
+
+async def keyset_page(db: AsyncSession, model, statement, cursor: Optional[str], limit: int) -> dict:
+    """
+    Run `statement` (a select of `model`) one page at a time.
+    Returns {"items": [...], "next_cursor": token or None}.
+    """
+    if cursor:
+        statement = statement.where(_after_cursor(model, cursor))
+    statement = statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+    result = await db.execute(statement)
+    items = result.scalars().all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,27 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.models import SuggestionCache, Balance
 from fastapi import HTTPException
 import json
 
-def get_suggestion_cache(db: Session, balance_id: int):
+async def get_suggestion_cache(db: AsyncSession, balance_id: int):
     """Get the cached suggestion for a balance"""
-    return db.query(SuggestionCache).filter(SuggestionCache.balance_id == balance_id).first()
+    result = await db.execute(select(SuggestionCache).where(SuggestionCache.balance_id == balance_id))
+    return result.scalars().first()
 
-def create_or_update_suggestion_cache(db: Session, balance_id: int, suggestion_data: dict):
+async def create_or_update_suggestion_cache(db: AsyncSession, balance_id: int, suggestion_data: dict):
     """Create or update a suggestion cache entry"""
     # Verify that the balance exists
-    balance = db.query(Balance).filter(Balance.id == balance_id).first()
+    balance = await db.get(Balance, balance_id)
     if not balance:
         raise HTTPException(status_code=404, detail="Balance not found")
     
     # Check if a cache entry already exists
-    existing_cache = get_suggestion_cache(db, balance_id)
+    existing_cache = await get_suggestion_cache(db, balance_id)
     
     if existing_cache:
         # Update existing entry
         existing_cache.suggestion_data = suggestion_data
-        db.commit()
-        db.refresh(existing_cache)
+        await db.commit()
+        await db.refresh(existing_cache)
         return existing_cache
     else:
         # Create new entry
@@ -30,15 +32,15 @@ def create_or_update_suggestion_cache(db: Session, balance_id: int, suggestion_d
             suggestion_data=suggestion_data
         )
         db.add(db_suggestion)
-        db.commit()
-        db.refresh(db_suggestion)
+        await db.commit()
+        await db.refresh(db_suggestion)
         return db_suggestion
 
-def delete_suggestion_cache(db: Session, balance_id: int):
+async def delete_suggestion_cache(db: AsyncSession, balance_id: int):
     """Delete a suggestion cache entry"""
-    db_suggestion = get_suggestion_cache(db, balance_id)
+    db_suggestion = await get_suggestion_cache(db, balance_id)
     if db_suggestion:
-        db.delete(db_suggestion)
-        db.commit()
+        await db.delete(db_suggestion)
+        await db.commit()
         return True
     return False
\ No newline at end of file
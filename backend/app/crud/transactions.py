@@ -0,0 +1,239 @@
+# backend/app/crud/transactions.py
+"""
+Shared helpers for writing many incomes/expenses at once.
+Rows are validated individually so failures can be reported per row,
+ownership is checked once per distinct balance_id, and valid rows are
+written with a single executemany INSERT. Streamed imports reuse the
+same validation but insert and commit in fixed-size chunks, and exports
+read the ledger back through server-side cursors. Every write path keeps
+the balance's running totals in step via adjust_balance_totals; single-row
+updates and deletes lock the row first so their deltas never use a stale amount.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from collections import defaultdict
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from db.models import Balance, Income, Expense
+
+# Denormalized (total, count) columns on balances for each ledger model
+TOTAL_COLUMNS = {
+    Income: ("total_income", "income_count"),
+    Expense: ("total_expense", "expense_count"),
+}
+
+async def adjust_balance_totals(db: AsyncSession, model, balance_id: int, amount_delta: float, count_delta: int = 0):
+    """
+    Add to a balance's running total/count for `model` (Income or Expense).
+    Done as an atomic UPDATE ... SET col = col + delta in the caller's transaction,
+    so concurrent writers can't lose each other's changes.
+    """
+    if not amount_delta and not count_delta:
+        return
+    total_column, count_column = TOTAL_COLUMNS[model]
+    await db.execute(
+        update(Balance)
+        .where(Balance.id == balance_id)
+        .values({
+            total_column: getattr(Balance, total_column) + amount_delta,
+            count_column: getattr(Balance, count_column) + count_delta,
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+async def add_rows_to_totals(db: AsyncSession, model, values: List[dict]):
+    """Fold newly inserted rows into their balances' totals, one UPDATE per distinct balance"""
+    deltas = defaultdict(lambda: [0.0, 0])
+    for row in values:
+        deltas[row["balance_id"]][0] += row["amount"]
+        deltas[row["balance_id"]][1] += 1
+    for balance_id, (amount, count) in deltas.items():
+        await adjust_balance_totals(db, model, balance_id, amount, count)
+
+async def lock_ledger_row(db: AsyncSession, model, row_id: int):
+    """
+    Read a ledger row with SELECT ... FOR UPDATE, overwriting any copy already in the
+    session, so concurrent updates of the same row serialize on its current amount
+    """
+    result = await db.execute(
+        select(model)
+        .where(model.id == row_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def update_ledger_row(db: AsyncSession, model, row_id: int, update_data: dict):
+    """
+    Apply update_data to an income/expense and move its amount between running totals
+    (moving to another balance shifts the row's count too). Returns None if the row is gone.
+    """
+    # If balance_id is being updated, verify that the balance exists
+    if "balance_id" in update_data:
+        balance = await db.get(Balance, update_data["balance_id"])
+        if not balance:
+            raise HTTPException(status_code=404, detail="Balance not found")
+
+    row = await lock_ledger_row(db, model, row_id)
+    if row is None:
+        return None
+
+    old_balance_id, old_amount = row.balance_id, row.amount
+    for key, value in update_data.items():
+        setattr(row, key, value)
+
+    if row.balance_id == old_balance_id:
+        await adjust_balance_totals(db, model, old_balance_id, row.amount - old_amount)
+    else:
+        await adjust_balance_totals(db, model, old_balance_id, -old_amount, -1)
+        await adjust_balance_totals(db, model, row.balance_id, row.amount, 1)
+
+    await db.commit()
+    await db.refresh(row)
+    return row
+
+async def delete_ledger_row(db: AsyncSession, model, row_id: int) -> bool:
+    """Delete an income/expense and take it out of its balance's running totals"""
+    row = await lock_ledger_row(db, model, row_id)
+    if row is None:
+        return False
+    await adjust_balance_totals(db, model, row.balance_id, -row.amount, -1)
+    await db.delete(row)
+    await db.commit()
+    return True
+
+def validate_rows(schema, items: Iterable[Dict[str, Any]], start_index: int = 0) -> Tuple[List[Tuple[int, BaseModel]], List[dict]]:
+    """Validate raw rows against a Create schema, returning (index, row) pairs and per-row errors"""
+    valid_rows = []
+    errors = []
+    for index, item in enumerate(items, start=start_index):
+        try:
+            valid_rows.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": e.errors(include_url=False, include_context=False)})
+    return valid_rows, errors
+
+async def get_balance_owners(db: AsyncSession, balance_ids: Iterable[int]) -> Dict[int, int]:
+    """Map each existing balance_id to its user_id with a single query"""
+    balance_ids = set(balance_ids)
+    if not balance_ids:
+        return {}
+    result = await db.execute(select(Balance.id, Balance.user_id).where(Balance.id.in_(balance_ids)))
+    return dict(result.all())
+
+def check_ownership(valid_rows: List[Tuple[int, BaseModel]], owners: Dict[int, int], user_id: int) -> Tuple[List[dict], List[dict]]:
+    """Split validated rows into insertable values and per-row ownership errors"""
+    values = []
+    errors = []
+    for index, row in valid_rows:
+        owner_id = owners.get(row.balance_id, -1)
+        if owner_id == -1:
+            errors.append({"index": index, "detail": "Balance not found"})
+        elif owner_id and owner_id != user_id:
+            errors.append({"index": index, "detail": "Access denied"})
+        else:
+            values.append(row.model_dump())
+    return values, errors
+
+async def bulk_create(db: AsyncSession, model, schema, items: List[Dict[str, Any]], user_id: int, partial: bool = False) -> dict:
+    """
+    Validate and insert many rows of `model` in one transaction.
+    When partial is False nothing is written if any row fails.
+    """
+    valid_rows, errors = validate_rows(schema, items)
+    owners = await get_balance_owners(db, (row.balance_id for _, row in valid_rows))
+    values, ownership_errors = check_ownership(valid_rows, owners, user_id)
+    errors = sorted(errors + ownership_errors, key=lambda error: error["index"])
+
+    if errors and not partial:
+        return {"created": 0, "failed": len(errors), "errors": errors}
+
+    if values:
+        await db.execute(insert(model), values)
+        await add_rows_to_totals(db, model, values)
+        await db.commit()
+
+    return {"created": len(values), "failed": len(errors), "errors": errors}
+
+
+async def import_records(
+    db: AsyncSession,
+    model,
+    schema,
+    records: AsyncIterator[Tuple[int, Optional[dict], Optional[str]]],
+    balance_id: int,
+    chunk_size: int,
+    max_reported_errors: int = 100
+) -> dict:
+    """
+    Validate streamed records for one (already ownership-checked) balance and
+    insert them in chunks of chunk_size, committing after each chunk.
+    Only the first max_reported_errors errors are returned; all are counted.
+    """
+    created = 0
+    failed = 0
+    chunks_committed = 0
+    errors = []
+    values = []
+
+    async def flush():
+        nonlocal created, chunks_committed
+        await db.execute(insert(model), values)
+        await add_rows_to_totals(db, model, values)
+        await db.commit()
+        created += len(values)
+        chunks_committed += 1
+        values.clear()
+
+    async for index, record, parse_error in records:
+        if record is not None:
+            record["balance_id"] = balance_id  # Rows always belong to the target balance
+            valid_rows, row_errors = validate_rows(schema, [record], start_index=index)
+        else:
+            valid_rows, row_errors = [], [{"index": index, "detail": parse_error}]
+
+        if row_errors:
+            failed += 1
+            if len(errors) < max_reported_errors:
+                errors.extend(row_errors)
+            continue
+
+        values.append(valid_rows[0][1].model_dump())
+        if len(values) >= chunk_size:
+            await flush()
+
+    if values:
+        await flush()
+
+    return {
+        "created": created,
+        "failed": failed,
+        "chunks_committed": chunks_committed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+
+async def stream_ledger(db: AsyncSession, balance_id: int, batch_size: int) -> AsyncIterator[List[tuple]]:
+    """
+    Yield a balance's incomes then expenses as batches of
+    (type, id, description, amount, created_at) tuples.
+    Plain column selects with yield_per stream through a server-side cursor,
+    so no ORM objects are built and at most batch_size rows are held at once.
+    """
+    sources = (
+        ("income", Income, Income.source),
+        ("expense", Expense, Expense.category),
+    )
+    for kind, model, description in sources:
+        statement = (
+            select(model.id, description, model.amount, model.created_at)
+            .where(model.balance_id == balance_id)
+            .order_by(model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            yield [(kind, *row) for row in partition]
@@ -1,12 +1,21 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select, update, delete, bindparam
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, timedelta
 from fastapi import HTTPException
-from db.models import User, LoginAttempt, Balance
+from db.models import User, LoginAttempt, LoginAttemptDaily, Balance
 from schemas.user import UserRegistration
 from core.user_validation import validate_registration_data
 from core.password_config import PasswordConfig
 from core.password_hashing import PasswordHasher
+from core.password_pool import password_pool
+from core.user_cache import user_cache
+from core.login_throttle import login_throttle, ThrottleStoreUnavailable
+from core.login_audit import login_audit
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,9 +32,10 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     """Get user by ID"""
     return db.query(User).filter(User.id == user_id).first()
 
-def create_user(db: Session, user_data: UserRegistration) -> User:
+async def create_user(db: Session, user_data: UserRegistration) -> User:
     """
     Create a new user with validation, password hashing, and auto-create initial balance
+    (the hash runs on the password pool, so it can raise 429 when the pool is saturated)
     """
     # Validate registration data
     validated_data = validate_registration_data(
@@ -46,7 +56,7 @@ def create_user(db: Session, user_data: UserRegistration) -> User:
         raise HTTPException(status_code=409, detail="Email already registered")
     
     # Hash the password with PBKDF2 and unique salt
-    hashed_password = PasswordHasher.hash_password(validated_data["password"])
+    hashed_password = await password_pool.hash_password(validated_data["password"])
     logger.info(f"Password hashed for user {validated_data['username']}")
     
     try:
@@ -81,6 +91,20 @@ def create_user(db: Session, user_data: UserRegistration) -> User:
         raise HTTPException(status_code=500, detail="Failed to create user account")
 
 
+def update_user(db: Session, user: User, **fields) -> User:
+    """
+    Update user fields and drop the user's cached auth snapshot
+    (under the old and the new username when the username changes)
+    """
+    previous_username = user.username
+    for key, value in fields.items():
+        setattr(user, key, value)
+    db.commit()
+    db.refresh(user)
+    user_cache.invalidate(previous_username)
+    if user.username != previous_username:
+        user_cache.invalidate(user.username)
+    return user
 
 def get_failed_login_attempts(db: Session, user_id: int, since_minutes: int = None) -> int:
     """
@@ -99,16 +123,53 @@ def get_failed_login_attempts(db: Session, user_id: int, since_minutes: int = No
         )
     ).count()
 
-def is_user_locked_out(db: Session, user_id: int) -> bool:
+def get_failed_login_times(db: Session, user_id: int, since: datetime) -> list:
+    """
+    attempted_at of a user's failed attempts since a UTC cutoff (seeds the login throttle)
+    """
+    return db.execute(
+        select(LoginAttempt.attempted_at).where(
+            LoginAttempt.user_id == user_id,
+            LoginAttempt.success == False,
+            LoginAttempt.attempted_at >= since
+        )
+    ).scalars().all()
+
+def count_failed_logins_in_db(db: Session, user_id: int) -> int:
+    """
+    Failures in the lockout window counted from login_attempts, after writing this
+    process's queued audit rows (the fallback when the shared throttle is unreachable)
+    """
+    login_audit.flush()
+    return get_failed_login_attempts(db, user_id)
+
+async def is_user_locked_out(db: Session, user_id: int) -> bool:
     """
     Check if user is currently locked out due to too many failed attempts
+    (answered by the sliding-window throttle; the audit table is only read to seed it,
+    or to fail closed when the shared store is down)
+    """
+    login_throttle.ensure_seeded(user_id, lambda since: get_failed_login_times(db, user_id, since))
+    try:
+        return await login_throttle.is_locked_out(user_id)
+    except ThrottleStoreUnavailable as e:
+        logger.warning(f"Login throttle unavailable, counting failures in login_attempts: {str(e)}")
+        return count_failed_logins_in_db(db, user_id) >= PasswordConfig.MAX_LOGIN_ATTEMPTS
+
+async def record_failed_login(db: Session, user_id: int, ip_address: str) -> int:
+    """
+    Count a failed attempt in the throttle, queue its audit row, and return the failures in the window
     """
-    failed_attempts = get_failed_login_attempts(db, user_id)
-    return failed_attempts >= PasswordConfig.MAX_LOGIN_ATTEMPTS
+    login_audit.record(user_id, ip_address, False)
+    try:
+        return await login_throttle.record_failure(user_id)
+    except ThrottleStoreUnavailable as e:
+        logger.warning(f"Login throttle unavailable, counting failures in login_attempts: {str(e)}")
+        return count_failed_logins_in_db(db, user_id)
 
 def record_login_attempt(db: Session, user_id: int, ip_address: str, success: bool) -> LoginAttempt:
     """
-    Record a login attempt
+    Record a login attempt synchronously (logins use the batched core.login_audit writer instead)
     """
     login_attempt = LoginAttempt(
         user_id=user_id,
@@ -122,9 +183,104 @@ def record_login_attempt(db: Session, user_id: int, ip_address: str, success: bo
     
     return login_attempt
 
-def authenticate_user(db: Session, username_or_email: str, password: str, ip_address: str) -> User:
+def upsert_daily_counts(db: Session, values: list) -> None:
+    """
+    Add success/failure counts to login_attempts_daily rows in one INSERT that adds to
+    the existing row on a (user_id, day) conflict, so concurrent roll-ups creating the
+    same day never collide on the unique index (MySQL, sqlite and PostgreSQL upserts)
+    """
+    table = LoginAttemptDaily.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql_insert(table)
+        statement = statement.on_duplicate_key_update(
+            success_count=table.c.success_count + statement.inserted.success_count,
+            failure_count=table.c.failure_count + statement.inserted.failure_count,
+        )
+    elif dialect in ("sqlite", "postgresql"):
+        statement = (sqlite_insert if dialect == "sqlite" else postgresql_insert)(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={
+                "success_count": table.c.success_count + statement.excluded.success_count,
+                "failure_count": table.c.failure_count + statement.excluded.failure_count,
+            },
+        )
+    else:
+        raise NotImplementedError(f"No login_attempts_daily upsert for the {dialect} dialect")
+    db.execute(statement, values)
+
+def roll_up_login_attempts(db: Session, rows) -> int:
+    """
+    Add (user_id, attempted_at, success) rows to the per-user daily counts
+    (no commit, so the caller can delete the same rows in the same transaction)
+    Returns the number of daily rows touched.
+    """
+    counts = defaultdict(lambda: [0, 0])  # (user_id, day) -> [successes, failures]
+    for row in rows:
+        counts[(row.user_id, row.attempted_at.date())][0 if row.success else 1] += 1
+    if counts:
+        upsert_daily_counts(db, [
+            {"user_id": user_id, "day": day, "success_count": successes, "failure_count": failures}
+            for (user_id, day), (successes, failures) in counts.items()
+        ])
+    return len(counts)
+
+def purge_login_attempts(db: Session, retention_days: int, batch_size: int = 1000, aggregate: bool = True, max_batches: int = None) -> dict:
+    """
+    Delete login attempts older than retention_days, oldest first, batch_size rows per
+    transaction, optionally rolling each batch into login_attempts_daily first.
+    Rolling up and deleting a batch commit together, so an interrupted run never counts
+    a row twice and can simply be rerun. Overlapping runs never count a row twice either:
+    the batch read skips rows another run has locked (FOR UPDATE SKIP LOCKED), and only
+    rows this run's DELETE actually removed are rolled up (RETURNING where supported,
+    otherwise a batch whose rowcount falls short is rolled back and read again).
+    Run it with `python -m jobs.purge_login_attempts`.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    columns = (LoginAttempt.id, LoginAttempt.user_id, LoginAttempt.attempted_at, LoginAttempt.success)
+    delete_returning = db.get_bind().dialect.delete_returning
+    deleted = 0
+    batches = 0
+    
+    while max_batches is None or batches < max_batches:
+        rows = db.execute(
+            select(*columns)
+            .where(LoginAttempt.attempted_at < cutoff)
+            .order_by(LoginAttempt.attempted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            break
+        
+        try:
+            statement = delete(LoginAttempt).where(LoginAttempt.id.in_([row.id for row in rows]))
+            options = {"synchronize_session": False}
+            if delete_returning:
+                rows = db.execute(statement.returning(*columns), execution_options=options).all()
+            elif db.execute(statement, execution_options=options).rowcount != len(rows):
+                # Another run deleted part of this batch first; read it again
+                db.rollback()
+                continue
+            if aggregate and rows:
+                roll_up_login_attempts(db, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Login attempt purge failed after {deleted} rows: {str(e)}")
+            raise
+        
+        deleted += len(rows)
+        batches += 1
+        logger.info(f"Purged {deleted} login attempts older than {cutoff:%Y-%m-%d %H:%M} so far")
+    
+    return {"deleted": deleted, "batches": batches, "cutoff": cutoff}
+
+async def authenticate_user(db: Session, username_or_email: str, password: str, ip_address: str) -> User:
     """
     Authenticate user using PBKDF2 password verification
+    (verification runs on the password pool, so it can raise 429 when the pool is saturated)
     """
     # Find user by username or email
     user = get_user_by_username(db, username_or_email)
@@ -137,22 +293,27 @@ def authenticate_user(db: Session, username_or_email: str, password: str, ip_add
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Check if user is locked out
-    if is_user_locked_out(db, user.id):
-        record_login_attempt(db, user.id, ip_address, False)
+    if await is_user_locked_out(db, user.id):
+        await record_failed_login(db, user.id, ip_address)
         logger.warning(f"Login attempt for locked account: {user.username} from IP: {ip_address}")
         raise HTTPException(
             status_code=429, 
             detail=f"Account locked due to too many failed attempts. Try again in {PasswordConfig.LOCKOUT_DURATION_MINUTES} minutes."
         )
     
-    # Verify password using PBKDF2
+    # Verify password against its stored scheme
     password_valid = False
     
     # Check if password is already hashed (for backward compatibility during migration)
     if PasswordHasher.is_password_hashed(user.password):
-        # Use PBKDF2 verification
-        password_valid = PasswordHasher.verify_password(password, user.password)
-        logger.debug(f"PBKDF2 password verification for user {user.username}: {'success' if password_valid else 'failed'}")
+        # Verify with the scheme and cost recorded in the hash
+        password_valid = await password_pool.verify_password(password, user.password)
+        logger.debug(f"Password verification for user {user.username}: {'success' if password_valid else 'failed'}")
+        
+        # Upgrade hashes made with an older scheme or cost while the plain password is at hand
+        if password_valid and PasswordHasher.needs_rehash(user.password):
+            logger.info(f"Rehashing password for user {user.username} with the current scheme")
+            update_user(db, user, password=await password_pool.hash_password(password))
     else:
         # Legacy plain text comparison (should not happen in production)
         password_valid = (user.password == password)
@@ -161,12 +322,10 @@ def authenticate_user(db: Session, username_or_email: str, password: str, ip_add
         # Auto-migrate to hashed password on successful login
         if password_valid:
             logger.info(f"Auto-migrating password to PBKDF2 for user {user.username}")
-            user.password = PasswordHasher.hash_password(password)
-            db.commit()
+            update_user(db, user, password=await password_pool.hash_password(password))
     
     if not password_valid:
-        record_login_attempt(db, user.id, ip_address, False)
-        failed_attempts = get_failed_login_attempts(db, user.id)
+        failed_attempts = await record_failed_login(db, user.id, ip_address)
         
         logger.warning(f"Failed login attempt for user {user.username} from IP: {ip_address} (attempt {failed_attempts}/{PasswordConfig.MAX_LOGIN_ATTEMPTS})")
         
@@ -185,45 +344,64 @@ def authenticate_user(db: Session, username_or_email: str, password: str, ip_add
     
     # Check if user is active
     if not user.is_active:
-        record_login_attempt(db, user.id, ip_address, False)
+        await record_failed_login(db, user.id, ip_address)
         logger.warning(f"Login attempt for deactivated account: {user.username} from IP: {ip_address}")
         raise HTTPException(status_code=401, detail="Account is deactivated")
     
     # Successful login
-    record_login_attempt(db, user.id, ip_address, True)
+    login_audit.record(user.id, ip_address, True)
     logger.info(f"Successful login for user {user.username} from IP: {ip_address}")
     return user
 
-def migrate_plain_text_passwords(db: Session) -> int:
+def migrate_plain_text_passwords(db: Session, chunk_size: int = 500, workers: int = None, start_after_id: int = 0) -> int:
     """
-    Migrate any existing plain text passwords to PBKDF2 hashes
-    This should be run once during deployment
+    Hash any remaining plain text passwords, streaming users by id in chunks.
+    Each chunk is hashed across a process pool and committed before the next is read,
+    so an interrupted run keeps its progress; rerunning skips hashed rows, and
+    start_after_id resumes past the last logged id without rescanning.
+    Run it offline with `python -m jobs.migrate_passwords`.
     
     Returns:
         Number of passwords migrated
     """
     migrated_count = 0
+    last_id = start_after_id
     
-    try:
-        # Find users with plain text passwords
-        users = db.query(User).all()
-        
-        for user in users:
-            if not PasswordHasher.is_password_hashed(user.password):
-                # This is a plain text password, hash it
-                logger.info(f"Migrating plain text password for user {user.username}")
-                user.password = PasswordHasher.hash_password(user.password)
-                migrated_count += 1
-        
-        if migrated_count > 0:
-            db.commit()
-            logger.info(f"Successfully migrated {migrated_count} plain text passwords to PBKDF2")
-        else:
-            logger.info("No plain text passwords found to migrate")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            # Keyset pagination on the primary key; only the two columns needed
+            rows = db.execute(
+                select(User.id, User.password)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
             
-    except Exception as e:
-        logger.error(f"Error during password migration: {str(e)}")
-        db.rollback()
-        raise
+            plain = [row for row in rows if not PasswordHasher.is_password_hashed(row.password)]
+            if plain:
+                hashed = executor.map(PasswordHasher.hash_password, [row.password for row in plain])
+                # Only overwrite rows still holding the plain password we hashed
+                users = User.__table__
+                result = db.execute(
+                    update(users)
+                    .where(users.c.id == bindparam("user_id"), users.c.password == bindparam("plain_password"))
+                    .values(password=bindparam("hashed_password")),
+                    [
+                        {"user_id": row.id, "plain_password": row.password, "hashed_password": password_hash}
+                        for row, password_hash in zip(plain, hashed)
+                    ],
+                )
+                db.commit()
+                migrated_count += result.rowcount if result.rowcount >= 0 else len(plain)
+            
+            logger.info(f"Password migration: scanned through user id {last_id}, {migrated_count} migrated so far")
+    
+    if migrated_count > 0:
+        logger.info(f"Successfully migrated {migrated_count} plain text passwords")
+    else:
+        logger.info("No plain text passwords found to migrate")
     
-    return migrated_count
\ No newline at end of file
+    return migrated_count
@@ -1,10 +1,10 @@
 import logging
 from sqlalchemy.exc import SQLAlchemyError
-from .database import Base, engine, get_db
-from .upgrade import upgrade_database, add_foreign_key_constraint
+from .database import Base, engine, get_db, async_engine, get_async_db
+from .upgrade import upgrade_database, add_foreign_key_constraint, add_missing_indexes, add_balance_total_columns
 
 # Import all models to ensure they are registered with the Base metadata
-from .models import Balance, Income, Expense, SuggestionCache, User, LoginAttempt
+from .models import Balance, Income, Expense, SuggestionCache, User, LoginAttempt, LoginAttemptDaily
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -24,11 +24,13 @@ def init_db():
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
         
-        # Step 3: Add foreign key constraints after all tables exist
+        # Step 3: Add foreign key constraints and any indexes older tables are missing
         add_foreign_key_constraint(engine)
+        add_missing_indexes(engine, Base.metadata)
+        add_balance_total_columns(engine)
         
-        # Step 4: Migrate any existing plain text passwords to PBKDF2
-        migrate_existing_passwords()
+        # Plain text passwords are not migrated here: hashing them can take minutes,
+        # so run `python -m jobs.migrate_passwords` offline (logins also migrate them one by one)
         
         logger.info("✅ Database initialization completed successfully!")
         
@@ -38,31 +40,3 @@ def init_db():
     except Exception as e:
         logger.error(f"Unexpected error during database initialization: {str(e)}")
         raise
-
-def migrate_existing_passwords():
-    """
-    Migrate any existing plain text passwords to PBKDF2 hashes
-    """
-    try:
-        # Import here to avoid circular imports
-        from crud.user import migrate_plain_text_passwords
-        
-        # Get a database session
-        db_gen = get_db()
-        db = next(db_gen)
-        
-        try:
-            logger.info("Checking for plain text passwords to migrate...")
-            migrated_count = migrate_plain_text_passwords(db)
-            
-            if migrated_count > 0:
-                logger.info(f"✅ Migrated {migrated_count} passwords to PBKDF2")
-            else:
-                logger.info("✅ All passwords are already using PBKDF2")
-                
-        finally:
-            db.close()
-            
-    except Exception as e:
-        logger.warning(f"Password migration failed (non-critical): {str(e)}")
-        # Don't raise - this is not critical for app startup
\ No newline at end of file
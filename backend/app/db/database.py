@@ -1,6 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
+from core.config import settings
+from .pool_metrics import PoolMetrics, instrument_pool_class
 import os
 import time
 import logging
@@ -15,11 +19,42 @@ DB_USER = os.getenv("DB_USER", "budget_user")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "budget_password")
 DB_NAME = os.getenv("DB_NAME", "budget_db")
 
-# Create the database URL
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+# Create the database URLs (DATABASE_URL / ASYNC_DATABASE_URL override them, e.g. sqlite for tests)
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+)
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+)
+
+def get_connect_args(url):
+    """Driver-specific connection arguments (sqlite does not understand connect_timeout)"""
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False} if "aiosqlite" not in url else {}
+    return {"connect_timeout": 10}  # Connection timeout in seconds
+
+# Pool telemetry for each engine, exposed through /metrics
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+def get_pool_options(pool_class, metrics):
+    """Pool sizing and pre-ping options from settings, with checkout timing into metrics"""
+    options = {
+        "poolclass": instrument_pool_class(pool_class, metrics),
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if pool_class is not NullPool:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_use_lifo=settings.db_pool_use_lifo,
+        )
+    return options
 
 # Function to create engine with retry logic
-def create_engine_with_retry(url, max_retries=5, retry_interval=2):
+def create_engine_with_retry(url, max_retries=5, retry_interval=2, metrics=None):
     """Create a SQLAlchemy engine with retry logic for connection issues"""
     retry_count = 0
     last_exception = None
@@ -29,10 +64,11 @@ def create_engine_with_retry(url, max_retries=5, retry_interval=2):
             logger.info(f"Attempting to connect to database (attempt {retry_count + 1}/{max_retries})...")
             engine = create_engine(
                 url,
-                pool_pre_ping=True,  # Verify connection before using from pool
-                pool_recycle=3600,   # Recycle connections after 1 hour
-                connect_args={"connect_timeout": 10}  # Connection timeout in seconds
+                connect_args=get_connect_args(url),
+                **get_pool_options(QueuePool, metrics or PoolMetrics("unused"))
             )
+            if metrics:
+                metrics.attach(engine)
             
             # Test the connection
             with engine.connect() as conn:
@@ -54,11 +90,34 @@ def create_engine_with_retry(url, max_retries=5, retry_interval=2):
     raise Exception("Could not connect to the database")
 
 # Create the SQLAlchemy engine with retry logic
-engine = create_engine_with_retry(SQLALCHEMY_DATABASE_URL)
+engine = create_engine_with_retry(SQLALCHEMY_DATABASE_URL, metrics=sync_pool_metrics)
 
 # Create a SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Function to create the async engine used by the request handlers
+def create_async_engine_for_url(url, metrics=None):
+    """Create the AsyncEngine (connections are opened lazily, the sync engine already verified the DB)"""
+    # aiosqlite connections are bound to the event loop that opened them, so don't pool them
+    pool_class = NullPool if url.startswith("sqlite") else AsyncAdaptedQueuePool
+    async_engine = create_async_engine(
+        url,
+        connect_args=get_connect_args(url),
+        **get_pool_options(pool_class, metrics or PoolMetrics("unused"))
+    )
+    if metrics:
+        metrics.attach(async_engine.sync_engine)
+    return async_engine
+
+# Create the async engine and AsyncSessionLocal class for non-blocking database sessions
+async_engine = create_async_engine_for_url(ASYNC_SQLALCHEMY_DATABASE_URL, metrics=async_pool_metrics)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Objects are serialized after commit, avoid implicit reloads
+)
+
 # Create a Base class for database models
 Base = declarative_base()
 
@@ -68,4 +127,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Function to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
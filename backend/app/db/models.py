@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, JSON, Boolean, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -18,13 +18,23 @@ class User(Base):
     # Relationships
     balances = relationship("Balance", back_populates="user", cascade="all, delete-orphan")
     login_attempts = relationship("LoginAttempt", back_populates="user", cascade="all, delete-orphan")
+    login_attempts_daily = relationship("LoginAttemptDaily", back_populates="user", cascade="all, delete-orphan")
 
 class Balance(Base):
     __tablename__ = "balances"
+    __table_args__ = (
+        Index("idx_balances_user_id", "user_id"),  # get_user_balances / ownership lookups
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True) 
     amount = Column(Float, nullable=False)
+
+    # Running ledger totals, maintained by crud on every income/expense write
+    total_income = Column(Float, nullable=False, default=0.0, server_default="0")
+    total_expense = Column(Float, nullable=False, default=0.0, server_default="0")
+    income_count = Column(Integer, nullable=False, default=0, server_default="0")
+    expense_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     user = relationship("User", back_populates="balances")
@@ -34,6 +44,9 @@ class Balance(Base):
 
 class Income(Base):
     __tablename__ = "incomes"
+    __table_args__ = (
+        Index("idx_incomes_balance_created", "balance_id", "created_at"),  # per-balance listings, newest first
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     balance_id = Column(Integer, ForeignKey("balances.id"), nullable=False)
@@ -46,6 +59,9 @@ class Income(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("idx_expenses_balance_created", "balance_id", "created_at"),  # per-balance listings, newest first
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     balance_id = Column(Integer, ForeignKey("balances.id"), nullable=False)
@@ -69,6 +85,10 @@ class SuggestionCache(Base):
 
 class LoginAttempt(Base):
     __tablename__ = "login_attempts"
+    __table_args__ = (
+        Index("idx_login_attempts_user_success_time", "user_id", "success", "attempted_at"),  # lockout window counts
+        Index("idx_login_attempts_attempted_at", "attempted_at"),  # retention scans by age
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -77,4 +97,20 @@ class LoginAttempt(Base):
     success = Column(Boolean, default=False)
     
     # Relationships
-    user = relationship("User", back_populates="login_attempts")
\ No newline at end of file
+    user = relationship("User", back_populates="login_attempts")
+
+class LoginAttemptDaily(Base):
+    """Per-user daily login counts, rolled up from login_attempts rows past retention"""
+    __tablename__ = "login_attempts_daily"
+    __table_args__ = (
+        Index("idx_login_attempts_daily_user_day", "user_id", "day", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    success_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    user = relationship("User", back_populates="login_attempts_daily")
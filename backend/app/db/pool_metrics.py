@@ -0,0 +1,149 @@
+# backend/app/db/pool_metrics.py
+"""
+Connection pool telemetry used to size the database pools.
+
+Counters are fed by SQLAlchemy pool events; checkout latency (including any
+time spent waiting for a free connection) is timed around Pool.connect().
+"""
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import threading
+import time
+
+class PoolMetrics:
+    """
+    Checked-out/overflow gauges, event counters and a checkout latency histogram for one engine
+    """
+
+    # Histogram bucket upper bounds in milliseconds
+    LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters (the attached engine is kept)"""
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_time_ms = 0.0
+            self.latency_counts = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+            self.latency_sum_ms = 0.0
+            self.latency_count = 0
+
+    def attach(self, engine):
+        """Register pool event listeners on a (sync) engine"""
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def observe_checkout(self, elapsed_seconds: float, waited: bool, timed_out: bool = False):
+        """Record the latency of one Pool.connect() call"""
+        elapsed_ms = elapsed_seconds * 1000
+        bucket = len(self.LATENCY_BUCKETS_MS)
+        for index, upper_bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if elapsed_ms <= upper_bound:
+                bucket = index
+                break
+
+        with self._lock:
+            self.latency_counts[bucket] += 1
+            self.latency_sum_ms += elapsed_ms
+            self.latency_count += 1
+            if waited:
+                self.waits += 1
+                self.wait_time_ms += elapsed_ms
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        """Return the current gauges, counters and cumulative latency histogram"""
+        pool = self.engine.pool if self.engine is not None else None
+
+        def gauge(method_name):
+            method = getattr(pool, method_name, None)
+            return method() if callable(method) else None
+
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for upper_bound, count in zip(self.LATENCY_BUCKETS_MS, self.latency_counts):
+                cumulative += count
+                buckets[str(upper_bound)] = cumulative
+            buckets["+Inf"] = cumulative + self.latency_counts[-1]
+
+            return {
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "size": gauge("size"),
+                "checked_out": gauge("checkedout"),
+                "checked_in": gauge("checkedin"),
+                "overflow": gauge("overflow"),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "wait_time_ms": round(self.wait_time_ms, 3),
+                "checkout_latency_ms": {
+                    "count": self.latency_count,
+                    "sum": round(self.latency_sum_ms, 3),
+                    "buckets": buckets,
+                },
+            }
+
+def instrument_pool_class(pool_class, metrics: PoolMetrics):
+    """
+    Build a subclass of pool_class that times Pool.connect() into metrics.
+    The metrics reference lives on the class so it survives Pool.recreate() on dispose().
+    """
+
+    class TimedPool(pool_class):
+        def connect(self):
+            # A checkout has to wait when every pooled and overflow connection is in use
+            size = getattr(self, "size", None)
+            max_overflow = getattr(self, "_max_overflow", -1)
+            waited = (
+                callable(size)
+                and max_overflow > -1
+                and self.checkedout() >= size() + max_overflow
+            )
+
+            start = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                metrics.observe_checkout(time.perf_counter() - start, waited, timed_out=True)
+                raise
+            metrics.observe_checkout(time.perf_counter() - start, waited)
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    TimedPool.__qualname__ = TimedPool.__name__
+    return TimedPool
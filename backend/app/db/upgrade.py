@@ -100,4 +100,90 @@ def add_foreign_key_constraint(engine):
         return False
     except Exception as e:
         logger.warning(f"Unexpected error adding foreign key: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+def add_missing_indexes(engine, metadata):
+    """
+    Create any index declared on the models that an existing table lacks.
+    create_all() only builds indexes for tables it creates, so installations
+    that predate an index get it here. Safe to run on every startup.
+    """
+    try:
+        inspector = inspect(engine)
+        tables = set(inspector.get_table_names())
+        created = 0
+
+        for table in metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+
+            existing = inspector.get_indexes(table.name)
+            existing_names = {index['name'] for index in existing}
+            existing_columns = {tuple(index['column_names']) for index in existing}
+
+            for index in table.indexes:
+                columns = tuple(column.name for column in index.columns)
+                if index.name in existing_names or columns in existing_columns:
+                    continue
+
+                logger.info(f"Adding index {index.name} on {table.name} {columns}...")
+                index.create(bind=engine)
+                created += 1
+
+        if created:
+            logger.info(f"✅ Added {created} missing index(es)")
+        return True
+
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not add missing indexes: {str(e)}")
+        # Not critical - queries still work, just slower
+        return False
+    except Exception as e:
+        logger.warning(f"Unexpected error adding indexes: {str(e)}")
+        return False
+
+
+BALANCE_TOTAL_COLUMNS = {
+    "total_income": "FLOAT NOT NULL DEFAULT 0",
+    "total_expense": "FLOAT NOT NULL DEFAULT 0",
+    "income_count": "INT NOT NULL DEFAULT 0",
+    "expense_count": "INT NOT NULL DEFAULT 0",
+}
+
+def add_balance_total_columns(engine):
+    """
+    Add the running-total columns to an existing balances table and fill them
+    from the ledger once. Installations that already have them are skipped.
+    """
+    try:
+        inspector = inspect(engine)
+        columns = [col['name'] for col in inspector.get_columns('balances')]
+        missing = [name for name in BALANCE_TOTAL_COLUMNS if name not in columns]
+
+        if not missing:
+            logger.info("Balances table already has running-total columns, skipping upgrade")
+            return True
+
+        logger.info(f"Upgrading database: adding {', '.join(missing)} to balances table...")
+        with engine.begin() as conn:
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE balances ADD COLUMN {name} {BALANCE_TOTAL_COLUMNS[name]}"))
+
+            # Backfill from the detail tables
+            conn.execute(text("""
+                UPDATE balances SET
+                    total_income = (SELECT COALESCE(SUM(amount), 0) FROM incomes WHERE incomes.balance_id = balances.id),
+                    income_count = (SELECT COUNT(*) FROM incomes WHERE incomes.balance_id = balances.id),
+                    total_expense = (SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE expenses.balance_id = balances.id),
+                    expense_count = (SELECT COUNT(*) FROM expenses WHERE expenses.balance_id = balances.id)
+            """))
+
+        logger.info("✅ Added and backfilled running-total columns on balances")
+        return True
+
+    except SQLAlchemyError as e:
+        logger.error(f"Balance totals upgrade failed: {str(e)}")
+        return False
+    except Exception as e:
+        logger.error(f"Unexpected error during balance totals upgrade: {str(e)}")
+        return False
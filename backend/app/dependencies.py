@@ -20,11 +20,11 @@ def validate_expense_id(
     return expense_id
 
 def validate_pagination(
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, max_length=200, description="Opaque cursor from the previous page's next_cursor"),
     limit: int = Query(100, gt=0, le=500, description="Maximum number of items to return")
-) -> Tuple[int, int]:
-    """Validate pagination parameters."""
-    return skip, limit
+) -> Tuple[Optional[str], int]:
+    """Validate keyset pagination parameters."""
+    return cursor, limit
 
 def validate_balance_id_query(
     balance_id: Optional[int] = Query(None, gt=0, description="Filter by balance ID")
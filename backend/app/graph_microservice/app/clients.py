@@ -0,0 +1,126 @@
+# backend/app/graph_microservice/app/clients.py
+"""
+Shared HTTP client for calls back into the backend (legacy GET endpoints only).
+Opened in the app lifespan, or lazily on first use, and reused across requests
+so keep-alive connections are pooled instead of reconnecting on every call.
+The transport counts requests, errors, in-flight requests and latency (time to
+response headers) for GET /metrics.
+"""
+
+import os
+import threading
+import time
+
+import httpx
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8000")
+
+class UpstreamMetrics:
+    """
+    Request, error and latency counters for the backend upstream. A trimmed-down
+    take on the backend's core/http_clients.py (this service has one upstream and
+    does not need its latency histogram or pool inspection).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters"""
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.server_errors = 0
+            self.in_flight = 0
+            self.latency_sum_ms = 0.0
+            self.latency_max_ms = 0.0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, elapsed_seconds: float, status_code: int | None):
+        """Record one ended request (status_code is None for transport errors and cancellations)"""
+        elapsed_ms = elapsed_seconds * 1000
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.latency_sum_ms += elapsed_ms
+            self.latency_max_ms = max(self.latency_max_ms, elapsed_ms)
+            if status_code is None:
+                self.errors += 1
+            elif status_code >= 500:
+                self.server_errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "server_errors": self.server_errors,
+                "in_flight": self.in_flight,
+                "latency_ms": {
+                    "mean": round(self.latency_sum_ms / self.requests, 3) if self.requests else None,
+                    "max": round(self.latency_max_ms, 3),
+                },
+            }
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport that times every request (to response headers) into an UpstreamMetrics"""
+
+    def __init__(self, metrics: UpstreamMetrics, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.metrics.started()
+        start = time.perf_counter()
+        status_code = None
+        try:
+            response = await super().handle_async_request(request)
+            status_code = response.status_code
+            return response
+        finally:  # Also runs on cancellation, so in_flight never leaks
+            self.metrics.finished(time.perf_counter() - start, status_code)
+
+backend_metrics = UpstreamMetrics()
+
+_backend_client: httpx.AsyncClient | None = None
+
+def get_backend_client() -> httpx.AsyncClient:
+    """Return the shared backend client, creating it on first use"""
+    global _backend_client
+    if _backend_client is None or _backend_client.is_closed:
+        transport = InstrumentedTransport(
+            backend_metrics,
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("BACKEND_MAX_CONNECTIONS", "100")),
+                max_keepalive_connections=int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", "20")),
+                keepalive_expiry=float(os.getenv("BACKEND_KEEPALIVE_EXPIRY", "30")),
+            ),
+            http2=os.getenv("BACKEND_HTTP2", "false").lower() == "true",  # Requires the h2 package
+        )
+        _backend_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                float(os.getenv("BACKEND_READ_TIMEOUT", "30")),
+                connect=float(os.getenv("BACKEND_CONNECT_TIMEOUT", "5")),
+            ),
+            transport=transport,
+        )
+    return _backend_client
+
+async def close_backend_client():
+    """Close the shared client and its pooled connections"""
+    global _backend_client
+    if _backend_client is not None:
+        await _backend_client.aclose()
+        _backend_client = None
+
+def backend_client_stats() -> dict:
+    """Request metrics of the backend client for GET /metrics"""
+    return {
+        "base_url": BACKEND_URL,
+        "open": _backend_client is not None and not _backend_client.is_closed,
+        **backend_metrics.snapshot(),
+    }
@@ -1,9 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
 from app.routes.graph_routes import router as graph_router
+from app.routes.metrics_routes import router as metrics_router
+from app.clients import get_backend_client, close_backend_client
+from app.simulation_pool import shutdown_process_pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the app's lifetime
+    get_backend_client()
+    yield
+    await close_backend_client()
+    shutdown_process_pool()
 
 # Create a FastAPI instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Include routes
-app.include_router(graph_router)
\ No newline at end of file
+app.include_router(graph_router)
+app.include_router(metrics_router)
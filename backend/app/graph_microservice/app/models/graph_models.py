@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import Annotated
+from pydantic import BaseModel, Field
 
 class BalanceGraphData(BaseModel):
     year: int
@@ -7,3 +8,65 @@ class BalanceGraphData(BaseModel):
 class ProjectedRevenueData(BaseModel):
     year: int
     projected_balance: float
+
+class ProjectionRequest(BaseModel):
+    """Snapshot plus the growth rates and horizons (in years from now) to project"""
+    current_balance: float
+    total_income: float = Field(0.0, ge=0)
+    total_expense: float = Field(0.0, ge=0)
+    growth_rates: list[Annotated[float, Field(gt=-1, le=1)]] = Field(default=[0.08], min_length=1, max_length=10)
+    horizons: list[Annotated[int, Field(ge=0, le=100)]] = Field(default=[15], min_length=1, max_length=10)
+
+class HorizonPoint(BaseModel):
+    years: int
+    year: int
+    balance: float
+    projected_balances: dict[str, float]  # Keyed by growth rate, e.g. "0.08"
+
+class ProjectionResponse(BaseModel):
+    balance_id: int
+    balance_graph: list[BalanceGraphData]                   # Linear series up to the longest horizon
+    projected_revenue: dict[str, list[ProjectedRevenueData]]  # One compounded series per growth rate
+    horizons: list[HorizonPoint]
+
+class ScenarioRequest(BaseModel):
+    """Snapshot plus the grid to sweep: growth rates x monthly contribution changes x horizons"""
+    current_balance: float
+    total_income: float = Field(0.0, ge=0)
+    total_expense: float = Field(0.0, ge=0)
+    growth_rates: list[Annotated[float, Field(gt=-1, le=1)]] = Field(default=[0.08], min_length=1, max_length=50)
+    contribution_changes: list[float] = Field(default=[0.0], min_length=1, max_length=50)  # Added to the monthly net
+    horizons: list[Annotated[int, Field(ge=0, le=100)]] = Field(default=[15], min_length=1, max_length=20)
+
+class ScenarioGrid(BaseModel):
+    balance_id: int
+    growth_rates: list[float]
+    contribution_changes: list[float]
+    horizons: list[int]
+    years: list[int]                             # Calendar year of each horizon
+    balances: list[list[float]]                  # Linear: [contribution change][horizon]
+    projected_balances: list[list[list[float]]]  # Compounded: [growth rate][contribution change][horizon]
+
+class MonteCarloRequest(BaseModel):
+    """Snapshot plus the return and cash-flow distributions to sample"""
+    current_balance: float
+    total_income: float = Field(0.0, ge=0)
+    total_expense: float = Field(0.0, ge=0)
+    mean_return: float = Field(0.08, gt=-1, le=1)
+    return_volatility: float = Field(0.15, ge=0, le=1)
+    cash_flow_volatility: float = Field(0.10, ge=0, le=1)  # Std dev of the yearly savings, as a fraction
+    horizon: int = Field(15, ge=0, le=100)
+    paths: int = Field(10_000, ge=100, le=50_000)
+    seed: int | None = Field(None, ge=0)  # Fixed seed -> reproducible bands
+
+class PercentileBand(BaseModel):
+    year: int
+    p5: float
+    p50: float
+    p95: float
+
+class MonteCarloResponse(BaseModel):
+    balance_id: int
+    paths: int
+    seed: int | None
+    bands: list[PercentileBand]
@@ -0,0 +1,101 @@
+# backend/app/graph_microservice/app/projection.py
+"""
+Vectorized projection engine.
+
+Every series here has a closed form, so instead of stepping month by month and
+year by year we evaluate it directly for any number of years (n):
+
+    linear:      B0 + C * n
+    compounded:  B0 * (1+r)^n + C * (1+r) * ((1+r)^n - 1) / r     (C * n when r == 0)
+
+where B0 is the current balance and C the yearly contribution (12 x the monthly net).
+The compounded form matches "add the yearly savings, then apply growth" repeated n times.
+All functions broadcast over NumPy arrays, so a whole grid of growth rates,
+contribution changes and horizons is a single expression.
+"""
+
+import numpy as np
+
+MONTHS_PER_YEAR = 12
+
+def annuity_factor(rates, years):
+    """((1+r)^n - 1) / r, with its r -> 0 limit n; expm1/log1p keep small rates accurate"""
+    rates = np.asarray(rates, dtype=float)
+    years = np.asarray(years, dtype=float)
+    zero = rates == 0
+    safe_rates = np.where(zero, 1.0, rates)
+    return np.where(zero, years, np.expm1(years * np.log1p(rates)) / safe_rates)
+
+def linear_balances(current_balance, annual_contribution, years):
+    """Balance after `years` yearly contributions without growth"""
+    return current_balance + np.asarray(annual_contribution, dtype=float) * np.asarray(years, dtype=float)
+
+def compounded_balances(current_balance, annual_contribution, rates, years):
+    """Balance after `years` rounds of adding the yearly contribution, then growing by `rates`"""
+    rates = np.asarray(rates, dtype=float)
+    years = np.asarray(years, dtype=float)
+    growth = np.power(1 + rates, years)
+    return current_balance * growth + np.asarray(annual_contribution, dtype=float) * (1 + rates) * annuity_factor(rates, years)
+
+def projection_series(current_balance: float, monthly_net: float, growth_rates, last_year_index: int):
+    """
+    Yearly series from year index 0 to `last_year_index` (year index i holds i+1 contributions).
+    Returns (linear, compounded) with shapes (T,) and (len(growth_rates), T).
+    """
+    years = np.arange(1, last_year_index + 2)
+    annual_contribution = monthly_net * MONTHS_PER_YEAR
+    linear = linear_balances(current_balance, annual_contribution, years)
+    rates = np.asarray(growth_rates, dtype=float)[:, np.newaxis]
+    compounded = compounded_balances(current_balance, annual_contribution, rates, years[np.newaxis, :])
+    return linear, compounded
+
+def scenario_grid(current_balance: float, monthly_net: float, growth_rates, contribution_changes, horizons):
+    """
+    Evaluate every (growth rate, monthly contribution change, horizon) combination at once.
+    The point for horizon h holds h+1 contributions, like year index h of projection_series.
+    Returns (linear, compounded) with shapes (C, H) and (R, C, H).
+    """
+    rates = np.asarray(growth_rates, dtype=float)[:, np.newaxis, np.newaxis]
+    changes = np.asarray(contribution_changes, dtype=float)
+    years = np.asarray(horizons, dtype=float) + 1
+
+    annual_contribution = ((monthly_net + changes) * MONTHS_PER_YEAR)[:, np.newaxis]
+    linear = linear_balances(current_balance, annual_contribution, years[np.newaxis, :])
+    compounded = compounded_balances(current_balance, annual_contribution[np.newaxis], rates, years[np.newaxis, np.newaxis, :])
+    return linear, compounded
+
+MONTE_CARLO_PERCENTILES = (5, 50, 95)
+
+def simulate_percentiles(
+    current_balance: float,
+    monthly_net: float,
+    mean_return: float,
+    return_volatility: float,
+    cash_flow_volatility: float,
+    last_year_index: int,
+    paths: int,
+    seed: int | None = None,
+    batch_size: int = 10_000,
+):
+    """
+    Monte Carlo version of the compounded series: each year the yearly savings vary by a
+    normal factor (1 + N(0, cash_flow_volatility)) and the return is N(mean_return, return_volatility),
+    floored at -100%. Paths are simulated in batches of arrays, each year stepping the whole batch at once.
+    Returns the p5/p50/p95 balance per year index, shape (3, T). The same seed gives the same bands.
+    """
+    years = last_year_index + 1
+    annual_contribution = monthly_net * MONTHS_PER_YEAR
+    rng = np.random.default_rng(seed)
+    balances = np.empty((paths, years))
+
+    for start in range(0, paths, batch_size):
+        size = min(batch_size, paths - start)
+        growth = np.maximum(1 + rng.normal(mean_return, return_volatility, (size, years)), 0.0)
+        contributions = annual_contribution * (1 + rng.normal(0.0, cash_flow_volatility, (size, years)))
+
+        balance = np.full(size, float(current_balance))
+        for year in range(years):
+            balance = (balance + contributions[:, year]) * growth[:, year]
+            balances[start:start + size, year] = balance
+
+    return np.percentile(balances, MONTE_CARLO_PERCENTILES, axis=0)
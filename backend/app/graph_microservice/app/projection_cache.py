@@ -0,0 +1,103 @@
+# backend/app/graph_microservice/app/projection_cache.py
+"""
+LRU + TTL cache of rendered projection responses, keyed by an ETag of the inputs.
+
+Projections are pure functions of their inputs (balance amount, income and expense
+sums, rates, horizons, year) plus the current year, so the input ETag doubles as
+the cache key: a client sending it back in If-None-Match gets a 304 without
+any computation. Entries hold the encoded JSON body, so hits also skip serialization.
+"""
+
+from collections import OrderedDict
+import inspect
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.etag import etag_matches
+
+class ProjectionCache:
+    """
+    Bounded TTL + LRU cache with hit/miss counters
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for key, or None on a miss/expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, body: bytes) -> None:
+        """Cache a body, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+projection_cache = ProjectionCache(
+    max_size=int(os.getenv("PROJECTION_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("PROJECTION_CACHE_TTL_SECONDS", "300")),
+)
+
+async def cached_json(request: Request, etag: str, compute) -> Response:
+    """
+    Respond 304 if the client already has this input ETag (from app.etag.input_etag),
+    else serve the cached body or compute (sync or async), encode and cache it.
+    The ETag doubles as the cache key.
+    """
+    headers = {"ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = projection_cache.get(etag)
+    if body is None:
+        result = compute()
+        if inspect.isawaitable(result):
+            result = await result
+        body = JSONResponse(jsonable_encoder(result)).body
+        projection_cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,13 +1,230 @@
 # backend/app/graph_microservice/app/routes/graph_routes.py
 from fastapi import APIRouter, HTTPException, Path, Query, Request
+import asyncio
 import httpx
 from datetime import datetime
-from app.models.graph_models import BalanceGraphData, ProjectedRevenueData
+from app.models.graph_models import (
+    BalanceGraphData, ProjectedRevenueData,
+    ProjectionRequest, ProjectionResponse, HorizonPoint,
+    ScenarioRequest, ScenarioGrid,
+    MonteCarloRequest, MonteCarloResponse, PercentileBand,
+)
+from app.projection import projection_series, scenario_grid, simulate_percentiles
+from app.simulation_pool import run_simulation
+from app.etag import input_etag
+from app.projection_cache import cached_json
+from app.clients import BACKEND_URL, get_backend_client
 
 router = APIRouter()
 
-# Backend URL
-BACKEND_URL = "http://backend:8000"
+def rate_key(rate: float) -> str:
+    """
+    Stable string key for a growth rate (0.08 -> "0.08"). repr is the shortest string
+    that round-trips the float, so distinct rates never share a key.
+    """
+    return repr(float(rate))
+
+def compute_projection(current_balance: float, monthly_income: float, monthly_expense: float, growth_rates: list[float], horizons: list[int]) -> dict:
+    """
+    Compute the linear balance series and one compounded series per growth rate,
+    up to the longest horizon, in closed form (see app.projection).
+    Linear: the monthly net is added 12 times a year.
+    Compounded: the yearly savings are added, then growth is applied annually.
+    """
+    start_year = datetime.now().year
+    linear, compounded = projection_series(current_balance, monthly_income - monthly_expense, growth_rates, max(horizons))
+    calendar_years = range(start_year, start_year + len(linear))
+
+    balance_graph = [BalanceGraphData(year=year, balance=balance) for year, balance in zip(calendar_years, linear.tolist())]
+    projected_revenue = {
+        rate_key(rate): [ProjectedRevenueData(year=year, projected_balance=balance) for year, balance in zip(calendar_years, series)]
+        for rate, series in zip(growth_rates, compounded.tolist())
+    }
+
+    horizon_points = [
+        HorizonPoint(
+            years=years,
+            year=start_year + years,
+            balance=balance_graph[years].balance,
+            projected_balances={key: series[years].projected_balance for key, series in projected_revenue.items()},
+        )
+        for years in sorted(set(horizons))
+    ]
+    return {"balance_graph": balance_graph, "projected_revenue": projected_revenue, "horizons": horizon_points}
+
+def _horizon_for(year: int = None) -> int:
+    """Years from now to a target year (default: 15 years ahead)"""
+    current_year = datetime.now().year
+    return (year or current_year + 15) - current_year
+
+def compute_balance_graph(current_balance: float, monthly_income: float, monthly_expense: float, year: int = None) -> list[BalanceGraphData]:
+    """Linear balance per year up to the target year"""
+    horizon = _horizon_for(year)
+    if horizon < 0:
+        return []
+    return compute_projection(current_balance, monthly_income, monthly_expense, [0.08], [horizon])["balance_graph"]
+
+def compute_projected_revenue(current_balance: float, monthly_income: float, monthly_expense: float, year: int = None) -> list[ProjectedRevenueData]:
+    """Yearly savings added, then 8% growth compounded annually, up to the target year"""
+    horizon = _horizon_for(year)
+    if horizon < 0:
+        return []
+    return compute_projection(current_balance, monthly_income, monthly_expense, [0.08], [horizon])["projected_revenue"]["0.08"]
+
+async def fetch_all_pages(client: httpx.AsyncClient, url: str, params: dict, headers: dict):
+    """
+    GET a keyset-paginated backend listing, following next_cursor to the last page.
+    Returns None if the backend answers 404.
+    """
+    params = {**params, "limit": 500}
+    items = []
+    while True:
+        response = await client.get(url, params=params, headers=headers)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        page = response.json()
+        items.extend(page["items"])
+        if not page.get("next_cursor"):
+            return items
+        params["cursor"] = page["next_cursor"]
+
+@router.post("/projection/{balance_id}", response_model=ProjectionResponse)
+async def post_projection(
+    projection: ProjectionRequest,
+    request: Request,
+    balance_id: int = Path(..., description="The ID of the balance"),
+):
+    """
+    Linear balance graph and compounded revenue for several growth rates and horizons,
+    computed in one pass from a snapshot pushed by the backend.
+    """
+    def render():
+        result = compute_projection(
+            projection.current_balance,
+            projection.total_income,
+            projection.total_expense,
+            projection.growth_rates,
+            projection.horizons,
+        )
+        return ProjectionResponse(balance_id=balance_id, **result)
+
+    etag = input_etag("projection", balance_id=balance_id, **projection.model_dump())
+    return await cached_json(request, etag, render)
+
+
+@router.post("/projection/{balance_id}/scenarios", response_model=ScenarioGrid)
+async def post_projection_scenarios(
+    scenarios: ScenarioRequest,
+    request: Request,
+    balance_id: int = Path(..., description="The ID of the balance"),
+):
+    """
+    Evaluate every growth rate x contribution change x horizon combination at once.
+    Only the horizon points are returned, not whole series, so large grids stay small.
+    """
+    def render():
+        linear, compounded = scenario_grid(
+            scenarios.current_balance,
+            scenarios.total_income - scenarios.total_expense,
+            scenarios.growth_rates,
+            scenarios.contribution_changes,
+            scenarios.horizons,
+        )
+        start_year = datetime.now().year
+        return ScenarioGrid(
+            balance_id=balance_id,
+            growth_rates=scenarios.growth_rates,
+            contribution_changes=scenarios.contribution_changes,
+            horizons=scenarios.horizons,
+            years=[start_year + years for years in scenarios.horizons],
+            balances=linear.tolist(),
+            projected_balances=compounded.tolist(),
+        )
+
+    etag = input_etag("scenarios", balance_id=balance_id, **scenarios.model_dump())
+    return await cached_json(request, etag, render)
+
+
+@router.post("/projection/{balance_id}/monte-carlo", response_model=MonteCarloResponse)
+async def post_monte_carlo_projection(
+    simulation: MonteCarloRequest,
+    request: Request,
+    balance_id: int = Path(..., description="The ID of the balance"),
+):
+    """
+    Stochastic version of the projected revenue: p5/p50/p95 balance per year over
+    simulated return and cash-flow paths. Large simulations run in the process pool.
+    Only seeded runs are cached, since an unseeded run is meant to differ each time.
+    """
+    async def render():
+        percentiles = await run_simulation(
+            simulate_percentiles,
+            simulation.current_balance,
+            simulation.total_income - simulation.total_expense,
+            simulation.mean_return,
+            simulation.return_volatility,
+            simulation.cash_flow_volatility,
+            simulation.horizon,
+            simulation.paths,
+            simulation.seed,
+            work=simulation.paths * (simulation.horizon + 1),
+        )
+        start_year = datetime.now().year
+        bands = [
+            PercentileBand(year=start_year + index, p5=p5, p50=p50, p95=p95)
+            for index, (p5, p50, p95) in enumerate(zip(*percentiles.tolist()))
+        ]
+        return MonteCarloResponse(balance_id=balance_id, paths=simulation.paths, seed=simulation.seed, bands=bands)
+
+    if simulation.seed is None:
+        return await render()
+    etag = input_etag("monte-carlo", balance_id=balance_id, **simulation.model_dump())
+    return await cached_json(request, etag, render)
+
+
+async def gather_or_cancel(*coroutines):
+    """
+    Run coroutines concurrently in a TaskGroup and return their results in order.
+    The first failure cancels the others and is re-raised as-is (not as an ExceptionGroup).
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as errors:
+        raise errors.exceptions[0]
+    return [task.result() for task in tasks]
+
+async def fetch_backend_totals(balance_id: int, request: Request | None):
+    """
+    Fetch the balance, incomes and expenses from the backend concurrently
+    (forwarding the caller's JWT) and return (current_balance, monthly_income, monthly_expense).
+    """
+    headers = {}
+    if request and "authorization" in request.headers:
+        headers["Authorization"] = request.headers["authorization"]
+
+    client = get_backend_client()
+
+    async def fetch_balance():
+        balance_response = await client.get(f"{BACKEND_URL}/balance/{balance_id}", headers=headers)
+        if balance_response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Balance not found")
+        balance_response.raise_for_status()
+        return balance_response.json()
+
+    balance, incomes, expenses = await gather_or_cancel(
+        fetch_balance(),
+        fetch_all_pages(client, f"{BACKEND_URL}/incomes/", {"balance_id": balance_id}, headers),
+        fetch_all_pages(client, f"{BACKEND_URL}/expenses/", {"balance_id": balance_id}, headers),
+    )
+
+    if incomes is None and expenses is None:
+        raise HTTPException(status_code=404, detail="Income and Expense data not found")
+
+    monthly_income = sum(item["amount"] for item in incomes or [])
+    monthly_expense = sum(item["amount"] for item in expenses or [])
+    return balance["amount"], monthly_income, monthly_expense
 
 @router.get("/balance-graph/{balance_id}", response_model=list[BalanceGraphData])
 async def get_balance_graph(
@@ -15,73 +232,17 @@ async def get_balance_graph(
     year: int = Query(default=None, description="Year to calculate the balance graph"),
     request: Request = None,  # Add request to access headers
 ):
-    """Fetch data for the given balance ID and compute the balance graph incrementally per month."""
-    
-    # Extract Authorization header to forward to backend
-    headers = {}
-    if request and "authorization" in request.headers:
-        headers["Authorization"] = request.headers["authorization"]
-    
+    """
+    Fetch data for the given balance ID and compute the balance graph incrementally per month.
+    Calls back into the backend; the backend itself POSTs a snapshot to /projection/{balance_id} instead.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            # Forward JWT token when calling backend
-            balance_response = await client.get(
-                f"{BACKEND_URL}/balance/{balance_id}",
-                headers=headers
-            )
-
-            if balance_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Balance not found")
-
-            try:
-                balance_response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(status_code=e.response.status_code, detail=str(e))
-
-            balance = balance_response.json()
-
-            # Fetch incomes and expenses only if the balance exists
-            income_response = await client.get(
-                f"{BACKEND_URL}/incomes/", 
-                params={"balance_id": balance_id},
-                headers=headers
-            )
-            expense_response = await client.get(
-                f"{BACKEND_URL}/expenses/", 
-                params={"balance_id": balance_id},
-                headers=headers
-            )
-
-            if income_response.status_code == 404 and expense_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Income and Expense data not found")
-
-            if income_response.status_code == 404:
-                incomes = []
-            else:
-                income_response.raise_for_status()
-                incomes = income_response.json()
-
-            if expense_response.status_code == 404:
-                expenses = []
-            else:
-                expense_response.raise_for_status()
-                expenses = expense_response.json()
-
-        # Compute the balance graph
-        current_year = datetime.now().year
-        target_year = year or current_year + 15
-        monthly_income = sum(item["amount"] for item in incomes)
-        monthly_expense = sum(item["amount"] for item in expenses)
-        current_balance = balance["amount"]
-
-        results = []
-        for year in range(current_year, target_year + 1):
-            for _ in range(12):  # 12 months in a year
-                current_balance += (monthly_income - monthly_expense)
-            results.append(BalanceGraphData(year=year, balance=current_balance))
-
-        return results
+        current_balance, monthly_income, monthly_expense = await fetch_backend_totals(balance_id, request)
+        etag = input_etag("balance-graph", year=year, current_balance=float(current_balance), total_income=float(monthly_income), total_expense=float(monthly_expense))
+        return await cached_json(request, etag, lambda: compute_balance_graph(current_balance, monthly_income, monthly_expense, year))
 
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     except Exception:
@@ -94,75 +255,18 @@ async def get_projected_revenue(
     year: int = Query(default=None, description="Year to calculate the projected revenue"),
     request: Request = None,  # Add request to access headers
 ):
-    """Fetch data for the given balance ID and compute the projected revenue with yearly compounding."""
-    
-    # Extract Authorization header to forward to backend
-    headers = {}
-    if request and "authorization" in request.headers:
-        headers["Authorization"] = request.headers["authorization"]
-    
+    """
+    Fetch data for the given balance ID and compute the projected revenue with yearly compounding.
+    Calls back into the backend; the backend itself POSTs a snapshot to /projection/{balance_id} instead.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            # Forward JWT token when calling backend
-            balance_response = await client.get(
-                f"{BACKEND_URL}/balance/{balance_id}",
-                headers=headers
-            )
-
-            if balance_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Balance not found")
-
-            try:
-                balance_response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(status_code=e.response.status_code, detail=str(e))
-
-            balance = balance_response.json()
-
-            # Fetch incomes and expenses only if the balance exists
-            income_response = await client.get(
-                f"{BACKEND_URL}/incomes/", 
-                params={"balance_id": balance_id},
-                headers=headers
-            )
-            expense_response = await client.get(
-                f"{BACKEND_URL}/expenses/", 
-                params={"balance_id": balance_id},
-                headers=headers
-            )
-
-            if income_response.status_code == 404 and expense_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Income and Expense data not found")
-
-            if income_response.status_code == 404:
-                incomes = []
-            else:
-                income_response.raise_for_status()
-                incomes = income_response.json()
-
-            if expense_response.status_code == 404:
-                expenses = []
-            else:
-                expense_response.raise_for_status()
-                expenses = expense_response.json()
-
-        # Compute projected revenue
-        current_year = datetime.now().year
-        target_year = year or current_year + 15
-        monthly_income = sum(item["amount"] for item in incomes)
-        monthly_expense = sum(item["amount"] for item in expenses)
-        annual_contribution = (monthly_income - monthly_expense) * 12
-        current_balance = balance["amount"]
-
-        results = []
-        for year in range(current_year, target_year + 1):
-            current_balance += annual_contribution  # Add yearly savings
-            current_balance *= 1.08  # Apply 8% yearly growth (compounded annually)
-            results.append(ProjectedRevenueData(year=year, projected_balance=current_balance))
-
-        return results
+        current_balance, monthly_income, monthly_expense = await fetch_backend_totals(balance_id, request)
+        etag = input_etag("projected-revenue", year=year, current_balance=float(current_balance), total_income=float(monthly_income), total_expense=float(monthly_expense))
+        return await cached_json(request, etag, lambda: compute_projected_revenue(current_balance, monthly_income, monthly_expense, year))
 
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     except Exception:
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
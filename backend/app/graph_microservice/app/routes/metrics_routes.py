@@ -0,0 +1,15 @@
+# backend/app/graph_microservice/app/routes/metrics_routes.py
+from fastapi import APIRouter
+
+from app.clients import backend_client_stats
+from app.projection_cache import projection_cache
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Runtime metrics used to size the projection cache and backend pool (no authentication, like the backend's /metrics)"""
+    return {
+        "projection_cache": projection_cache.stats(),
+        "upstreams": {"backend": backend_client_stats()},
+    }
@@ -1,5 +1,7 @@
 from pathlib import Path
+import asyncio
 import sys
+import time
 import pytest
 import httpx
 import respx
@@ -16,9 +18,19 @@ sys.path.insert(0, str(app_dir))
 # Import the FastAPI app (assumes you have defined it in app/main.py)
 from app.main import app
 
+from app.projection_cache import projection_cache
+from app.routes.graph_routes import compute_projected_revenue
+
 # Create a TestClient instance for our FastAPI app
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    """Each test starts with an empty projection cache"""
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
 # Define test data that will be returned from the mocked backend endpoints
 balance_id = 1
 balance_data = {"amount": 1000.0}
@@ -37,10 +49,10 @@ def test_get_balance_graph_default_year():
         return_value=httpx.Response(200, json=balance_data)
     )
     respx.get(f"{backend_url}/incomes/").mock(
-        return_value=httpx.Response(200, json=incomes_data)
+        return_value=httpx.Response(200, json={"items": incomes_data, "next_cursor": None})
     )
     respx.get(f"{backend_url}/expenses/").mock(
-        return_value=httpx.Response(200, json=expenses_data)
+        return_value=httpx.Response(200, json={"items": expenses_data, "next_cursor": None})
     )
 
     response = client.get(f"/balance-graph/{balance_id}")
@@ -77,10 +89,10 @@ def test_get_balance_graph_with_query_year():
         return_value=httpx.Response(200, json=balance_data)
     )
     respx.get(f"{backend_url}/incomes/").mock(
-        return_value=httpx.Response(200, json=incomes_data)
+        return_value=httpx.Response(200, json={"items": incomes_data, "next_cursor": None})
     )
     respx.get(f"{backend_url}/expenses/").mock(
-        return_value=httpx.Response(200, json=expenses_data)
+        return_value=httpx.Response(200, json={"items": expenses_data, "next_cursor": None})
     )
 
     target_year = 2030
@@ -112,10 +124,10 @@ def test_get_projected_revenue_default_year():
         return_value=httpx.Response(200, json=balance_data)
     )
     respx.get(f"{backend_url}/incomes/").mock(
-        return_value=httpx.Response(200, json=incomes_data)
+        return_value=httpx.Response(200, json={"items": incomes_data, "next_cursor": None})
     )
     respx.get(f"{backend_url}/expenses/").mock(
-        return_value=httpx.Response(200, json=expenses_data)
+        return_value=httpx.Response(200, json={"items": expenses_data, "next_cursor": None})
     )
 
     response = client.get(f"/projected-revenue/{balance_id}")
@@ -147,10 +159,10 @@ def test_get_projected_revenue_with_query_year():
         return_value=httpx.Response(200, json=balance_data)
     )
     respx.get(f"{backend_url}/incomes/").mock(
-        return_value=httpx.Response(200, json=incomes_data)
+        return_value=httpx.Response(200, json={"items": incomes_data, "next_cursor": None})
     )
     respx.get(f"{backend_url}/expenses/").mock(
-        return_value=httpx.Response(200, json=expenses_data)
+        return_value=httpx.Response(200, json={"items": expenses_data, "next_cursor": None})
     )
 
     target_year = 2030
@@ -171,3 +183,355 @@ def test_get_projected_revenue_with_query_year():
     for res, exp in zip(result, expected_results):
         assert res["year"] == exp["year"]
         assert pytest.approx(res["projected_balance"], rel=1e-5) == exp["projected_balance"]
+
+@respx.mock
+def test_get_balance_graph_follows_cursor_pages():
+    """
+    Test that incomes spread over several backend pages are all summed.
+    """
+    respx.get(f"{backend_url}/balance/{balance_id}").mock(
+        return_value=httpx.Response(200, json=balance_data)
+    )
+    income_route = respx.get(f"{backend_url}/incomes/").mock(
+        side_effect=[
+            httpx.Response(200, json={"items": incomes_data[:1], "next_cursor": "page-2"}),
+            httpx.Response(200, json={"items": incomes_data[1:], "next_cursor": None}),
+        ]
+    )
+    respx.get(f"{backend_url}/expenses/").mock(
+        return_value=httpx.Response(200, json={"items": expenses_data, "next_cursor": None})
+    )
+
+    response = client.get(f"/balance-graph/{balance_id}?year={datetime.now().year}")
+    assert response.status_code == 200
+    assert response.json()[0]["balance"] == balance_data["amount"] + 4800
+    assert income_route.calls[1].request.url.params["cursor"] == "page-2"
+
+@respx.mock
+def test_backend_calls_are_instrumented():
+    """
+    Test that backend requests, their latency and server errors show up in /metrics.
+    """
+    from app.clients import backend_metrics
+    backend_metrics.reset()
+    respx.get(f"{backend_url}/balance/{balance_id}").mock(return_value=httpx.Response(200, json=balance_data))
+    respx.get(f"{backend_url}/incomes/").mock(return_value=httpx.Response(200, json={"items": incomes_data, "next_cursor": None}))
+    respx.get(f"{backend_url}/expenses/").mock(return_value=httpx.Response(503))
+
+    response = client.get(f"/balance-graph/{balance_id}")
+    assert response.status_code != 200
+
+    backend = client.get("/metrics").json()["upstreams"]["backend"]
+    assert backend["requests"] == 3
+    assert backend["server_errors"] == 1
+    assert backend["in_flight"] == 0
+    assert backend["latency_ms"]["max"] >= backend["latency_ms"]["mean"] >= 0
+
+@respx.mock
+def test_backend_fetches_run_concurrently():
+    """
+    Test that the balance, income and expense fetches overlap instead of running one after another.
+    """
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow(response):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return response
+
+    respx.get(f"{backend_url}/balance/{balance_id}").mock(
+        side_effect=lambda request: slow(httpx.Response(200, json=balance_data))
+    )
+    respx.get(f"{backend_url}/incomes/").mock(
+        side_effect=lambda request: slow(httpx.Response(200, json={"items": incomes_data, "next_cursor": None}))
+    )
+    respx.get(f"{backend_url}/expenses/").mock(
+        side_effect=lambda request: slow(httpx.Response(200, json={"items": expenses_data, "next_cursor": None}))
+    )
+
+    response = client.get(f"/balance-graph/{balance_id}")
+    assert response.status_code == 200
+    assert max_in_flight == 3
+
+@respx.mock
+def test_missing_balance_cancels_other_fetches():
+    """
+    Test that a 404 for the balance is returned as 404 (not 500) and the sibling fetches are cancelled.
+    """
+    respx.get(f"{backend_url}/balance/{balance_id}").mock(return_value=httpx.Response(404))
+    cancelled = []
+
+    async def never_finishes(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.path)
+            raise
+
+    respx.get(f"{backend_url}/incomes/").mock(side_effect=never_finishes)
+    respx.get(f"{backend_url}/expenses/").mock(side_effect=never_finishes)
+
+    response = client.get(f"/projected-revenue/{balance_id}")
+    assert response.status_code == 404
+    assert sorted(cancelled) == ["/expenses/", "/incomes/"]
+
+def test_projection_multiple_rates_and_horizons():
+    """
+    Test the combined /projection/{balance_id} endpoint: one linear series up to the
+    longest horizon, one compounded series per rate, and a point per horizon.
+    """
+    body = {
+        "current_balance": 1000.0,
+        "total_income": 500.0,
+        "total_expense": 100.0,
+        "growth_rates": [0.08, 0.05],
+        "horizons": [1, 3],
+    }
+    response = client.post(f"/projection/{balance_id}", json=body)
+    assert response.status_code == 200
+    result = response.json()
+    current_year = datetime.now().year
+
+    assert result["balance_id"] == balance_id
+    assert [point["year"] for point in result["balance_graph"]] == list(range(current_year, current_year + 4))
+    assert [point["balance"] for point in result["balance_graph"]] == [5800.0, 10600.0, 15400.0, 20200.0]
+    assert set(result["projected_revenue"]) == {"0.08", "0.05"}
+    assert pytest.approx(result["projected_revenue"]["0.05"][0]["projected_balance"]) == 5800.0 * 1.05
+
+    # Same numbers as the single-purpose computation for the default rate
+    legacy = compute_projected_revenue(1000.0, 500.0, 100.0, current_year + 3)
+    assert result["projected_revenue"]["0.08"] == [point.model_dump() for point in legacy]
+
+    assert [point["years"] for point in result["horizons"]] == [1, 3]
+    assert result["horizons"][1]["year"] == current_year + 3
+    assert result["horizons"][1]["balance"] == 20200.0
+    assert set(result["horizons"][0]["projected_balances"]) == {"0.08", "0.05"}
+
+def test_projection_keeps_close_rates_apart():
+    """
+    Test that rates closer than six significant digits get their own series.
+    """
+    body = {"current_balance": 1000.0, "growth_rates": [0.08, 0.0800001], "horizons": [1]}
+    response = client.post(f"/projection/{balance_id}", json=body)
+    assert response.status_code == 200
+    assert set(response.json()["projected_revenue"]) == {"0.08", "0.0800001"}
+
+def test_projection_validates_inputs():
+    """
+    Test that out-of-range rates and horizons are rejected.
+    """
+    response = client.post(f"/projection/{balance_id}", json={"current_balance": 0, "growth_rates": [-1.5]})
+    assert response.status_code == 422
+    response = client.post(f"/projection/{balance_id}", json={"current_balance": 0, "horizons": [500]})
+    assert response.status_code == 422
+
+def test_projection_engine_matches_yearly_loop():
+    """
+    Test that the closed-form engine matches stepping the loops year by year,
+    including a zero and a negative growth rate.
+    """
+    from app.projection import projection_series
+
+    linear, compounded = projection_series(1000.0, 400.0, [0.08, 0.0, -0.05], 30)
+    for rate, series in zip([0.08, 0.0, -0.05], compounded):
+        expected_linear = expected_compounded = 1000.0
+        for index in range(31):
+            expected_linear += 400.0 * 12
+            expected_compounded = (expected_compounded + 400.0 * 12) * (1 + rate)
+            assert linear[index] == pytest.approx(expected_linear)
+            assert series[index] == pytest.approx(expected_compounded)
+
+def test_projection_scenarios_grid():
+    """
+    Test the /projection/{balance_id}/scenarios grid: shapes follow the inputs
+    and each cell matches the single-scenario projection.
+    """
+    body = {
+        "current_balance": 1000.0,
+        "total_income": 500.0,
+        "total_expense": 100.0,
+        "growth_rates": [0.08, 0.05, 0.0],
+        "contribution_changes": [0.0, 100.0],
+        "horizons": [0, 5, 15],
+    }
+    response = client.post(f"/projection/{balance_id}/scenarios", json=body)
+    assert response.status_code == 200
+    grid = response.json()
+    current_year = datetime.now().year
+
+    assert grid["years"] == [current_year, current_year + 5, current_year + 15]
+    assert len(grid["balances"]) == 2 and len(grid["balances"][0]) == 3
+    assert len(grid["projected_balances"]) == 3 and len(grid["projected_balances"][0]) == 2
+    assert grid["balances"][1][0] == 1000.0 + 500.0 * 12
+
+    single = client.post(f"/projection/{balance_id}", json={**{k: body[k] for k in ("current_balance", "total_income", "total_expense")}, "growth_rates": [0.05], "horizons": [15]}).json()
+    assert grid["balances"][0][2] == pytest.approx(single["horizons"][0]["balance"])
+    assert grid["projected_balances"][1][0][2] == pytest.approx(single["horizons"][0]["projected_balances"]["0.05"])
+
+    response = client.post(f"/projection/{balance_id}/scenarios", json={**body, "horizons": list(range(21))})
+    assert response.status_code == 422
+
+monte_carlo_body = {
+    "current_balance": 1000.0,
+    "total_income": 500.0,
+    "total_expense": 100.0,
+    "horizon": 10,
+    "paths": 2000,
+    "seed": 42,
+}
+
+def test_monte_carlo_bands_are_seeded_and_ordered():
+    """
+    Test that /projection/{balance_id}/monte-carlo returns one ordered band per year
+    and that a fixed seed reproduces the same bands.
+    """
+    response = client.post(f"/projection/{balance_id}/monte-carlo", json=monte_carlo_body)
+    assert response.status_code == 200
+    result = response.json()
+    current_year = datetime.now().year
+
+    assert [band["year"] for band in result["bands"]] == list(range(current_year, current_year + 11))
+    assert all(band["p5"] <= band["p50"] <= band["p95"] for band in result["bands"])
+    assert result["bands"][-1]["p5"] < result["bands"][-1]["p95"]
+
+    again = client.post(f"/projection/{balance_id}/monte-carlo", json=monte_carlo_body)
+    assert again.json() == result
+
+def test_monte_carlo_without_volatility_matches_deterministic():
+    """
+    Test that with zero volatility every band collapses onto the deterministic projection.
+    """
+    body = {**monte_carlo_body, "return_volatility": 0, "cash_flow_volatility": 0}
+    bands = client.post(f"/projection/{balance_id}/monte-carlo", json=body).json()["bands"]
+    legacy = compute_projected_revenue(1000.0, 500.0, 100.0, datetime.now().year + 10)
+
+    for band, point in zip(bands, legacy):
+        assert band["p5"] == pytest.approx(point.projected_balance)
+        assert band["p95"] == pytest.approx(point.projected_balance)
+
+def test_monte_carlo_large_requests_use_process_pool(monkeypatch):
+    """
+    Test that simulations above the threshold run in the process pool with the same seeded result.
+    """
+    import app.simulation_pool as simulation_pool
+
+    inline = client.post(f"/projection/{balance_id}/monte-carlo", json=monte_carlo_body).json()
+    projection_cache.clear()  # Force the second run to simulate again
+
+    submitted = []
+    original_get_pool = simulation_pool.get_process_pool
+    def tracking_get_pool():
+        submitted.append(True)
+        return original_get_pool()
+    monkeypatch.setattr(simulation_pool, "MONTE_CARLO_POOL_THRESHOLD", 0)
+    monkeypatch.setattr(simulation_pool, "get_process_pool", tracking_get_pool)
+    try:
+        pooled = client.post(f"/projection/{balance_id}/monte-carlo", json=monte_carlo_body).json()
+    finally:
+        simulation_pool.shutdown_process_pool()
+
+    assert submitted
+    assert pooled == inline
+
+def test_default_monte_carlo_request_does_not_block_the_loop():
+    """
+    Test that a default-sized simulation (10,000 paths x 16 years) runs off the event loop.
+    """
+    from app.models.graph_models import MonteCarloRequest
+    from app.projection import simulate_percentiles
+    import app.simulation_pool as simulation_pool
+
+    defaults = MonteCarloRequest(current_balance=1000.0, total_income=500.0, total_expense=100.0)
+    work = defaults.paths * (defaults.horizon + 1)
+    assert work > simulation_pool.MONTE_CARLO_POOL_THRESHOLD
+
+    async def scenario():
+        longest_gap = 0.0
+        async def ticker(stop: asyncio.Event):
+            nonlocal longest_gap
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                longest_gap = max(longest_gap, now - last)
+                last = now
+
+        # Warm the pool so process start-up is not part of the measurement
+        await simulation_pool.run_simulation(simulate_percentiles, 0.0, 0.0, 0.08, 0.1, 0.1, 1, 100, 0, work=work)
+        start = time.perf_counter()
+        simulate_percentiles(defaults.current_balance, 400.0, defaults.mean_return, defaults.return_volatility,
+                             defaults.cash_flow_volatility, defaults.horizon, defaults.paths, 1)
+        inline_time = time.perf_counter() - start
+
+        stop = asyncio.Event()
+        ticking = asyncio.create_task(ticker(stop))
+        await simulation_pool.run_simulation(
+            simulate_percentiles, defaults.current_balance, 400.0, defaults.mean_return, defaults.return_volatility,
+            defaults.cash_flow_volatility, defaults.horizon, defaults.paths, 1, work=work,
+        )
+        stop.set()
+        await ticking
+        return longest_gap, inline_time
+
+    try:
+        longest_gap, inline_time = asyncio.run(scenario())
+    finally:
+        simulation_pool.shutdown_process_pool()
+    # Inline, the loop would stall for the whole simulation
+    assert longest_gap < inline_time / 2
+
+projection_body = {
+    "current_balance": 1000.0,
+    "total_income": 500.0,
+    "total_expense": 100.0,
+    "growth_rates": [0.08],
+    "horizons": [5],
+}
+
+def test_projection_cache_skips_recomputation(monkeypatch):
+    """
+    Test that repeating a projection with unchanged inputs is served from the cache,
+    while changed inputs are computed again.
+    """
+    import app.routes.graph_routes as graph_routes
+
+    calls = []
+    original = graph_routes.compute_projection
+    def counting_compute(*args):
+        calls.append(args)
+        return original(*args)
+    monkeypatch.setattr(graph_routes, "compute_projection", counting_compute)
+
+    first = client.post(f"/projection/{balance_id}", json=projection_body)
+    second = client.post(f"/projection/{balance_id}", json=projection_body)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.headers["etag"] == second.headers["etag"]
+    assert len(calls) == 1
+
+    changed = client.post(f"/projection/{balance_id}", json={**projection_body, "total_expense": 150.0})
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert len(calls) == 2
+    assert projection_cache.stats()["hits"] == 1
+
+    metrics = client.get("/metrics").json()["projection_cache"]
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 2
+
+def test_projection_etag_not_modified():
+    """
+    Test that sending the ETag back in If-None-Match returns 304 with no body.
+    """
+    etag = client.post(f"/projection/{balance_id}", json=projection_body).headers["etag"]
+
+    response = client.post(f"/projection/{balance_id}", json=projection_body, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = client.post(f"/projection/{balance_id}", json=projection_body, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
@@ -0,0 +1 @@
+# backend/app/jobs - maintenance jobs, run with `python -m jobs.<name>` from backend/app
@@ -0,0 +1,47 @@
+# backend/app/jobs/calibrate_password_hash.py
+"""
+Pick password hash cost parameters that hit a target verify latency on this
+hardware and print them as environment settings. Run it on the production
+host class, then set the printed values; existing hashes are upgraded on the
+users' next login:
+
+    python -m jobs.calibrate_password_hash --target-ms 250
+    python -m jobs.calibrate_password_hash --scheme scrypt --target-ms 100
+"""
+
+import argparse
+import logging
+
+from core.config import settings
+from core.password_hashing import HASH_SCHEMES, PasswordHasher
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Setting name for each tuned parameter, per scheme
+PARAM_SETTINGS = {
+    "pbkdf2-sha256": {"iterations": "PASSWORD_PBKDF2_ITERATIONS"},
+    "scrypt": {"ln": "PASSWORD_SCRYPT_LN", "r": "PASSWORD_SCRYPT_R", "p": "PASSWORD_SCRYPT_P"},
+    "argon2id": {"m": "PASSWORD_ARGON2_MEMORY_KIB", "t": "PASSWORD_ARGON2_TIME_COST", "p": "PASSWORD_ARGON2_PARALLELISM"},
+}
+
+def run(scheme: str, target_ms: float, rounds: int = 3) -> dict:
+    """Calibrate one scheme and return the settings to apply"""
+    params, elapsed = PasswordHasher.calibrate(scheme, target_ms / 1000, rounds)
+    logger.info(f"{scheme} with {params} verifies in {elapsed * 1000:.0f} ms (target {target_ms:.0f} ms)")
+    recommended = {"PASSWORD_HASH_SCHEME": scheme}
+    recommended.update({PARAM_SETTINGS[scheme][key]: value for key, value in params.items()})
+    return recommended
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate password hash cost to a target verify latency")
+    parser.add_argument("--scheme", default=settings.password_hash_scheme, choices=sorted(HASH_SCHEMES), help="Scheme to calibrate")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify time per password")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed hashes per measurement (median is used)")
+    args = parser.parse_args()
+
+    for name, value in run(args.scheme, args.target_ms, args.rounds).items():
+        print(f"{name}={value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# backend/app/jobs/migrate_passwords.py
+"""
+Hash any plain text passwords left from before password hashing, in chunks
+across a process pool, committing each chunk. Safe to interrupt and rerun:
+hashed rows are skipped, and --after-id resumes past the last id logged:
+
+    python -m jobs.migrate_passwords
+    python -m jobs.migrate_passwords --chunk-size 1000 --workers 8 --after-id 125000
+"""
+
+import argparse
+import logging
+
+import crud
+from db.database import SessionLocal, engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run(chunk_size: int = 500, workers: int = None, after_id: int = 0) -> int:
+    """Migrate every plain text password after after_id and return how many were hashed"""
+    db = SessionLocal()
+    try:
+        migrated = crud.user.migrate_plain_text_passwords(db, chunk_size=chunk_size, workers=workers, start_after_id=after_id)
+    finally:
+        db.close()
+        engine.dispose()
+    logger.info(f"Migrated {migrated} plain text password(s)")
+    return migrated
+
+def main():
+    parser = argparse.ArgumentParser(description="Hash remaining plain text passwords in resumable chunks")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Users read, hashed and committed per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--after-id", type=int, default=0, help="Resume after this user id")
+    args = parser.parse_args()
+    run(args.chunk_size, args.workers, args.after_id)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# backend/app/jobs/purge_login_attempts.py
+"""
+Delete login_attempts rows past the retention window in bounded batches,
+rolling them into per-user daily counts (login_attempts_daily) first.
+Keeps the audit table to a few months of rows however long the app runs.
+Schedule it daily (cron or similar); it is safe to interrupt and rerun:
+
+    python -m jobs.purge_login_attempts                  # settings.login_attempt_retention_days
+    python -m jobs.purge_login_attempts --days 30 --no-aggregate
+"""
+
+import argparse
+import logging
+
+import crud
+from core.config import settings
+from db.database import SessionLocal, engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run(days: int, batch_size: int, aggregate: bool = True, max_batches: int = None) -> dict:
+    """Purge (and roll up) attempts older than `days` and return the purge summary"""
+    db = SessionLocal()
+    try:
+        result = crud.user.purge_login_attempts(db, days, batch_size, aggregate, max_batches)
+    finally:
+        db.close()
+        engine.dispose()
+    logger.info(f"Purged {result['deleted']} login attempt(s) in {result['batches']} batch(es)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Purge old login attempts, rolling them into daily counts")
+    parser.add_argument("--days", type=int, default=settings.login_attempt_retention_days, help="Keep attempts from the last N days")
+    parser.add_argument("--batch-size", type=int, default=settings.login_attempt_purge_batch_size, help="Rows deleted per transaction")
+    parser.add_argument("--no-aggregate", action="store_true", help="Delete without keeping daily counts")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches (spread a large backlog over runs)")
+    args = parser.parse_args()
+    run(args.days, args.batch_size, not args.no_aggregate, args.max_batches)
+
+if __name__ == "__main__":
+    main()
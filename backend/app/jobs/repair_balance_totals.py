@@ -0,0 +1,38 @@
+# backend/app/jobs/repair_balance_totals.py
+"""
+Recompute the running income/expense totals stored on balances from the
+detail tables. The write paths keep them in step; run this after manual
+data fixes or if drift is ever suspected:
+
+    python -m jobs.repair_balance_totals              # every balance
+    python -m jobs.repair_balance_totals --balance-id 42
+"""
+
+import argparse
+import asyncio
+import logging
+
+import crud
+from db.database import AsyncSessionLocal, async_engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run(balance_id: int = None) -> int:
+    """Repair one balance (or all) and return how many rows were rewritten"""
+    try:
+        async with AsyncSessionLocal() as db:
+            repaired = await crud.balance.repair_balance_totals(db, balance_id)
+    finally:
+        await async_engine.dispose()
+    logger.info(f"Repaired running totals for {repaired} balance(s)")
+    return repaired
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute balance running totals from incomes/expenses")
+    parser.add_argument("--balance-id", type=int, default=None, help="Only repair this balance")
+    args = parser.parse_args()
+    asyncio.run(run(args.balance_id))
+
+if __name__ == "__main__":
+    main()
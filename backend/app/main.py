@@ -2,9 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from middleware.validation import RequestValidationMiddleware
-from routers import balance, income, expense, suggestions, auth
+from routers import balance, income, expense, suggestions, auth, metrics
 from core.config import settings
-from db import init_db
+from db import init_db, async_engine
+from core.http_clients import upstream_clients
+from core.password_hashing import PasswordHasher
+from core.password_pool import password_pool
+from core.login_audit import login_audit
+from core.login_throttle import login_throttle
 import logging
 
 # Configure logging
@@ -14,6 +19,10 @@ logger = logging.getLogger(__name__)
 # Lifespan context manager to initialize the database at startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Refuse to start with a password hash scheme that cannot hash, or per-process lockouts under several workers
+    PasswordHasher.check_configuration()
+    login_throttle.check_configuration()
+
     try:
         logger.info("Initializing database...")
         init_db()
@@ -22,7 +31,16 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {str(e)}")
         logger.warning("Application will continue but may not function correctly without database.")
     
+    # Shared HTTP clients for the graph and LLM services
+    upstream_clients.open()
+    
     yield
+    
+    # Close pooled async and HTTP connections on shutdown
+    await upstream_clients.aclose()
+    await async_engine.dispose()
+    password_pool.shutdown()
+    login_audit.stop()
 
 app = FastAPI(
     redirect_slashes=False,
@@ -42,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Register routers
@@ -50,6 +69,7 @@ app.include_router(balance.router, prefix="/balance", tags=["Balance"])
 app.include_router(income.router, prefix="/incomes", tags=["Incomes"])
 app.include_router(expense.router, prefix="/expenses", tags=["Expenses"])
 app.include_router(suggestions.router, prefix="/suggestions", tags=["Suggestions"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 @app.get("/")
 async def read_root():
@@ -16,6 +16,9 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             if "/suggestions/" in request.url.path and request.method == "POST":
                 # Allow this request without Content-Type validation
                 pass
+            # Special case: Import endpoints stream CSV/NDJSON uploads (format validated by the route)
+            elif request.url.path.endswith("/import") and request.method == "POST":
+                pass
             # Only enforce Content-Type for non-empty bodies
             elif not content_type.startswith("application/json") and request.headers.get("Content-Length", "0") != "0":
                 logger.warning(f"Invalid Content-Type: {content_type} for {request.url.path}")
@@ -10,6 +10,7 @@ from schemas.user import UserRegistration, UserResponse, UserLogin
 from core.password_config import PasswordConfig
 from core.auth_jwt import create_access_token, Token, ACCESS_TOKEN_EXPIRE_MINUTES
 from core.auth_dependencies import get_current_user
+from core.user_cache import AuthenticatedUser
 from db.models import User
 
 router = APIRouter()
@@ -34,7 +35,7 @@ async def register_user(
     """
     try:
         # Create the user
-        user = crud.user.create_user(db, user_data)
+        user = await crud.user.create_user(db, user_data)
         
         # Log the successful registration
         client_ip = get_client_ip(request)
@@ -62,7 +63,7 @@ async def login_user(
         client_ip = get_client_ip(request)
         
         # Authenticate user
-        user = crud.user.authenticate_user(
+        user = await crud.user.authenticate_user(
             db, 
             form_data.username,  # OAuth2PasswordRequestForm uses 'username' field
             form_data.password,
@@ -101,7 +102,7 @@ async def login_user_json(
         client_ip = get_client_ip(request)
         
         # Authenticate user
-        user = crud.user.authenticate_user(
+        user = await crud.user.authenticate_user(
             db, 
             login_data.username_or_email, 
             login_data.password,
@@ -134,7 +135,7 @@ async def login_user_json(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Get current user information from JWT token
@@ -1,20 +1,27 @@
 # backend/app/routers/balance.py - Add new route for getting user's primary balance
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, List
+from pydantic import Field
 
 import crud
-from db.database import get_db
-from schemas.balance import Balance, BalanceCreate, BalanceUpdate
+from db.database import get_async_db, AsyncSessionLocal
+from schemas.balance import Balance, BalanceCreate, BalanceUpdate, BalanceSummary
 from dependencies import validate_balance_id, validate_pagination
 from core.auth_dependencies import get_current_user
+from core.user_cache import AuthenticatedUser
+from core.config import settings
+from core.ledger_export import encode_ledger, EXPORT_MEDIA_TYPES
+from core.http_clients import upstream_clients
+from core.etag import input_etag, etag_matches
 from db.models import User, Balance as BalanceModel
 import httpx
 
 router = APIRouter()
 
-GRAPH_MICROSERVICE_URL = "http://graph_microservice:8002"
+GRAPH_MICROSERVICE_URL = settings.graph_service_url
 
 @router.get("/public/health")
 async def health_check():
@@ -23,20 +30,20 @@ async def health_check():
 
 @router.get("/", response_model=List[Balance])
 async def get_user_balances(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get all balances for the current user"""
-    balances = db.query(BalanceModel).filter(BalanceModel.user_id == current_user.id).all()
+    balances = await crud.balance.get_user_balances(db, current_user.id)
     return balances
 
 @router.get("/current", response_model=Balance)
 async def get_current_user_balance(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get the user's primary/first balance"""
-    balance = db.query(BalanceModel).filter(BalanceModel.user_id == current_user.id).first()
+    balance = await crud.balance.get_user_primary_balance(db, current_user.id)
     if not balance:
         # This should not happen with auto-creation, but handle gracefully
         raise HTTPException(status_code=404, detail="No balance found. Please contact support.")
@@ -45,36 +52,30 @@ async def get_current_user_balance(
 @router.post("/", response_model=Balance)
 async def create_balance_endpoint(
     balance: BalanceCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a new balance for the authenticated user (rarely used now that auto-creation exists)"""
     # Check if user already has a balance
-    existing_balance = db.query(BalanceModel).filter(BalanceModel.user_id == current_user.id).first()
+    existing_balance = await crud.balance.get_user_primary_balance(db, current_user.id)
     if existing_balance:
         raise HTTPException(status_code=400, detail="User already has a balance. Use PATCH to update it.")
     
     # Create balance with user association
-    db_balance = BalanceModel(amount=balance.amount, user_id=current_user.id)
-    db.add(db_balance)
-    db.commit()
-    db.refresh(db_balance)
+    db_balance = await crud.balance.create_balance(db, balance, current_user.id)
     return db_balance
 
 @router.get("/{balance_id}", response_model=Balance)
 async def get_balance_endpoint(
     balance_id: int = Depends(validate_balance_id), 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get a balance by ID (user must be authenticated and own the balance)"""
-    db_balance = crud.balance.get_balance(db, balance_id)
+    # Fetch and ownership check in one query
+    db_balance = await crud.balance.get_balance_for_user(db, balance_id, current_user.id)
     if db_balance is None:
-        raise HTTPException(status_code=404, detail="Balance not found")
-    
-    # Ensure user owns this balance
-    if db_balance.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied to this balance")
+        await crud.balance.raise_balance_access_error(db, balance_id)
     
     return db_balance
 
@@ -82,119 +83,142 @@ async def get_balance_endpoint(
 async def update_balance_endpoint(
     balance_id: int = Depends(validate_balance_id), 
     balance: BalanceUpdate = None, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Update a balance (user must be authenticated and own the balance)"""
-    # Get the balance and ensure user owns it
-    db_balance = crud.balance.get_balance(db, balance_id)
+    # Update only if the user owns the balance (single UPDATE ... WHERE id AND user_id)
+    db_balance = await crud.balance.update_balance(db, balance_id, balance, current_user.id)
     if db_balance is None:
-        raise HTTPException(status_code=404, detail="Balance not found")
-    
-    if db_balance.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied to this balance")
+        await crud.balance.raise_balance_access_error(db, balance_id)
     
-    # Update the balance
-    db_balance = crud.balance.update_balance(db, balance_id, balance)
     return db_balance
 
 @router.patch("/current", response_model=Balance)
 async def update_current_user_balance(
     balance: BalanceUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Update the user's primary balance - convenient endpoint for dashboard"""
     # Get user's primary balance
-    db_balance = db.query(BalanceModel).filter(BalanceModel.user_id == current_user.id).first()
+    db_balance = await crud.balance.get_user_primary_balance(db, current_user.id)
     if not db_balance:
         raise HTTPException(status_code=404, detail="No balance found. Please contact support.")
     
     # Update the balance
     if balance.amount is not None:
         db_balance.amount = balance.amount
-        db.commit()
-        db.refresh(db_balance)
+        await db.commit()
+        await db.refresh(db_balance)
     
     return db_balance
 
 @router.delete("/{balance_id}", status_code=204)
 async def delete_balance_endpoint(
     balance_id: int = Depends(validate_balance_id), 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a balance (user must be authenticated and own the balance)"""
-    # Get the balance and ensure user owns it
-    db_balance = crud.balance.get_balance(db, balance_id)
-    if db_balance is None:
-        raise HTTPException(status_code=404, detail="Balance not found")
-    
-    if db_balance.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied to this balance")
-    
-    success = crud.balance.delete_balance(db, balance_id)
+    # Delete only if the user owns the balance
+    success = await crud.balance.delete_balance(db, balance_id, current_user.id)
     if not success:
-        raise HTTPException(status_code=404, detail="Balance not found")
+        await crud.balance.raise_balance_access_error(db, balance_id)
     return {"status": "success"}
 
+@router.get("/{balance_id}/summary", response_model=BalanceSummary)
+async def get_balance_summary_endpoint(
+    balance_id: int = Depends(validate_balance_id),
+    recent: int = Query(10, gt=0, le=100, description="Number of recent incomes and expenses to include"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Balance, running totals, recent incomes/expenses and cached suggestions in one call
+    (user must be authenticated and own the balance). The income/expense pages carry
+    next_cursor so the full lists can be continued from /incomes/ and /expenses/.
+    """
+    summary = await crud.balance.get_balance_summary(db, balance_id, current_user.id, recent)
+    if summary is None:
+        await crud.balance.raise_balance_access_error(db, balance_id)
+    return summary
+
+@router.get("/{balance_id}/export")
+async def export_balance_ledger(
+    balance_id: int = Depends(validate_balance_id),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Export format"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Stream every income and expense of a balance as CSV or NDJSON
+    (user must be authenticated and own the balance)
+    """
+    await crud.balance.get_owned_balance_or_raise(db, balance_id, current_user.id)
+
+    async def ledger_body():
+        # The body is streamed after the request's session is closed, so it reads with its own
+        async with AsyncSessionLocal() as session:
+            batches = crud.transactions.stream_ledger(session, balance_id, settings.export_batch_size)
+            async for chunk in encode_ledger(batches, format):
+                yield chunk
+
+    return StreamingResponse(
+        ledger_body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="balance-{balance_id}-ledger.{format}"'}
+    )
+
 @router.get("/{balance_id}/graph")
 async def get_balance_graph(
     request: Request,
     balance_id: int = Depends(validate_balance_id), 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    growth_rates: List[Annotated[float, Field(gt=-1, le=1)]] = Query([0.08], max_length=10, description="Yearly growth rates for the compounded projection"),
+    horizons: List[Annotated[int, Field(ge=0, le=100)]] = Query([15], max_length=10, description="Projection horizons in years from now"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Fetch balance graph data and projected revenue from the graph_microservice.
     (user must be authenticated and own the balance)
+    projected_revenue is the series for the first growth rate; every rate is in
+    projected_revenue_by_rate and per-horizon values are in horizons.
+    The ETag is derived from the inputs, so an unchanged balance answers 304
+    without calling the graph service.
     """
-    # First verify that the balance exists and user owns it
-    db_balance = crud.balance.get_balance(db, balance_id)
-    if db_balance is None:
-        raise HTTPException(status_code=404, detail="Balance not found")
-    
-    if db_balance.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied to this balance")
-    
-    # Extract the Authorization header to forward to graph microservice
-    auth_header = request.headers.get("authorization")
-    if not auth_header:
-        raise HTTPException(status_code=401, detail="Authorization header required")
+    # Verify ownership and read the running totals in one query
+    db_balance = await crud.balance.get_owned_balance_or_raise(db, balance_id, current_user.id)
     
-    # Prepare headers to forward to graph microservice
-    headers = {"Authorization": auth_header}
+    # Push everything the projection needs, so the graph service never calls back
+    projection_request = {
+        "current_balance": db_balance.amount,
+        "total_income": db_balance.total_income,
+        "total_expense": db_balance.total_expense,
+        "growth_rates": growth_rates,
+        "horizons": horizons,
+    }
+    etag = input_etag("balance-graph", **projection_request)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # Forward JWT token to graph microservice
-            balance_response = await client.get(
-                f"{GRAPH_MICROSERVICE_URL}/balance-graph/{balance_id}",
-                headers=headers
-            )
-            if balance_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Graph data not found for this balance ID")
-            balance_response.raise_for_status()
-            balance_graph = balance_response.json()
-
-            revenue_response = await client.get(
-                f"{GRAPH_MICROSERVICE_URL}/projected-revenue/{balance_id}",
-                headers=headers
-            )
-            if revenue_response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Projected revenue not found for this balance ID")
-            revenue_response.raise_for_status()
-            projected_revenue = revenue_response.json()
-
-            return {
-                "balance_graph": balance_graph,
-                "projected_revenue": projected_revenue
-            }
-
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Balance graph data not found")
-            raise HTTPException(status_code=e.response.status_code, detail=f"Graph service error: {str(e)}")
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    try:
+        # One call computes the linear graph and every compounded series
+        response = await upstream_clients.get("graph").post(f"/projection/{balance_id}", json=projection_request)
+        response.raise_for_status()
+        projection = response.json()
+
+        projected_revenue_by_rate = projection["projected_revenue"]
+        return JSONResponse({
+            "balance_graph": projection["balance_graph"],
+            "projected_revenue": next(iter(projected_revenue_by_rate.values())),
+            "projected_revenue_by_rate": projected_revenue_by_rate,
+            "horizons": projection["horizons"],
+        }, headers=cache_headers)
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"Graph service error: {str(e)}")
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -1,12 +1,16 @@
 # backend/app/routers/expense.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 
 import crud
-from db.database import get_db
-from schemas.balance import Expense, ExpenseCreate, ExpenseUpdate
+from db.database import get_async_db
+from schemas.balance import Expense, ExpensePage, ExpenseCreate, ExpenseUpdate, ExpenseBulkCreate, BulkCreateResponse, ImportResponse
 from core.auth_dependencies import get_current_user
+from core.user_cache import AuthenticatedUser
+from core.config import settings
+from core.import_parsers import resolve_import_format, parse_records
+from dependencies import validate_pagination
 from db.models import User
 
 router = APIRouter()
@@ -14,20 +18,50 @@ router = APIRouter()
 @router.post("/", response_model=Expense)
 async def create_expense_endpoint(
     expense: ExpenseCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Create a new expense (user must be authenticated)"""
-    return crud.expense.create_expense(db, expense)
+    return await crud.expense.create_expense(db, expense)
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def create_expenses_bulk_endpoint(
+    payload: ExpenseBulkCreate,
+    partial: bool = Query(False, description="Create the valid rows even if some rows fail"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
+):
+    """Create many expenses in one transaction (user must be authenticated and own the balances)"""
+    result = await crud.expense.create_expenses_bulk(db, payload.items, current_user.id, partial)
+    if result["failed"] and not partial:
+        raise HTTPException(status_code=422, detail={"message": "No expenses were created", "errors": result["errors"]})
+    return result
+
+@router.post("/import", response_model=ImportResponse)
+async def import_expenses_endpoint(
+    request: Request,
+    balance_id: int = Query(..., gt=0, description="Balance the imported expenses belong to"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Upload format, defaults to the Content-Type"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
+):
+    """
+    Stream a CSV or NDJSON upload into expenses for a balance (user must own the balance).
+    Rows are parsed incrementally and committed every IMPORT_CHUNK_SIZE rows.
+    """
+    await crud.balance.get_owned_balance_or_raise(db, balance_id, current_user.id)
+    import_format = resolve_import_format(format, request.headers.get("content-type"))
+    records = parse_records(request.stream(), import_format)
+    return await crud.expense.import_expenses(db, records, balance_id, settings.import_chunk_size)
 
 @router.get("/{expense_id}", response_model=Expense)
 async def get_expense_endpoint(
     expense_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Get an expense by ID (user must be authenticated)"""
-    db_expense = crud.expense.get_expense(db, expense_id)
+    db_expense = await crud.expense.get_expense(db, expense_id)
     if db_expense is None:
         raise HTTPException(status_code=404, detail="Expense not found")
     
@@ -36,37 +70,37 @@ async def get_expense_endpoint(
     
     return db_expense
 
-@router.get("/", response_model=List[Expense])
+@router.get("/", response_model=ExpensePage)
 async def get_all_expenses_endpoint(
     balance_id: Optional[int] = Query(None, description="Filter expenses by balance ID"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    pagination: Tuple[Optional[str], int] = Depends(validate_pagination),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
-    """Get all expenses (user must be authenticated)"""
+    """Get a page of expenses, newest first; pass next_cursor back as ?cursor= for the next page (user must be authenticated)"""
+    cursor, limit = pagination
     if balance_id:
-        balance = crud.balance.get_balance(db, balance_id)
+        balance = await crud.balance.get_balance(db, balance_id)
         if balance and balance.user_id and balance.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        return crud.expense.get_expenses_by_balance(db, balance_id)
+        return await crud.expense.get_expenses_by_balance(db, balance_id, cursor, limit)
     
-    return crud.expense.get_all_expenses(db, skip, limit)
+    return await crud.expense.get_all_expenses(db, cursor, limit)
 
 @router.patch("/{expense_id}", response_model=Expense)
 async def update_expense_endpoint(
     expense_id: int, 
     expense: ExpenseUpdate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Update an expense (user must be authenticated)"""
-    existing_expense = crud.expense.get_expense(db, expense_id)
+    existing_expense = await crud.expense.get_expense(db, expense_id)
     if existing_expense and existing_expense.balance.user_id and existing_expense.balance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    db_expense = crud.expense.update_expense(db, expense_id, expense)
+    db_expense = await crud.expense.update_expense(db, expense_id, expense)
     if db_expense is None:
         raise HTTPException(status_code=404, detail="Expense not found")
     return db_expense
@@ -74,15 +108,15 @@ async def update_expense_endpoint(
 @router.delete("/{expense_id}", status_code=204)
 async def delete_expense_endpoint(
     expense_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Delete an expense (user must be authenticated)"""
-    existing_expense = crud.expense.get_expense(db, expense_id)
+    existing_expense = await crud.expense.get_expense(db, expense_id)
     if existing_expense and existing_expense.balance.user_id and existing_expense.balance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    success = crud.expense.delete_expense(db, expense_id)
+    success = await crud.expense.delete_expense(db, expense_id)
     if not success:
         raise HTTPException(status_code=404, detail="Expense not found")
     return {"status": "success"}
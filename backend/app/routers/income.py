@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 
 import crud
-from db.database import get_db
-from schemas.balance import Income, IncomeCreate, IncomeUpdate
+from db.database import get_async_db
+from schemas.balance import Income, IncomePage, IncomeCreate, IncomeUpdate, IncomeBulkCreate, BulkCreateResponse, ImportResponse
 from core.auth_dependencies import get_current_user
+from core.user_cache import AuthenticatedUser
+from core.config import settings
+from core.import_parsers import resolve_import_format, parse_records
+from dependencies import validate_pagination
 from db.models import User
 
 router = APIRouter()
@@ -13,20 +17,50 @@ router = APIRouter()
 @router.post("/", response_model=Income)
 async def create_income_endpoint(
     income: IncomeCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Create a new income (user must be authenticated)"""
-    return crud.income.create_income(db, income)
+    return await crud.income.create_income(db, income)
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def create_incomes_bulk_endpoint(
+    payload: IncomeBulkCreate,
+    partial: bool = Query(False, description="Create the valid rows even if some rows fail"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
+):
+    """Create many incomes in one transaction (user must be authenticated and own the balances)"""
+    result = await crud.income.create_incomes_bulk(db, payload.items, current_user.id, partial)
+    if result["failed"] and not partial:
+        raise HTTPException(status_code=422, detail={"message": "No incomes were created", "errors": result["errors"]})
+    return result
+
+@router.post("/import", response_model=ImportResponse)
+async def import_incomes_endpoint(
+    request: Request,
+    balance_id: int = Query(..., gt=0, description="Balance the imported incomes belong to"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Upload format, defaults to the Content-Type"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
+):
+    """
+    Stream a CSV or NDJSON upload into incomes for a balance (user must own the balance).
+    Rows are parsed incrementally and committed every IMPORT_CHUNK_SIZE rows.
+    """
+    await crud.balance.get_owned_balance_or_raise(db, balance_id, current_user.id)
+    import_format = resolve_import_format(format, request.headers.get("content-type"))
+    records = parse_records(request.stream(), import_format)
+    return await crud.income.import_incomes(db, records, balance_id, settings.import_chunk_size)
 
 @router.get("/{income_id}", response_model=Income)
 async def get_income_endpoint(
     income_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Get an income by ID (user must be authenticated)"""
-    db_income = crud.income.get_income(db, income_id)
+    db_income = await crud.income.get_income(db, income_id)
     if db_income is None:
         raise HTTPException(status_code=404, detail="Income not found")
     
@@ -35,37 +69,37 @@ async def get_income_endpoint(
     
     return db_income
 
-@router.get("/", response_model=List[Income])
+@router.get("/", response_model=IncomePage)
 async def get_all_incomes_endpoint(
     balance_id: Optional[int] = Query(None, description="Filter incomes by balance ID"),
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    pagination: Tuple[Optional[str], int] = Depends(validate_pagination),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
-    """Get all incomes (user must be authenticated)"""
+    """Get a page of incomes, newest first; pass next_cursor back as ?cursor= for the next page (user must be authenticated)"""
+    cursor, limit = pagination
     if balance_id:
-        balance = crud.balance.get_balance(db, balance_id)
+        balance = await crud.balance.get_balance(db, balance_id)
         if balance and balance.user_id and balance.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        return crud.income.get_incomes_by_balance(db, balance_id)
+        return await crud.income.get_incomes_by_balance(db, balance_id, cursor, limit)
     
-    return crud.income.get_all_incomes(db, skip, limit)
+    return await crud.income.get_all_incomes(db, cursor, limit)
 
 @router.patch("/{income_id}", response_model=Income)
 async def update_income_endpoint(
     income_id: int, 
     income: IncomeUpdate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Update an income (user must be authenticated)"""
-    existing_income = crud.income.get_income(db, income_id)
+    existing_income = await crud.income.get_income(db, income_id)
     if existing_income and existing_income.balance.user_id and existing_income.balance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    db_income = crud.income.update_income(db, income_id, income)
+    db_income = await crud.income.update_income(db, income_id, income)
     if db_income is None:
         raise HTTPException(status_code=404, detail="Income not found")
     return db_income
@@ -73,15 +107,15 @@ async def update_income_endpoint(
 @router.delete("/{income_id}", status_code=204)
 async def delete_income_endpoint(
     income_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """Delete an income (user must be authenticated)"""
-    existing_income = crud.income.get_income(db, income_id)
+    existing_income = await crud.income.get_income(db, income_id)
     if existing_income and existing_income.balance.user_id and existing_income.balance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    success = crud.income.delete_income(db, income_id)
+    success = await crud.income.delete_income(db, income_id)
     if not success:
         raise HTTPException(status_code=404, detail="Income not found")
     return {"status": "success"}
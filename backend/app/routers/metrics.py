@@ -0,0 +1,26 @@
+# backend/app/routers/metrics.py
+from fastapi import APIRouter
+
+from db.database import sync_pool_metrics, async_pool_metrics
+from core.user_cache import user_cache
+from core.auth_jwt import verified_token_cache
+from core.http_clients import upstream_clients
+from core.password_pool import password_pool
+from core.login_audit import login_audit
+
+router = APIRouter()
+
+@router.get("/")
+async def get_metrics():
+    """Runtime metrics used to size pools and caches (no authentication required)"""
+    return {
+        "db_pool": {
+            "sync": sync_pool_metrics.snapshot(),
+            "async": async_pool_metrics.snapshot(),
+        },
+        "auth_user_cache": user_cache.stats(),
+        "jwt_verify_cache": verified_token_cache.stats(),
+        "upstreams": upstream_clients.stats(),
+        "password_hashing": password_pool.stats(),
+        "login_audit": login_audit.stats(),
+    }
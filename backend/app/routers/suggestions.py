@@ -1,19 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
-import requests
+from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
 import logging
 
 import crud
-from db.database import get_db
+from db.database import get_async_db
 from db.models import Balance, Income, Expense, SuggestionCache, User
 from core.auth_dependencies import get_current_user
+from core.user_cache import AuthenticatedUser
+from core.http_clients import upstream_clients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# URL for the LLM microservice
-LLM_MICROSERVICE_URL = "http://llm_microservice:8001/suggestions/"
+# Path on the LLM microservice (base URL and pooled client come from core.http_clients)
+LLM_SUGGESTIONS_PATH = "/suggestions/"
 
 router = APIRouter()
 
@@ -21,13 +23,13 @@ router = APIRouter()
 @router.post("/{balance_id}")
 async def get_suggestions(
     balance_id: int = Path(..., description="The ID of the balance"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """
     Generate financial suggestions for a balance (user must be authenticated)
     """
-    db_balance = crud.balance.get_balance(db, balance_id)
+    db_balance = await crud.balance.get_balance(db, balance_id)
     if not db_balance:
         raise HTTPException(status_code=404, detail="Balance not found")
     
@@ -36,7 +38,7 @@ async def get_suggestions(
     
     try:
         # Fetch financial data for the given balance ID
-        financial_data = fetch_financial_data(db, balance_id)
+        financial_data = await fetch_financial_data(db, balance_id)
         logger.info(f"Financial data fetched for balance_id {balance_id} by user {current_user.username}: {financial_data}")
 
         # Generate suggestions
@@ -44,7 +46,7 @@ async def get_suggestions(
         logger.info(f"Suggestions generated for balance_id {balance_id} by user {current_user.username}")
 
         # Cache the suggestions
-        crud.suggestion.create_or_update_suggestion_cache(db, balance_id, llm_response_data)
+        await crud.suggestion.create_or_update_suggestion_cache(db, balance_id, llm_response_data)
 
         # Return the structured response
         return llm_response_data
@@ -58,22 +60,22 @@ async def get_suggestions(
 @router.get("/{balance_id}")
 async def get_cached_suggestions(
     balance_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """
     Get cached financial suggestions for a balance (user must be authenticated)
     """
     try:
         # Check if balance exists and user has access
-        db_balance = crud.balance.get_balance(db, balance_id)
+        db_balance = await crud.balance.get_balance(db, balance_id)
         if not db_balance:
             raise HTTPException(status_code=404, detail="Balance not found")
         
         if db_balance.user_id and db_balance.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied to this balance")
         
-        db_suggestions = crud.suggestion.get_suggestion_cache(db, balance_id)
+        db_suggestions = await crud.suggestion.get_suggestion_cache(db, balance_id)
         if not db_suggestions:
             raise HTTPException(status_code=404, detail="Suggestions not found for this balance ID")
         
@@ -85,31 +87,21 @@ async def get_cached_suggestions(
         raise e
 
 # Helper function to fetch financial data from the database
-def fetch_financial_data(db: Session, balance_id: int) -> dict:
+async def fetch_financial_data(db: AsyncSession, balance_id: int) -> dict:
     """
     Fetch financial data for a specific balance ID
     """
-    # Get the balance
-    balance = db.query(Balance).filter(Balance.id == balance_id).first()
-    if not balance:
+    # Balance amount and the running ledger totals stored on the balance row (one primary-key lookup)
+    totals = await crud.balance.get_balance_totals(db, balance_id)
+    if totals is None:
         raise HTTPException(status_code=404, detail="Balance not found")
 
-    # Get all incomes for the balance
-    incomes = db.query(Income).filter(Income.balance_id == balance_id).all()
-    
-    # Get all expenses for the balance
-    expenses = db.query(Expense).filter(Expense.balance_id == balance_id).all()
-
-    # Calculate totals
-    total_income = sum(income.amount for income in incomes)
-    total_expense = sum(expense.amount for expense in expenses)
-
     # Construct and return the financial data dictionary
     financial_data = {
         "balance_id": balance_id,
-        "current_balance": balance.amount,
-        "total_income": total_income,
-        "total_expense": total_expense,
+        "current_balance": totals["current_balance"],
+        "total_income": totals["total_income"],
+        "total_expense": totals["total_expense"],
     }
 
     logger.info(f"Fetched financial data for balance_id {balance_id}: {financial_data}")
@@ -130,8 +122,8 @@ async def generate_suggestions(financial_data: dict):
     logger.info(f"Sending financial data to LLM microservice: {financial_data}")
 
     try:
-        # Make a POST request to the LLM microservice
-        response = requests.post(LLM_MICROSERVICE_URL, json=financial_data)
+        # Make a POST request to the LLM microservice over the shared keep-alive client
+        response = await upstream_clients.get("llm").post(LLM_SUGGESTIONS_PATH, json=financial_data)
         response.raise_for_status()
 
         # Parse the JSON response
@@ -140,7 +132,7 @@ async def generate_suggestions(financial_data: dict):
 
         return llm_response
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"LLM microservice error: {str(e)}")
 
@@ -148,22 +140,22 @@ async def generate_suggestions(financial_data: dict):
 @router.delete("/{balance_id}", status_code=204)
 async def delete_cached_suggestions(
     balance_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # JWT Protection
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)  # JWT Protection
 ):
     """
     Delete cached suggestions for a balance (user must be authenticated)
     """
     try:
         # Check if balance exists and user has access
-        db_balance = crud.balance.get_balance(db, balance_id)
+        db_balance = await crud.balance.get_balance(db, balance_id)
         if not db_balance:
             raise HTTPException(status_code=404, detail="Balance not found")
         
         if db_balance.user_id and db_balance.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied to this balance")
         
-        success = crud.suggestion.delete_suggestion_cache(db, balance_id)
+        success = await crud.suggestion.delete_suggestion_cache(db, balance_id)
         if not success:
             raise HTTPException(status_code=404, detail="Suggestions not found for this balance ID")
         
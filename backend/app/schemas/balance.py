@@ -1,7 +1,7 @@
 # backend/app/schemas/balance.py - Update validation to allow $0 balances
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 import re
 
@@ -129,6 +129,60 @@ class Expense(ExpenseBase):
     class Config:
         from_attributes = True
 
+# Keyset Pagination Schemas
+class IncomePage(BaseModel):
+    items: List[Income]
+    next_cursor: Optional[str] = None
+
+class ExpensePage(BaseModel):
+    items: List[Expense]
+    next_cursor: Optional[str] = None
+
+# Dashboard Summary Schemas
+class BalanceTotals(BaseModel):
+    total_income: float
+    income_count: int
+    total_expense: float
+    expense_count: int
+
+class BalanceSummary(BaseModel):
+    balance: Balance
+    totals: BalanceTotals
+    incomes: IncomePage
+    expenses: ExpensePage
+    suggestions: Optional[Any] = None
+
+# Bulk Create Schemas
+class IncomeBulkCreate(BaseModel):
+    items: List[Dict[str, Any]] = Field(
+        min_length=1,
+        max_length=5000,
+        description="Incomes to create, each validated against IncomeCreate"
+    )
+
+class ExpenseBulkCreate(BaseModel):
+    items: List[Dict[str, Any]] = Field(
+        min_length=1,
+        max_length=5000,
+        description="Expenses to create, each validated against ExpenseCreate"
+    )
+
+class BulkRowError(BaseModel):
+    index: int
+    detail: Any
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    errors: List[BulkRowError] = []
+
+class ImportResponse(BaseModel):
+    created: int
+    failed: int
+    chunks_committed: int
+    errors: List[BulkRowError] = []
+    errors_truncated: bool = False
+
 # Suggestion Cache Schema
 class SuggestionCacheCreate(BaseModel):
     balance_id: int
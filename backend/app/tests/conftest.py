@@ -0,0 +1,99 @@
+from pathlib import Path
+import os
+import sys
+import tempfile
+import uuid
+import pytest
+
+# Adjust the import path:
+# Current file is at: backend/app/tests/conftest.py
+# We go two levels up to get: backend/app
+current_file = Path(__file__).resolve()
+app_dir = current_file.parent.parent
+sys.path.insert(0, str(app_dir))
+
+# Run against a throwaway sqlite database unless a real one is configured
+TEST_DB_FILE = Path(tempfile.gettempdir()) / "budget_app_test.db"
+USE_SQLITE_STAND_IN = "DATABASE_URL" not in os.environ
+if USE_SQLITE_STAND_IN:
+    TEST_DB_FILE.unlink(missing_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_FILE}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_FILE}"
+
+from sqlalchemy import event
+from db import Base, engine, async_engine
+from db.models import User
+from db.database import SessionLocal
+from core.auth_jwt import create_access_token
+
+@pytest.fixture(scope="session", autouse=True)
+def create_tables():
+    """Create all tables once per test session"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    # Write queued login attempts before the database goes away
+    from core.login_audit import login_audit
+    login_audit.stop()
+    if USE_SQLITE_STAND_IN:
+        engine.dispose()
+        TEST_DB_FILE.unlink(missing_ok=True)
+
+@pytest.fixture
+def auth_user():
+    """
+    Create a user with a $0 balance and return (user, balance_id, auth headers).
+    The password is not hashed - tests authenticate with a JWT directly.
+    """
+    from db.models import Balance
+
+    username = f"user{uuid.uuid4().hex[:12]}"
+    db = SessionLocal()
+    try:
+        user = User(username=username, email=f"{username}@example.com", password="unused")
+        db.add(user)
+        db.flush()
+        balance = Balance(amount=0.0, user_id=user.id)
+        db.add(balance)
+        db.commit()
+        db.refresh(user)
+        db.refresh(balance)
+        token = create_access_token(data={"sub": user.username})
+        yield user, balance.id, {"Authorization": f"Bearer {token}"}
+    finally:
+        db.close()
+
+@pytest.fixture
+def foreign_balance():
+    """
+    Create a balance owned by another user and return its id; both are removed afterwards.
+    (A balance without an owner is shared, so it would not be rejected.)
+    """
+    from db.models import Balance
+
+    username = f"other{uuid.uuid4().hex[:12]}"
+    db = SessionLocal()
+    try:
+        owner = User(username=username, email=f"{username}@example.com", password="unused")
+        db.add(owner)
+        db.flush()
+        balance = Balance(amount=0.0, user_id=owner.id)
+        db.add(balance)
+        db.commit()
+        yield balance.id
+        db.delete(balance)
+        db.delete(owner)
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture
+def query_log():
+    """Record the SQL statements the request handlers send through the async engine"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
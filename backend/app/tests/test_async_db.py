@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+import crud
+from db.database import AsyncSessionLocal
+from schemas.balance import IncomeCreate, ExpenseCreate
+
+client = TestClient(app)
+
+class TestAsyncCrud:
+    """Test cases for the AsyncSession based crud modules"""
+
+    def test_income_and_expense_roundtrip(self, auth_user):
+        """Test creating and listing incomes/expenses through the async crud layer"""
+        _, balance_id, _ = auth_user
+
+        async def scenario():
+            async with AsyncSessionLocal() as db:
+                await crud.income.create_income(db, IncomeCreate(balance_id=balance_id, source="Salary", amount=5000))
+                await crud.expense.create_expense(db, ExpenseCreate(balance_id=balance_id, category="Rent", amount=1500))
+                incomes = await crud.income.get_incomes_by_balance(db, balance_id)
+                expenses = await crud.expense.get_expenses_by_balance(db, balance_id)
+                return incomes["items"], expenses["items"]
+
+        incomes, expenses = asyncio.run(scenario())
+        assert [income.amount for income in incomes] == [5000.0]
+        assert [expense.amount for expense in expenses] == [1500.0]
+
+    def test_get_income_loads_balance(self, auth_user):
+        """Test that get_income eagerly loads the balance used for ownership checks"""
+        user, balance_id, _ = auth_user
+
+        async def scenario():
+            async with AsyncSessionLocal() as db:
+                income = await crud.income.create_income(db, IncomeCreate(balance_id=balance_id, source="Bonus", amount=100))
+                fetched = await crud.income.get_income(db, income.id)
+                return fetched.balance.user_id
+
+        assert asyncio.run(scenario()) == user.id
+
+class TestAsyncRoutes:
+    """Test cases for routers running on the async session"""
+
+    def test_current_balance(self, auth_user):
+        """Test that the authenticated user's balance is returned"""
+        _, balance_id, headers = auth_user
+        response = client.get("/balance/current", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"id": balance_id, "amount": 0.0}
+
+    def test_create_list_delete_income(self, auth_user):
+        """Test the income endpoints end to end"""
+        _, balance_id, headers = auth_user
+        response = client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 500}, headers=headers)
+        assert response.status_code == 200
+        income_id = response.json()["id"]
+
+        response = client.get(f"/incomes/?balance_id={balance_id}", headers=headers)
+        assert response.status_code == 200
+        assert [income["id"] for income in response.json()["items"]] == [income_id]
+
+        response = client.delete(f"/incomes/{income_id}", headers=headers)
+        assert response.status_code == 204
+
+    def test_delete_balance_cascades(self, auth_user):
+        """Test that deleting a balance removes its transactions"""
+        _, balance_id, headers = auth_user
+        client.post("/expenses/", json={"balance_id": balance_id, "category": "Food", "amount": 20}, headers=headers)
+
+        response = client.delete(f"/balance/{balance_id}", headers=headers)
+        assert response.status_code == 204
+
+        response = client.get(f"/balance/{balance_id}", headers=headers)
+        assert response.status_code == 404
+
+    def test_missing_token_rejected(self):
+        """Test that the async auth dependency still rejects anonymous requests"""
+        response = client.get("/balance/current")
+        assert response.status_code == 401
@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+
+from core.auth_jwt import create_access_token, verify_token, verified_token_cache, VerifiedTokenCache
+
+class TestVerifiedTokenCache:
+    """Test cases for the decoded-JWT verification cache"""
+
+    def setup_method(self):
+        verified_token_cache.clear()
+
+    def test_second_verification_is_cached(self):
+        """Test that a verified token is served from the cache"""
+        token = create_access_token(data={"sub": "alice"})
+        assert verify_token(token) == "alice"
+        assert verify_token(token) == "alice"
+
+        stats = verified_token_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_entry_expires_with_token(self):
+        """Test that cache entries never outlive the token's exp"""
+        cache = VerifiedTokenCache(max_size=10)
+        cache.set("token", "alice", time.time() - 1)
+        assert cache.stats()["size"] == 1
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0  # Evicted on lookup
+
+    def test_invalid_token_not_cached(self):
+        """Test that failed verifications are rejected and not memoized"""
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token("not-a-jwt")
+        assert exc_info.value.status_code == 401
+        assert verified_token_cache.stats()["size"] == 0
+
+    def test_expired_token_rejected(self):
+        """Test that expired tokens are still rejected"""
+        token = create_access_token(data={"sub": "alice"}, expires_delta=timedelta(seconds=-1))
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(token)
+        assert exc_info.value.detail == "Token has expired"
+
+    def test_second_verification_skips_decode(self, monkeypatch):
+        """Test that a cached token is not decoded (HMAC-verified) again"""
+        import core.auth_jwt as auth_jwt
+        calls = []
+        real_decode = auth_jwt.jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            calls.append(args[0])
+            return real_decode(*args, **kwargs)
+
+        monkeypatch.setattr(auth_jwt.jwt, "decode", counting_decode)
+        token = create_access_token(data={"sub": "alice"})
+        assert verify_token(token) == "alice"
+        assert verify_token(token) == "alice"
+        assert calls == [token]
@@ -0,0 +1,111 @@
+import json
+
+import httpx
+import respx
+from fastapi.testclient import TestClient
+
+from main import app
+from routers.balance import GRAPH_MICROSERVICE_URL
+
+client = TestClient(app)
+
+PROJECTION = {
+    "balance_id": 0,
+    "balance_graph": [{"year": 2030, "balance": 1.0}],
+    "projected_revenue": {
+        "0.08": [{"year": 2030, "projected_balance": 2.0}],
+        "0.05": [{"year": 2030, "projected_balance": 1.5}],
+    },
+    "horizons": [{"years": 4, "year": 2030, "balance": 1.0, "projected_balances": {"0.08": 2.0, "0.05": 1.5}}],
+}
+
+class TestBalanceGraph:
+    """Test cases for GET /balance/{balance_id}/graph"""
+
+    @respx.mock
+    def test_graph_uses_single_projection_call(self, auth_user):
+        """The backend pushes its running totals to /projection in one call instead of being called back"""
+        _, balance_id, headers = auth_user
+        client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 500}, headers=headers)
+        client.post("/expenses/", json={"balance_id": balance_id, "category": "Rent", "amount": 100}, headers=headers)
+
+        projection_route = respx.post(f"{GRAPH_MICROSERVICE_URL}/projection/{balance_id}").mock(
+            return_value=httpx.Response(200, json=PROJECTION)
+        )
+
+        response = client.get(
+            f"/balance/{balance_id}/graph",
+            params={"growth_rates": [0.08, 0.05], "horizons": [4]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "balance_graph": [{"year": 2030, "balance": 1.0}],
+            "projected_revenue": [{"year": 2030, "projected_balance": 2.0}],
+            "projected_revenue_by_rate": PROJECTION["projected_revenue"],
+            "horizons": PROJECTION["horizons"],
+        }
+
+        assert projection_route.call_count == 1
+        sent = json.loads(projection_route.calls[0].request.content)
+        assert sent == {
+            "current_balance": 0.0,
+            "total_income": 500.0,
+            "total_expense": 100.0,
+            "growth_rates": [0.08, 0.05],
+            "horizons": [4],
+        }
+        # No JWT is forwarded: the graph service no longer calls the backend
+        assert "authorization" not in projection_route.calls[0].request.headers
+
+    @respx.mock
+    def test_graph_service_error(self, auth_user):
+        """Upstream errors surface with the graph service's status code"""
+        _, balance_id, headers = auth_user
+        respx.post(f"{GRAPH_MICROSERVICE_URL}/projection/{balance_id}").mock(return_value=httpx.Response(503))
+
+        response = client.get(f"/balance/{balance_id}/graph", headers=headers)
+        assert response.status_code == 503
+
+    def test_graph_rejects_bad_rates(self, auth_user):
+        """Growth rates are validated before calling the graph service"""
+        _, balance_id, headers = auth_user
+        response = client.get(f"/balance/{balance_id}/graph", params={"growth_rates": [2]}, headers=headers)
+        assert response.status_code == 422
+
+    @respx.mock
+    def test_graph_etag_skips_graph_service(self, auth_user):
+        """A matching If-None-Match answers 304 without calling the graph service, until the totals change"""
+        _, balance_id, headers = auth_user
+        projection_route = respx.post(f"{GRAPH_MICROSERVICE_URL}/projection/{balance_id}").mock(
+            return_value=httpx.Response(200, json=PROJECTION)
+        )
+
+        first = client.get(f"/balance/{balance_id}/graph", headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(f"/balance/{balance_id}/graph", headers={**headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert projection_route.call_count == 1
+
+        # Different parameters are a different resource
+        other = client.get(f"/balance/{balance_id}/graph", params={"horizons": [5]}, headers={**headers, "If-None-Match": etag})
+        assert other.status_code == 200
+        assert other.headers["etag"] != etag
+
+        client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 250}, headers=headers)
+        changed = client.get(f"/balance/{balance_id}/graph", headers={**headers, "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert projection_route.call_count == 3
+
+def test_graph_service_etag_copy_matches_backend():
+    """The graph service's app/etag.py must stay identical to core/etag.py below the module docstring"""
+    from pathlib import Path
+
+    def code(path: Path) -> str:
+        return path.read_text().split('"""', 2)[2]
+
+    app_dir = Path(__file__).resolve().parent.parent
+    assert code(app_dir / "core" / "etag.py") == code(app_dir / "graph_microservice" / "app" / "etag.py")
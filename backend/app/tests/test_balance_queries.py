@@ -0,0 +1,146 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from main import app
+import crud
+from db.database import AsyncSessionLocal
+from routers.suggestions import fetch_financial_data
+
+client = TestClient(app)
+
+def balance_statements(statements):
+    """Statements that touch the balances table"""
+    return [statement for statement in statements if "balances" in statement]
+
+class TestBalanceQueryCounts:
+    """Query-count regression tests for the ownership-scoped balance routes"""
+
+    def test_get_balance_single_query(self, auth_user, query_log):
+        """Fetch and ownership check happen in one statement"""
+        _, balance_id, headers = auth_user
+        response = client.get(f"/balance/{balance_id}", headers=headers)
+        assert response.status_code == 200
+
+        # user lookup + scoped balance fetch
+        assert len(query_log) == 2
+        assert len(balance_statements(query_log)) == 1
+
+    def test_update_balance_single_statement(self, auth_user, query_log):
+        """Update is a single UPDATE ... WHERE id AND user_id"""
+        _, balance_id, headers = auth_user
+        response = client.patch(f"/balance/{balance_id}", json={"amount": 250}, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"id": balance_id, "amount": 250.0}
+
+        statements = balance_statements(query_log)
+        assert len(query_log) == 2
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+
+    def test_update_balance_returns_stored_row(self, auth_user):
+        """Columns not in the update (e.g. running totals) come back as stored, not as defaults"""
+        import asyncio
+        import crud
+        from db.database import AsyncSessionLocal
+        from schemas.balance import BalanceUpdate
+
+        user, balance_id, headers = auth_user
+        client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 300}, headers=headers)
+
+        async def scenario():
+            async with AsyncSessionLocal() as db:
+                return await crud.balance.update_balance(db, balance_id, BalanceUpdate(amount=50), user.id)
+
+        db_balance = asyncio.run(scenario())
+        assert db_balance.amount == 50.0
+        assert db_balance.total_income == 300.0
+        assert db_balance.income_count == 1
+        assert db_balance.user_id == user.id
+
+    def test_delete_balance_without_fetch(self, auth_user, query_log):
+        """Delete never loads the balance or its transactions"""
+        _, balance_id, headers = auth_user
+        response = client.delete(f"/balance/{balance_id}", headers=headers)
+        assert response.status_code == 204
+
+        # user lookup + incomes, expenses, suggestions and balance deletes
+        assert len(query_log) == 5
+        assert all(statement.startswith("DELETE") for statement in query_log[1:])
+
+    def test_foreign_balance_is_forbidden(self, auth_user, foreign_balance):
+        """A balance owned by someone else is still reported as 403"""
+        _, _, headers = auth_user
+        foreign_id = foreign_balance
+
+        assert client.get(f"/balance/{foreign_id}", headers=headers).status_code == 403
+        assert client.patch(f"/balance/{foreign_id}", json={"amount": 1}, headers=headers).status_code == 403
+        assert client.delete(f"/balance/{foreign_id}", headers=headers).status_code == 403
+        assert client.get("/balance/999999", headers=headers).status_code == 404
+
+class TestBalanceTotals:
+    """Test cases for the server-side balance totals aggregate"""
+
+    def test_totals_in_one_query(self, auth_user, query_log):
+        """Totals and counts come from a single statement without loading ledger rows"""
+        _, balance_id, headers = auth_user
+        items = [{"balance_id": balance_id, "source": "Job", "amount": 100}, {"balance_id": balance_id, "source": "Gig", "amount": 50.5}]
+        assert client.post("/incomes/bulk", json={"items": items}, headers=headers).status_code == 200
+        assert client.post("/expenses/", json={"balance_id": balance_id, "category": "Rent", "amount": 40}, headers=headers).status_code == 200
+        query_log.clear()
+
+        async def scenario():
+            async with AsyncSessionLocal() as db:
+                return await crud.balance.get_balance_totals(db, balance_id), await fetch_financial_data(db, balance_id)
+
+        totals, financial_data = asyncio.run(scenario())
+        assert totals == {
+            "balance_id": balance_id,
+            "current_balance": 0.0,
+            "total_income": 150.5,
+            "income_count": 2,
+            "total_expense": 40.0,
+            "expense_count": 1,
+        }
+        assert financial_data["total_income"] == 150.5
+        assert financial_data["total_expense"] == 40.0
+        # one statement each for get_balance_totals and fetch_financial_data
+        assert len(query_log) == 2
+
+    def test_totals_for_missing_balance(self):
+        """A missing balance yields None rather than zero totals"""
+        async def scenario():
+            async with AsyncSessionLocal() as db:
+                return await crud.balance.get_balance_totals(db, 999999)
+
+        assert asyncio.run(scenario()) is None
+
+
+class TestBalanceSummary:
+    """Test cases for GET /balance/{balance_id}/summary"""
+
+    def test_summary_in_three_queries(self, auth_user, query_log):
+        """Balance+suggestions, recent incomes and recent expenses are one statement each"""
+        _, balance_id, headers = auth_user
+        items = [{"balance_id": balance_id, "source": f"Job {i}", "amount": 10} for i in range(3)]
+        assert client.post("/incomes/bulk", json={"items": items}, headers=headers).status_code == 200
+        assert client.post("/expenses/", json={"balance_id": balance_id, "category": "Rent", "amount": 5}, headers=headers).status_code == 200
+        query_log.clear()
+
+        response = client.get(f"/balance/{balance_id}/summary?recent=2", headers=headers)
+        assert response.status_code == 200
+        summary = response.json()
+        assert summary["balance"] == {"id": balance_id, "amount": 0.0}
+        assert summary["totals"] == {"total_income": 30.0, "income_count": 3, "total_expense": 5.0, "expense_count": 1}
+        assert len(summary["incomes"]["items"]) == 2
+        assert summary["incomes"]["next_cursor"] is not None
+        assert summary["expenses"]["next_cursor"] is None
+        assert summary["suggestions"] is None
+
+        # balance/suggestions join + incomes page + expenses page (the user comes from the auth cache)
+        assert len([statement for statement in query_log if "FROM users" not in statement]) == 3
+
+    def test_summary_of_foreign_balance(self, auth_user):
+        """Another user's balance is forbidden, a missing one is not found"""
+        _, _, headers = auth_user
+        assert client.get("/balance/999999/summary", headers=headers).status_code == 404
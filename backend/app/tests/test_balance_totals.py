@@ -0,0 +1,98 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from main import app
+import crud
+from db import engine
+from db.database import AsyncSessionLocal, SessionLocal
+from db.models import Balance
+from db.upgrade import add_balance_total_columns
+
+client = TestClient(app)
+
+def stored_totals(balance_id: int) -> tuple:
+    db = SessionLocal()
+    try:
+        balance = db.get(Balance, balance_id)
+        return balance.total_income, balance.income_count, balance.total_expense, balance.expense_count
+    finally:
+        db.close()
+
+def create_balance(user_id: int) -> int:
+    db = SessionLocal()
+    try:
+        balance = Balance(amount=0.0, user_id=user_id)
+        db.add(balance)
+        db.commit()
+        return balance.id
+    finally:
+        db.close()
+
+class TestRunningTotals:
+    """Test cases for the running totals kept on balances"""
+
+    def test_writes_keep_totals_in_step(self, auth_user):
+        """Test that create, update, move, delete, bulk and import all adjust the totals"""
+        user, balance_id, headers = auth_user
+        other_id = create_balance(user.id)
+
+        income_id = client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 100}, headers=headers).json()["id"]
+        client.post("/expenses/", json={"balance_id": balance_id, "category": "Rent", "amount": 30}, headers=headers)
+        assert stored_totals(balance_id) == (100.0, 1, 30.0, 1)
+
+        client.patch(f"/incomes/{income_id}", json={"amount": 150}, headers=headers)
+        assert stored_totals(balance_id) == (150.0, 1, 30.0, 1)
+
+        client.patch(f"/incomes/{income_id}", json={"balance_id": other_id}, headers=headers)
+        assert stored_totals(balance_id) == (0.0, 0, 30.0, 1)
+        assert stored_totals(other_id) == (150.0, 1, 0.0, 0)
+
+        client.delete(f"/incomes/{income_id}", headers=headers)
+        assert stored_totals(other_id) == (0.0, 0, 0.0, 0)
+
+        items = [{"balance_id": balance_id, "category": "Food", "amount": 10}, {"balance_id": other_id, "category": "Gas", "amount": 5}]
+        client.post("/expenses/bulk", json={"items": items}, headers=headers)
+        client.post(
+            f"/expenses/import?balance_id={balance_id}",
+            content=b"category,amount\nBooks,20\nGym,40\n",
+            headers={**headers, "Content-Type": "text/csv"},
+        )
+        assert stored_totals(balance_id) == (0.0, 0, 100.0, 4)
+        assert stored_totals(other_id) == (0.0, 0, 5.0, 1)
+
+    def test_update_uses_current_amount_not_a_stale_read(self, auth_user):
+        """Test that an update whose session read the row before another update committed does not drift"""
+        from schemas.balance import IncomeUpdate
+        user, balance_id, headers = auth_user
+        income_id = client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 100}, headers=headers).json()["id"]
+
+        async def interleaved_updates():
+            async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+                checked = await crud.income.get_income(first, income_id)  # Ownership check reads amount 100
+                await crud.income.update_income(second, income_id, IncomeUpdate(amount=150))
+                await crud.income.update_income(first, income_id, IncomeUpdate(amount=120))
+                assert checked.amount == 120
+
+        asyncio.run(interleaved_updates())
+        assert stored_totals(balance_id)[:2] == (120.0, 1)
+
+    def test_repair_recomputes_from_ledger(self, auth_user):
+        """Test that the repair job restores totals that drifted from the detail tables"""
+        _, balance_id, headers = auth_user
+        client.post("/incomes/", json={"balance_id": balance_id, "source": "Job", "amount": 80}, headers=headers)
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE balances SET total_income = 1, income_count = 9 WHERE id = :id"), {"id": balance_id})
+
+        async def repair():
+            async with AsyncSessionLocal() as db:
+                return await crud.balance.repair_balance_totals(db, balance_id)
+
+        assert asyncio.run(repair()) == 1
+        assert stored_totals(balance_id) == (80.0, 1, 0.0, 0)
+
+    def test_upgrade_is_idempotent(self):
+        """Test that the upgrade step is a no-op once the columns exist"""
+        assert add_balance_total_columns(engine)
+        assert add_balance_total_columns(engine)
@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from db.database import SessionLocal
+from db.models import Income
+
+client = TestClient(app)
+
+def count_incomes(balance_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Income).filter(Income.balance_id == balance_id).count()
+    finally:
+        db.close()
+
+class TestBulkCreate:
+    """Test cases for the bulk income/expense endpoints"""
+
+    def test_bulk_incomes_single_insert(self, auth_user, query_log):
+        """Test that a batch is written with one ownership query and one INSERT"""
+        _, balance_id, headers = auth_user
+        items = [{"balance_id": balance_id, "source": f"Salary {month}", "amount": 1000 + month} for month in range(12)]
+
+        response = client.post("/incomes/bulk", json={"items": items}, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"created": 12, "failed": 0, "errors": []}
+        assert count_incomes(balance_id) == 12
+
+        # user lookup + balance ownership + one INSERT
+        inserts = [statement for statement in query_log if statement.startswith("INSERT")]
+        assert len(inserts) == 1
+        assert len([statement for statement in query_log if "FROM balances" in statement]) == 1
+
+    def test_bulk_expenses_rejects_batch_on_error(self, auth_user):
+        """Test that by default nothing is written if any row fails"""
+        _, balance_id, headers = auth_user
+        items = [
+            {"balance_id": balance_id, "category": "Rent", "amount": 1500},
+            {"balance_id": balance_id, "category": "Food", "amount": -5},
+        ]
+
+        response = client.post("/expenses/bulk", json={"items": items}, headers=headers)
+        assert response.status_code == 422
+        errors = response.json()["detail"]["errors"]
+        assert [error["index"] for error in errors] == [1]
+
+    def test_bulk_partial_reports_rows(self, auth_user, foreign_balance):
+        """Test that partial mode writes valid rows and reports the rest"""
+        _, balance_id, headers = auth_user
+        foreign_id = foreign_balance
+
+        items = [
+            {"balance_id": balance_id, "source": "Job", "amount": 100},
+            {"balance_id": 999999, "source": "Job", "amount": 100},
+            {"balance_id": foreign_id, "source": "Job", "amount": 100},
+            {"balance_id": balance_id, "source": "", "amount": 100},
+        ]
+        response = client.post("/incomes/bulk?partial=true", json={"items": items}, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert data["failed"] == 3
+        assert [(error["index"], error["detail"]) for error in data["errors"][:2]] == [
+            (1, "Balance not found"),
+            (2, "Access denied"),
+        ]
+        assert data["errors"][2]["index"] == 3
+        assert count_incomes(balance_id) == 1
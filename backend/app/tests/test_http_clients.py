@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+import respx
+from fastapi.testclient import TestClient
+
+from main import app
+from core.http_clients import UpstreamClients, InstrumentedTransport
+
+client = TestClient(app)
+
+class TestUpstreamClients:
+    """Test cases for the shared per-upstream HTTP clients"""
+
+    def test_client_is_shared_until_closed(self):
+        """The same pooled client is returned on every call and recreated after shutdown"""
+        clients = UpstreamClients({"svc": {"base_url": "http://svc:9000", "read_timeout": 3.0}})
+
+        async def scenario():
+            first = clients.get("svc")
+            assert clients.get("svc") is first
+            assert isinstance(first._transport, InstrumentedTransport)
+            assert first.timeout.read == 3.0
+            await clients.aclose()
+            assert first.is_closed
+            reopened = clients.get("svc")
+            await clients.aclose()
+            return reopened is not first
+
+        assert asyncio.run(scenario())
+
+    @respx.mock
+    def test_requests_are_measured(self):
+        """Latency, status and error counters are recorded per upstream"""
+        clients = UpstreamClients({"svc": {"base_url": "http://svc:9000", "read_timeout": 3.0}})
+        respx.get("http://svc:9000/ok").mock(return_value=httpx.Response(200))
+        respx.get("http://svc:9000/boom").mock(return_value=httpx.Response(502))
+        respx.get("http://svc:9000/down").mock(side_effect=httpx.ConnectError("refused"))
+
+        async def scenario():
+            upstream = clients.get("svc")
+            await upstream.get("/ok")
+            await upstream.get("/boom")
+            try:
+                await upstream.get("/down")
+            except httpx.ConnectError:
+                pass
+            stats = clients.stats()["svc"]
+            await clients.aclose()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats["requests"] == 3
+        assert stats["server_errors"] == 1
+        assert stats["errors"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["latency_ms"]["buckets"]["+Inf"] == 3
+        assert set(stats["pool"]) == {"connections", "idle", "active"}
+
+    def test_metrics_endpoint_lists_upstreams(self):
+        """/metrics/ reports every configured upstream"""
+        response = client.get("/metrics/")
+        assert response.status_code == 200
+        assert set(response.json()["upstreams"]) == {"graph", "llm"}
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, select, text
+
+from crud.pagination import encode_cursor, _after_cursor
+from db import Base, engine
+from db.models import Income, Expense, LoginAttempt, Balance
+from db.upgrade import add_missing_indexes
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN checks target the sqlite stand-in")
+
+def query_plan(statement) -> str:
+    """Return sqlite's EXPLAIN QUERY PLAN output for a select as one string"""
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+class TestCompositeIndexes:
+    """Test cases for the composite indexes on the hot query shapes"""
+
+    @pytest.mark.parametrize("model, index_name", [
+        (Income, "idx_incomes_balance_created"),
+        (Expense, "idx_expenses_balance_created"),
+    ])
+    def test_balance_listing_uses_index(self, model, index_name):
+        """Test that a per-balance keyset page is served by (balance_id, created_at) without a sort"""
+        statement = (
+            select(model)
+            .where(model.balance_id == 1)
+            .where(_after_cursor(model, encode_cursor(datetime(2026, 1, 1), 10)))
+            .order_by(model.created_at.desc(), model.id.desc())
+            .limit(101)
+        )
+        plan = query_plan(statement)
+        assert index_name in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_failed_login_count_uses_index(self):
+        """Test that the lockout-window count is answered from the login_attempts covering index"""
+        statement = select(LoginAttempt.id).where(
+            LoginAttempt.user_id == 1,
+            LoginAttempt.success == False,
+            LoginAttempt.attempted_at >= datetime(2026, 1, 1)
+        )
+        assert "idx_login_attempts_user_success_time" in query_plan(statement)
+
+    def test_login_retention_scan_uses_index(self):
+        """Test that the retention job finds the oldest attempts without scanning or sorting the table"""
+        statement = select(LoginAttempt.id).where(
+            LoginAttempt.attempted_at < datetime(2026, 1, 1)
+        ).order_by(LoginAttempt.attempted_at).limit(1000)
+        plan = query_plan(statement)
+        assert "idx_login_attempts_attempted_at" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_user_balances_uses_index(self):
+        """Test that listing a user's balances uses the user_id index"""
+        assert "idx_balances_user_id" in query_plan(select(Balance).where(Balance.user_id == 1))
+
+    def test_add_missing_indexes_is_idempotent(self):
+        """Test that a dropped index is recreated and re-running changes nothing"""
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX idx_incomes_balance_created"))
+
+        assert add_missing_indexes(engine, Base.metadata)
+        assert add_missing_indexes(engine, Base.metadata)
+
+        names = [index["name"] for index in inspect(engine).get_indexes("incomes")]
+        assert names.count("idx_incomes_balance_created") == 1
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from main import app
+from core.config import settings
+from db.database import SessionLocal
+from db.models import Income, Expense
+
+client = TestClient(app)
+
+def seed_ledger(balance_id: int, incomes: int, expenses: int):
+    db = SessionLocal()
+    try:
+        db.add_all(Income(balance_id=balance_id, source=f"Job {i}", amount=100 + i) for i in range(incomes))
+        db.add_all(Expense(balance_id=balance_id, category=f"Bill {i}", amount=10 + i) for i in range(expenses))
+        db.commit()
+    finally:
+        db.close()
+
+class TestLedgerExport:
+    """Test cases for GET /balance/{balance_id}/export"""
+
+    def test_csv_export_streams_all_rows(self, auth_user, monkeypatch):
+        """Test that the CSV export contains every income and expense across several cursor batches"""
+        _, balance_id, headers = auth_user
+        monkeypatch.setattr(settings, "export_batch_size", 3)
+        seed_ledger(balance_id, incomes=7, expenses=5)
+
+        response = client.get(f"/balance/{balance_id}/export", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert f"balance-{balance_id}-ledger.csv" in response.headers["content-disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["type"] for row in rows] == ["income"] * 7 + ["expense"] * 5
+        assert rows[0]["description"] == "Job 0"
+        assert float(rows[-1]["amount"]) == 14
+
+    def test_ndjson_export(self, auth_user):
+        """Test that NDJSON exports one JSON object per line"""
+        _, balance_id, headers = auth_user
+        seed_ledger(balance_id, incomes=2, expenses=1)
+
+        response = client.get(f"/balance/{balance_id}/export?format=ndjson", headers=headers)
+        assert response.status_code == 200
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["type"] for record in records] == ["income", "income", "expense"]
+        assert set(records[0]) == {"type", "id", "description", "amount", "created_at"}
+
+    def test_export_requires_ownership(self, auth_user, foreign_balance):
+        """Test that another user's balance cannot be exported"""
+        _, _, headers = auth_user
+        foreign_id = foreign_balance
+
+        response = client.get(f"/balance/{foreign_id}/export", headers=headers)
+        assert response.status_code == 403
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, date
+import uuid
+
+import pytest
+from sqlalchemy import delete, event
+
+import crud
+from db import engine
+from db.database import SessionLocal
+from db.models import LoginAttempt, LoginAttemptDaily, User
+
+@pytest.fixture
+def attempts():
+    """A user with 6 old attempts over two days and 2 recent ones; returns (db, user_id, old_day)"""
+    db = SessionLocal()
+    try:
+        username = f"user{uuid.uuid4().hex[:12]}"
+        user = User(username=username, email=f"{username}@example.com", password="unused")
+        db.add(user)
+        db.commit()
+
+        # Far enough back that other tests' rows are not this old
+        old_day = datetime(2001, 3, 4, 12, 0)
+        old = [(old_day, True), (old_day, False), (old_day + timedelta(hours=1), False),
+               (old_day + timedelta(days=1), True), (old_day + timedelta(days=1), True), (old_day + timedelta(days=1), False)]
+        recent = [(datetime.utcnow() - timedelta(days=1), False), (datetime.utcnow(), True)]
+        db.add_all([
+            LoginAttempt(user_id=user.id, ip_address="10.0.0.1", attempted_at=attempted_at, success=success)
+            for attempted_at, success in old + recent
+        ])
+        db.commit()
+        yield db, user.id, old_day.date()
+    finally:
+        db.close()
+
+def daily_counts(db, user_id):
+    db.expire_all()
+    return {
+        daily.day: (daily.success_count, daily.failure_count)
+        for daily in db.query(LoginAttemptDaily).filter(LoginAttemptDaily.user_id == user_id)
+    }
+
+class TestLoginAttemptRetention:
+    """Test cases for purging and rolling up old login attempts"""
+
+    def test_purge_rolls_up_into_daily_counts(self, attempts):
+        db, user_id, old_day = attempts
+
+        result = crud.user.purge_login_attempts(db, retention_days=30, batch_size=4)
+        assert result["deleted"] >= 6
+        assert result["batches"] >= 2  # Bounded batches
+
+        remaining = db.query(LoginAttempt).filter(LoginAttempt.user_id == user_id).count()
+        assert remaining == 2
+        assert daily_counts(db, user_id) == {old_day: (1, 2), old_day + timedelta(days=1): (2, 1)}
+
+    def test_rerun_adds_to_existing_days(self, attempts):
+        db, user_id, old_day = attempts
+        crud.user.purge_login_attempts(db, retention_days=30, batch_size=100)
+
+        db.add(LoginAttempt(user_id=user_id, ip_address="10.0.0.1", attempted_at=datetime(2001, 3, 4, 18, 0), success=False))
+        db.commit()
+        crud.user.purge_login_attempts(db, retention_days=30, batch_size=100)
+
+        assert daily_counts(db, user_id)[old_day] == (1, 3)
+
+    def test_purge_without_aggregate_and_max_batches(self, attempts):
+        db, user_id, old_day = attempts
+
+        result = crud.user.purge_login_attempts(db, retention_days=30, batch_size=2, aggregate=False, max_batches=1)
+        assert result == {"deleted": 2, "batches": 1, "cutoff": result["cutoff"]}
+        assert daily_counts(db, user_id) == {}
+
+    @pytest.mark.parametrize("delete_returning", [True, False])
+    def test_overlapping_run_does_not_double_count(self, attempts, monkeypatch, delete_returning):
+        """A row another run purges between our read and our DELETE is not rolled up again"""
+        db, user_id, old_day = attempts
+        monkeypatch.setattr(engine.dialect, "delete_returning", delete_returning)
+        stolen = db.query(LoginAttempt.id).filter(
+            LoginAttempt.user_id == user_id, LoginAttempt.attempted_at == datetime(2001, 3, 4, 13, 0)
+        ).scalar()
+
+        raced = []
+
+        def concurrent_purge(conn, cursor, statement, parameters, context, executemany):
+            if not raced and statement.lstrip().upper().startswith("DELETE FROM LOGIN_ATTEMPTS"):
+                raced.append(stolen)
+                with engine.begin() as other:
+                    other.execute(delete(LoginAttempt).where(LoginAttempt.id == stolen))
+
+        event.listen(engine, "before_cursor_execute", concurrent_purge)
+        try:
+            crud.user.purge_login_attempts(db, retention_days=30, batch_size=100)
+        finally:
+            event.remove(engine, "before_cursor_execute", concurrent_purge)
+
+        # The stolen row (a failure on old_day) is left to the run that deleted it
+        assert daily_counts(db, user_id) == {old_day: (1, 1), old_day + timedelta(days=1): (2, 1)}
+        assert db.query(LoginAttempt).filter(LoginAttempt.user_id == user_id).count() == 2
+
+    def test_concurrent_roll_ups_creating_the_same_day(self, attempts):
+        """Another roll-up committing the same new (user, day) first is added to, not collided with"""
+        db, user_id, old_day = attempts
+        new_day = datetime(2001, 5, 6, 9, 0)
+        raced = []
+
+        def concurrent_roll_up(conn, cursor, statement, parameters, context, executemany):
+            if not raced and statement.lstrip().upper().startswith("INSERT INTO LOGIN_ATTEMPTS_DAILY"):
+                raced.append(True)
+                with engine.begin() as other:
+                    other.execute(LoginAttemptDaily.__table__.insert().values(
+                        user_id=user_id, day=new_day.date(), success_count=1, failure_count=2))
+
+        rows = [LoginAttempt(user_id=user_id, attempted_at=new_day, success=success) for success in (True, False)]
+        event.listen(engine, "before_cursor_execute", concurrent_roll_up)
+        try:
+            crud.user.roll_up_login_attempts(db, rows)
+            db.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", concurrent_roll_up)
+
+        assert raced
+        assert daily_counts(db, user_id) == {new_day.date(): (2, 3)}
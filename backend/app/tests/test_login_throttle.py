@@ -0,0 +1,216 @@
+from datetime import datetime, timedelta
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from main import app
+from core.config import settings
+from core.login_audit import LoginAuditWriter, login_audit
+from core.login_throttle import InMemoryThrottleStore, LoginThrottle, RedisThrottleStore, ThrottleStoreUnavailable
+from core.password_hashing import PasswordHasher
+from db import engine
+from db.database import SessionLocal
+from db.models import LoginAttempt, User
+
+client = TestClient(app)
+PASSWORD = "Str0ng!Passw0rd"
+
+@pytest.fixture
+def login_user(monkeypatch):
+    """A user with a cheap password hash; returns (user_id, username)"""
+    monkeypatch.setattr(settings, "password_pbkdf2_iterations", 1000)
+    username = f"user{uuid.uuid4().hex[:12]}"
+    db = SessionLocal()
+    try:
+        user = User(username=username, email=f"{username}@example.com", password=PasswordHasher.hash_password(PASSWORD))
+        db.add(user)
+        db.commit()
+        yield user.id, username
+    finally:
+        db.close()
+
+@pytest.fixture
+def sync_query_log():
+    """Record the SQL statements sent through the sync engine (used by the auth routes)"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def login(username: str, password: str):
+    return client.post("/auth/login-json", json={"username_or_email": username, "password": password})
+
+def audit_rows(user_id: int):
+    login_audit.flush()
+    db = SessionLocal()
+    try:
+        return db.query(LoginAttempt).filter(LoginAttempt.user_id == user_id).order_by(LoginAttempt.id).all()
+    finally:
+        db.close()
+
+class TestSlidingWindow:
+    """Test cases for the in-memory sliding-window counter"""
+
+    def test_failures_expire_after_window(self):
+        throttle = LoginThrottle(InMemoryThrottleStore(limit=3, window_seconds=60), limit=3, window_seconds=60)
+
+        for offset in (0, 10, 20):
+            asyncio.run(throttle.record_failure(1, now=1000 + offset))
+        assert asyncio.run(throttle.is_locked_out(1, now=1030))
+        assert asyncio.run(throttle.failed_attempts(1, now=1071)) == 1  # The first two slid out of the window
+        assert not asyncio.run(throttle.is_locked_out(1, now=1071))
+        assert asyncio.run(throttle.failed_attempts(2, now=1071)) == 0
+
+    def test_keeps_only_limit_failures_per_user(self):
+        store = InMemoryThrottleStore(limit=3, window_seconds=60)
+        for offset in range(10):
+            store.add_failure(1, now=1000 + offset)
+        assert len(store._failures[1]) == 3
+
+    def test_seed_only_applies_to_unseen_users(self):
+        store = InMemoryThrottleStore(limit=3, window_seconds=60)
+        store.seed(1, [1000, 1001])
+        store.seed(1, [1002, 1003, 1004])
+        assert store.count_failures(1, now=1010) == 2
+
+    def test_seeding_many_users_stays_bounded(self):
+        store = InMemoryThrottleStore(limit=3, window_seconds=60, max_users=10)
+        for user_id in range(50):
+            store.seed(user_id, [])
+        for user_id in range(50, 100):
+            store.seed(user_id, [1000], now=1000 + 120)  # Expired by the time the next user is seeded
+        assert len(store._seeded) <= 10
+        assert len(store._failures) <= 10
+        assert store.is_known(49) and store.is_known(99)
+
+    def test_several_workers_need_a_shared_store(self, monkeypatch):
+        throttle = LoginThrottle(InMemoryThrottleStore(limit=3, window_seconds=60), limit=3, window_seconds=60)
+        throttle.check_configuration()
+        monkeypatch.setattr(settings, "web_concurrency", 4)
+        with pytest.raises(RuntimeError):
+            throttle.check_configuration()
+
+class FakeRedisPipeline:
+    """Just enough of a redis.asyncio pipeline to collect sorted-set members"""
+
+    def __init__(self, members: dict):
+        self.members = members
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def zadd(self, key, mapping):
+        self.members.update(mapping)
+
+    def zremrangebyscore(self, *args):
+        pass
+
+    def zremrangebyrank(self, *args):
+        pass
+
+    def zcard(self, key):
+        pass
+
+    def expire(self, *args):
+        pass
+
+    async def execute(self):
+        return [None, None, None, len(self.members), None]
+
+def test_redis_failures_at_the_same_instant_are_all_counted():
+    members = {}
+    store = RedisThrottleStore.__new__(RedisThrottleStore)  # Skip connecting to Redis
+    store.limit, store.window_seconds, store.prefix = 5, 60, "login-failures:"
+    store._client = type("FakeRedis", (), {"pipeline": lambda self: FakeRedisPipeline(members)})()
+
+    assert asyncio.run(store.add_failure(1, now=1000.0)) == 1
+    assert asyncio.run(store.add_failure(1, now=1000.0)) == 2
+    assert sorted(members.values()) == [1000.0, 1000.0]
+
+class UnreachableStore:
+    """A shared store whose every call fails, like Redis being down"""
+
+    shared = True
+
+    async def add_failure(self, user_id, now):
+        raise ThrottleStoreUnavailable("connection refused")
+
+    async def count_failures(self, user_id, now):
+        raise ThrottleStoreUnavailable("connection refused")
+
+class TestLoginLockout:
+    """Test cases for lockout and audit writes on the login routes"""
+
+    def test_lockout_without_count_queries(self, login_user, sync_query_log):
+        user_id, username = login_user
+
+        responses = [login(username, "Wrong!Passw0rd") for _ in range(5)]
+        assert [response.status_code for response in responses] == [401, 401, 401, 401, 429]
+        assert "4 attempts remaining" in responses[0].json()["detail"]
+        assert login(username, PASSWORD).status_code == 429
+
+        login_attempt_statements = [statement for statement in sync_query_log if "login_attempts" in statement]
+        # One read to seed the window for this user, and no per-attempt COUNT or INSERT
+        assert len(login_attempt_statements) == 1
+        assert login_attempt_statements[0].lstrip().upper().startswith("SELECT")
+
+        rows = audit_rows(user_id)
+        assert len(rows) == 6
+        assert not any(row.success for row in rows)
+
+    def test_success_is_audited(self, login_user):
+        user_id, username = login_user
+
+        assert login(username, PASSWORD).status_code == 200
+        rows = audit_rows(user_id)
+        assert [row.success for row in rows] == [True]
+
+    def test_lockout_survives_restart_via_seed(self, login_user):
+        """Failures already in the audit table (e.g. before a restart) are counted"""
+        user_id, username = login_user
+        db = SessionLocal()
+        try:
+            recent = datetime.utcnow() - timedelta(minutes=1)
+            db.add_all([LoginAttempt(user_id=user_id, ip_address="10.0.0.1", success=False, attempted_at=recent) for _ in range(5)])
+            db.commit()
+        finally:
+            db.close()
+
+        assert login(username, PASSWORD).status_code == 429
+
+    def test_unreachable_store_fails_closed_on_audit_table(self, login_user, monkeypatch):
+        """With the shared store down, lockouts are counted from login_attempts instead of erroring"""
+        import crud.user
+        monkeypatch.setattr(crud.user, "login_throttle", LoginThrottle(UnreachableStore(), limit=5, window_seconds=900))
+        _, username = login_user
+
+        responses = [login(username, "Wrong!Passw0rd") for _ in range(5)]
+        assert [response.status_code for response in responses] == [401, 401, 401, 401, 429]
+        assert login(username, PASSWORD).status_code == 429
+
+    def test_full_batch_wakes_the_writer(self, login_user):
+        """A batch that fills while the writer sleeps is written without waiting out the interval"""
+        user_id, _ = login_user
+        writer = LoginAuditWriter(batch_size=3, flush_interval=30, max_queue=100)
+        try:
+            writer.start()
+            time.sleep(0.05)  # Writer is now asleep for the long interval
+            for _ in range(3):
+                writer.record(user_id, "10.0.0.1", False)
+            deadline = time.monotonic() + 5
+            while writer.written < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert writer.written == 3
+        finally:
+            writer.stop()
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from db.database import engine, sync_pool_metrics
+
+client = TestClient(app)
+
+class TestPoolMetrics:
+    """Test cases for database pool telemetry"""
+
+    def test_checkout_events_are_counted(self):
+        """Test that checkouts, checkins and latency are recorded"""
+        sync_pool_metrics.reset()
+        with engine.connect():
+            snapshot = sync_pool_metrics.snapshot()
+            assert snapshot["checked_out"] == 1
+
+        snapshot = sync_pool_metrics.snapshot()
+        assert snapshot["checkouts"] == 1
+        assert snapshot["checkins"] == 1
+        assert snapshot["checkout_latency_ms"]["count"] == 1
+        assert snapshot["checkout_latency_ms"]["buckets"]["+Inf"] == 1
+
+    def test_pool_sized_from_settings(self):
+        """Test that the sync pool uses the configured size"""
+        from core.config import settings
+        assert engine.pool.size() == settings.db_pool_size
+        assert type(engine.pool).__name__ == "TimedQueuePool"
+
+    def test_metrics_endpoint(self, auth_user):
+        """Test that the metrics endpoint reports both pools"""
+        _, _, headers = auth_user
+        client.get("/balance/current", headers=headers)
+
+        response = client.get("/metrics/")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["db_pool"]) == {"sync", "async"}
+        assert data["db_pool"]["async"]["checkouts"] >= 1
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from main import app
+from crud.pagination import encode_cursor, decode_cursor
+from db.database import SessionLocal
+from db.models import Income
+
+client = TestClient(app)
+
+def seed_incomes(balance_id: int, count: int):
+    db = SessionLocal()
+    try:
+        db.add_all(Income(balance_id=balance_id, source=f"Job {i}", amount=i + 1) for i in range(count))
+        db.commit()
+    finally:
+        db.close()
+
+class TestKeysetPagination:
+    """Test cases for cursor pagination of the income/expense listings"""
+
+    def test_cursor_roundtrip(self):
+        """Test that cursors decode back to the key they were built from"""
+        created_at = datetime(2026, 1, 2, 3, 4, 5)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+    def test_walks_every_row_once(self, auth_user):
+        """Test that following next_cursor returns every row exactly once, newest first"""
+        _, balance_id, headers = auth_user
+        # Rows inserted together share created_at, so ordering falls back to id
+        seed_incomes(balance_id, 7)
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"balance_id": balance_id, "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/incomes/", params=params, headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(item["id"] for item in page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert len(seen) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    def test_page_size_is_enforced(self, auth_user):
+        """Test that validate_pagination rejects oversized pages and bad cursors"""
+        _, balance_id, headers = auth_user
+
+        response = client.get("/expenses/", params={"balance_id": balance_id, "limit": 501}, headers=headers)
+        assert response.status_code == 422
+
+        response = client.get("/expenses/", params={"balance_id": balance_id, "cursor": "%%%"}, headers=headers)
+        assert response.status_code == 400
@@ -1,5 +1,5 @@
 import pytest
-from core.password_hashing import PasswordHasher
+from core.password_hashing import HashScheme, PasswordHasher
 
 class TestPasswordHasher:
     """Test cases for PasswordHasher class"""
@@ -13,8 +13,8 @@ class TestPasswordHasher:
         
         # Should be different due to unique salts
         assert hash1 != hash2
-        assert ":" in hash1
-        assert ":" in hash2
+        assert hash1.startswith("$pbkdf2-sha256$600000$")
+        assert hash2.startswith("$pbkdf2-sha256$600000$")
     
     def test_verify_password_correct(self):
         """Test that correct password verification works"""
@@ -102,6 +102,113 @@ class TestPasswordHasher:
         unicode_hash = PasswordHasher.hash_password(unicode_password)
         assert PasswordHasher.verify_password(unicode_password, unicode_hash) is True
 
+class TestHashSchemes:
+    """Test cases for versioned hash formats, rehash detection and calibration"""
+
+    def test_legacy_salt_hash_still_verifies(self):
+        """Old "salt:hash" values verify and are flagged for an upgrade"""
+        salt = PasswordHasher.generate_salt()
+        versioned = PasswordHasher.hash_password("TestPassword123!", salt, scheme="pbkdf2-sha256", params={"iterations": 600_000})
+        salt_b64, hash_b64 = versioned.split("$")[3:]
+        legacy = f"{salt_b64}:{hash_b64}"
+
+        assert PasswordHasher.is_password_hashed(legacy) is True
+        assert PasswordHasher.verify_password("TestPassword123!", legacy) is True
+        assert PasswordHasher.needs_rehash(legacy) is True
+        assert PasswordHasher.needs_rehash(versioned) is False
+
+    def test_scrypt_roundtrip(self):
+        """scrypt hashes carry their parameters and verify"""
+        stored_hash = PasswordHasher.hash_password("TestPassword123!", scheme="scrypt", params={"ln": 10, "r": 8, "p": 1})
+
+        assert stored_hash.startswith("$scrypt$ln=10,r=8,p=1$")
+        assert PasswordHasher.verify_password("TestPassword123!", stored_hash) is True
+        assert PasswordHasher.verify_password("WrongPassword123!", stored_hash) is False
+        assert PasswordHasher.get_hash_info(stored_hash)["params"] == {"ln": 10, "r": 8, "p": 1}
+
+    def test_needs_rehash_follows_configuration(self, monkeypatch):
+        """A change of cost or scheme in settings marks existing hashes for rehash"""
+        from core.config import settings
+
+        stored_hash = PasswordHasher.hash_password("TestPassword123!", scheme="pbkdf2-sha256", params={"iterations": 1000})
+        monkeypatch.setattr(settings, "password_pbkdf2_iterations", 1000)
+        assert PasswordHasher.needs_rehash(stored_hash) is False
+
+        monkeypatch.setattr(settings, "password_pbkdf2_iterations", 2000)
+        assert PasswordHasher.needs_rehash(stored_hash) is True
+
+        monkeypatch.setattr(settings, "password_pbkdf2_iterations", 1000)
+        monkeypatch.setattr(settings, "password_hash_scheme", "scrypt")
+        assert PasswordHasher.needs_rehash(stored_hash) is True
+
+    def test_unknown_scheme_rejected(self):
+        assert PasswordHasher.verify_password("x", "$md5$1$c2FsdA==$aGFzaA==") is False
+        with pytest.raises(ValueError):
+            PasswordHasher.hash_password("x", scheme="md5")
+
+    def test_scheme_must_implement_params_and_derive(self):
+        class Incomplete(HashScheme):
+            name = "incomplete"
+
+            def current_params(self) -> dict:
+                return {}
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_unknown_configured_scheme_fails_settings(self):
+        from pydantic import ValidationError
+        from core.config import Settings
+        with pytest.raises(ValidationError):
+            Settings(password_hash_scheme="md5")
+
+    def test_unavailable_scheme_fails_startup_check(self, monkeypatch):
+        import core.password_hashing as password_hashing
+        from core.config import settings
+        monkeypatch.setattr(settings, "password_hash_scheme", "argon2id")
+        monkeypatch.setattr(password_hashing, "argon2_hash_secret_raw", None)
+        with pytest.raises(RuntimeError):
+            PasswordHasher.check_configuration()
+
+    def test_calibrate_pbkdf2_meets_target(self):
+        """Calibration returns iterations whose measured verify time reaches the target"""
+        params, elapsed = PasswordHasher.calibrate("pbkdf2-sha256", target_seconds=0.02, rounds=1)
+
+        assert params["iterations"] > 0
+        assert params["iterations"] % 1000 == 0
+        assert elapsed >= 0.02 * 0.8  # Timing noise on shared machines
+
+    def test_login_upgrades_hash(self, monkeypatch):
+        """A successful login rehashes a legacy hash with the configured scheme and cost"""
+        import uuid
+        from fastapi.testclient import TestClient
+        from core.config import settings
+        from db.database import SessionLocal
+        from db.models import User
+        from main import app
+
+        username = f"user{uuid.uuid4().hex[:12]}"
+        versioned = PasswordHasher.hash_password("Str0ng!Passw0rd", scheme="pbkdf2-sha256", params={"iterations": 600_000})
+        legacy = ":".join(versioned.split("$")[3:])
+        db = SessionLocal()
+        try:
+            db.add(User(username=username, email=f"{username}@example.com", password=legacy))
+            db.commit()
+        finally:
+            db.close()
+
+        monkeypatch.setattr(settings, "password_pbkdf2_iterations", 1000)
+        response = TestClient(app).post("/auth/login-json", json={"username_or_email": username, "password": "Str0ng!Passw0rd"})
+        assert response.status_code == 200
+
+        db = SessionLocal()
+        try:
+            upgraded = db.query(User).filter(User.username == username).one().password
+        finally:
+            db.close()
+        assert upgraded.startswith("$pbkdf2-sha256$1000$")
+        assert PasswordHasher.verify_password("Str0ng!Passw0rd", upgraded) is True
+
 if __name__ == "__main__":
     # Quick manual test
     print("🔐 Testing PBKDF2 Password Hashing...")
@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+
+import crud
+from core.config import settings
+from core.password_hashing import PasswordHasher
+from db.database import SessionLocal
+from db.models import User
+
+@pytest.fixture
+def plain_users(monkeypatch):
+    """Five users with plain text passwords and one already hashed; cheap hashing for speed"""
+    monkeypatch.setattr(settings, "password_pbkdf2_iterations", 1000)
+    db = SessionLocal()
+    users = []
+    try:
+        for index in range(6):
+            username = f"user{uuid.uuid4().hex[:12]}"
+            password = f"Plain!Passw0rd{index}"
+            stored = PasswordHasher.hash_password(password) if index == 5 else password
+            user = User(username=username, email=f"{username}@example.com", password=stored)
+            db.add(user)
+            db.commit()
+            users.append((user.id, password, stored))
+        yield db, users
+    finally:
+        db.close()
+
+def stored_passwords(db, users):
+    db.expire_all()
+    return {user.id: user.password for user in db.query(User).filter(User.id.in_([user_id for user_id, _, _ in users]))}
+
+class TestPasswordMigration:
+    """Test cases for the chunked, resumable plain text password migration"""
+
+    def test_migrates_in_chunks_across_processes(self, plain_users):
+        db, users = plain_users
+
+        migrated = crud.user.migrate_plain_text_passwords(db, chunk_size=2, workers=2)
+        assert migrated >= 5
+
+        stored = stored_passwords(db, users)
+        for user_id, password, original in users[:5]:
+            assert PasswordHasher.is_password_hashed(stored[user_id])
+            assert PasswordHasher.verify_password(password, stored[user_id])
+        # Already hashed rows are left untouched
+        assert stored[users[5][0]] == users[5][2]
+
+        # A rerun finds nothing left to do
+        assert crud.user.migrate_plain_text_passwords(db, chunk_size=2, workers=2) == 0
+
+    def test_resumes_after_id(self, plain_users):
+        db, users = plain_users
+        first_id = users[0][0]
+
+        crud.user.migrate_plain_text_passwords(db, chunk_size=3, workers=1, start_after_id=first_id)
+
+        stored = stored_passwords(db, users)
+        assert stored[first_id] == users[0][1]  # Before the resume point: still plain
+        assert all(PasswordHasher.is_password_hashed(stored[user_id]) for user_id, _, _ in users[1:])
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from main import app
+from core.password_hashing import PasswordHasher
+from core.password_pool import PasswordHashingPool, password_pool
+
+client = TestClient(app)
+
+class TestPasswordHashingPool:
+    """Test cases for the bounded password hashing pool"""
+
+    def test_hash_and_verify_on_pool(self):
+        """Hashes produced on the pool verify like inline ones"""
+        pool = PasswordHashingPool(max_workers=2, max_queue=2)
+
+        async def scenario():
+            stored_hash = await pool.hash_password("S3cure!pass")
+            return stored_hash, await pool.verify_password("S3cure!pass", stored_hash), await pool.verify_password("wrong", stored_hash)
+
+        try:
+            stored_hash, valid, invalid = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+        assert PasswordHasher.verify_password("S3cure!pass", stored_hash)
+        assert valid is True and invalid is False
+        assert pool.stats()["completed"] == 3
+
+    def test_failures_are_not_counted_as_completed(self):
+        """A hash that raises counts as failed, not completed, and frees its slot"""
+        pool = PasswordHashingPool(max_workers=1, max_queue=0)
+
+        def broken():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError):
+                asyncio.run(pool.run(broken))
+        finally:
+            pool.shutdown()
+        stats = pool.stats()
+        assert stats["completed"] == 0
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_event_loop_keeps_running_while_hashing(self):
+        """The loop keeps ticking while hashes run, instead of stalling for each one"""
+        pool = PasswordHashingPool(max_workers=2, max_queue=2)
+
+        async def scenario():
+            longest_gap = 0.0
+            async def ticker(stop: asyncio.Event):
+                nonlocal longest_gap
+                last = time.perf_counter()
+                while not stop.is_set():
+                    await asyncio.sleep(0.005)
+                    now = time.perf_counter()
+                    longest_gap = max(longest_gap, now - last)
+                    last = now
+
+            stop = asyncio.Event()
+            ticking = asyncio.create_task(ticker(stop))
+            start = time.perf_counter()
+            await asyncio.gather(*(pool.hash_password("S3cure!pass") for _ in range(4)))
+            hashing_time = time.perf_counter() - start
+            stop.set()
+            await ticking
+            return longest_gap, hashing_time
+
+        try:
+            longest_gap, hashing_time = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+        # Four hashes take hundreds of ms; the loop never waited on a whole one
+        assert longest_gap < hashing_time / 4
+
+    def test_saturated_pool_rejects_with_429(self):
+        """Beyond workers + queue in flight, new work is rejected with 429 and Retry-After"""
+        pool = PasswordHashingPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as rejected:
+                await pool.run(release.wait)
+            release.set()
+            await asyncio.gather(*blocked)
+            return rejected.value
+
+        try:
+            error = asyncio.run(scenario())
+        finally:
+            release.set()
+            pool.shutdown()
+        assert error.status_code == 429
+        assert error.headers["Retry-After"] == "1"
+        assert pool.stats()["rejected"] == 1
+        assert pool.stats()["in_flight"] == 0
+
+    def test_cancelled_request_keeps_its_slot_until_the_hash_ends(self):
+        """A disconnected client does not free capacity while its hash is still running"""
+        pool = PasswordHashingPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        async def scenario():
+            abandoned = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+            abandoned.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await abandoned
+            assert pool.stats()["in_flight"] == 1
+            with pytest.raises(HTTPException) as rejected:
+                await pool.run(release.wait)
+            release.set()
+            for _ in range(100):
+                if pool.stats()["in_flight"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            return rejected.value
+
+        try:
+            error = asyncio.run(scenario())
+        finally:
+            release.set()
+            pool.shutdown()
+        assert error.status_code == 429
+        stats = pool.stats()
+        assert stats["in_flight"] == 0
+        assert stats["cancelled"] == 1
+        assert stats["completed"] == 1  # The abandoned hash still ran to the end
+        assert stats["failed"] == 0
+
+class TestLoginBackpressure:
+    """Test cases for 429 on the auth endpoints when the hashing pool is saturated"""
+
+    def test_login_and_register_return_429_when_saturated(self, monkeypatch):
+        username = f"user{uuid.uuid4().hex[:12]}"
+        password = "Str0ng!Passw0rd"
+        response = client.post("/auth/register", json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": password,
+            "password_confirmation": password,
+        })
+        assert response.status_code == 201
+
+        monkeypatch.setattr(password_pool, "in_flight", password_pool.capacity)
+
+        response = client.post("/auth/login-json", json={"username_or_email": username, "password": password})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+
+        other = f"user{uuid.uuid4().hex[:12]}"
+        response = client.post("/auth/register", json={
+            "username": other,
+            "email": f"{other}@example.com",
+            "password": password,
+            "password_confirmation": password,
+        })
+        assert response.status_code == 429
+
+        monkeypatch.setattr(password_pool, "in_flight", 0)
+        response = client.post("/auth/login-json", json={"username_or_email": username, "password": password})
+        assert response.status_code == 200
@@ -0,0 +1,104 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from main import app
+from core.config import settings
+from core.import_parsers import iter_lines, iter_csv_records, iter_ndjson_records
+from db.database import SessionLocal
+from db.models import Income, Expense
+
+client = TestClient(app)
+
+def count_rows(model, balance_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(model).filter(model.balance_id == balance_id).count()
+    finally:
+        db.close()
+
+def collect(records):
+    async def run():
+        return [record async for record in records]
+    return asyncio.run(run())
+
+async def byte_chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+class TestImportParsers:
+    """Test cases for the incremental CSV/NDJSON parsers"""
+
+    def test_csv_split_across_chunks(self):
+        """Test that rows split across body chunks (including quoted newlines) are reassembled"""
+        data = 'source,amount\r\nSalary,1000\r\n"Bonus, Q1",250.5\r\n"Two\nlines",3\r\n'.encode()
+        records = collect(iter_csv_records(iter_lines(byte_chunks(data, 3))))
+        assert records == [
+            (0, {"source": "Salary", "amount": "1000"}, None),
+            (1, {"source": "Bonus, Q1", "amount": "250.5"}, None),
+            (2, {"source": "Two\nlines", "amount": "3"}, None),
+        ]
+
+    def test_ndjson_reports_bad_lines(self):
+        """Test that malformed NDJSON lines become row errors without stopping the stream"""
+        data = b'{"category": "Rent", "amount": 10}\nnot json\n\n[1, 2]\n{"category": "Food", "amount": 2}'
+        records = collect(iter_ndjson_records(iter_lines(byte_chunks(data, 7))))
+        assert [index for index, _, _ in records] == [0, 1, 2, 3]
+        assert records[1][1] is None and records[1][2].startswith("Invalid JSON")
+        assert records[2][2] == "Each line must be a JSON object"
+        assert records[3][1] == {"category": "Food", "amount": 2}
+
+class TestStreamingImport:
+    """Test cases for the /incomes/import and /expenses/import endpoints"""
+
+    def test_csv_import_commits_in_chunks(self, auth_user, monkeypatch):
+        """Test that valid rows are committed chunk by chunk and invalid ones are reported"""
+        _, balance_id, headers = auth_user
+        monkeypatch.setattr(settings, "import_chunk_size", 4)
+        lines = ["source,amount"] + [f"Job {i},{100 + i}" for i in range(10)] + ["Broken,-5"]
+
+        response = client.post(
+            f"/incomes/import?balance_id={balance_id}",
+            content="\n".join(lines).encode(),
+            headers={**headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["created"] == 10
+        assert body["failed"] == 1
+        assert body["chunks_committed"] == 3
+        assert [error["index"] for error in body["errors"]] == [10]
+        assert count_rows(Income, balance_id) == 10
+
+    def test_ndjson_import_uses_target_balance(self, auth_user):
+        """Test that rows are always written to the balance named in the query string"""
+        _, balance_id, headers = auth_user
+        data = b'{"category": "Rent", "amount": 900, "balance_id": 999999}\n{"category": "Food", "amount": 80}\n'
+
+        response = client.post(
+            f"/expenses/import?balance_id={balance_id}&format=ndjson",
+            content=data,
+            headers={**headers, "Content-Type": "application/octet-stream"},
+        )
+        assert response.status_code == 200
+        assert response.json()["created"] == 2
+        assert count_rows(Expense, balance_id) == 2
+
+    def test_import_requires_ownership_and_format(self, auth_user, foreign_balance):
+        """Test that foreign balances are rejected and unknown formats return 415"""
+        _, balance_id, headers = auth_user
+        foreign_id = foreign_balance
+
+        response = client.post(
+            f"/incomes/import?balance_id={foreign_id}",
+            content=b"source,amount\nJob,1\n",
+            headers={**headers, "Content-Type": "text/csv"},
+        )
+        assert response.status_code == 403
+
+        response = client.post(
+            f"/incomes/import?balance_id={balance_id}",
+            content=b"source,amount\nJob,1\n",
+            headers={**headers, "Content-Type": "text/plain"},
+        )
+        assert response.status_code == 415
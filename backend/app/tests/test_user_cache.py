@@ -0,0 +1,96 @@
+import time
+from fastapi.testclient import TestClient
+
+from main import app
+import crud
+from core.user_cache import UserCache, AuthenticatedUser, user_cache
+from db.database import SessionLocal
+
+client = TestClient(app)
+
+def make_user(user_id: int, username: str) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        id=user_id, username=username, email=f"{username}@example.com",
+        is_active=True, is_verified=False, created_at=None
+    )
+
+class TestUserCache:
+    """Test cases for the bounded TTL/LRU user cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = UserCache(max_size=10, ttl_seconds=60)
+        assert cache.get("alice") is None
+        cache.set("alice", make_user(1, "alice"))
+        assert cache.get("alice").id == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache = UserCache(max_size=2, ttl_seconds=60)
+        cache.set("a", make_user(1, "a"))
+        cache.set("b", make_user(2, "b"))
+        cache.get("a")
+        cache.set("c", make_user(3, "c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses"""
+        cache = UserCache(max_size=10, ttl_seconds=0.01)
+        cache.set("a", make_user(1, "a"))
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+class TestCachedCurrentUser:
+    """Test cases for get_current_user with the cache"""
+
+    def test_second_request_skips_user_lookup(self, auth_user, query_log):
+        """Test that repeated requests with the same token hit the cache"""
+        _, balance_id, headers = auth_user
+        client.get(f"/balance/{balance_id}", headers=headers)
+        query_log.clear()
+
+        response = client.get(f"/balance/{balance_id}", headers=headers)
+        assert response.status_code == 200
+        assert not any("FROM users" in statement for statement in query_log)
+        assert len(query_log) == 1
+
+    def test_deactivation_invalidates_cache(self, auth_user):
+        """Test that deactivating a user takes effect on the next request"""
+        user, _, headers = auth_user
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+        db = SessionLocal()
+        try:
+            crud.user.update_user(db, crud.user.get_user_by_id(db, user.id), is_active=False)
+        finally:
+            db.close()
+
+        assert user_cache.get(user.username) is None
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Inactive user"
+
+    def test_username_change_invalidates_old_name(self, auth_user):
+        """Test that renaming a user drops the snapshot cached under the old username"""
+        user, _, headers = auth_user
+        assert client.get("/auth/me", headers=headers).status_code == 200
+        assert user_cache.get(user.username) is not None
+
+        db = SessionLocal()
+        try:
+            new_username = f"{user.username}x"
+            crud.user.update_user(db, crud.user.get_user_by_id(db, user.id), username=new_username)
+        finally:
+            db.close()
+
+        assert user_cache.get(user.username) is None
+        assert user_cache.get(new_username) is None
+        # The old token's subject no longer names a user
+        assert client.get("/auth/me", headers=headers).status_code == 401
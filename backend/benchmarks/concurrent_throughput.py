@@ -0,0 +1,68 @@
+# backend/benchmarks/concurrent_throughput.py
+"""
+Concurrent-request throughput benchmark for the backend.
+
+Fires N requests at an authenticated endpoint with a fixed number of in-flight
+requests and reports throughput and latency percentiles. Run it once against a
+build on the sync session path and once against the async session path to
+compare, e.g.:
+
+    python benchmarks/concurrent_throughput.py --url http://localhost:8000 \
+        --token <JWT> --path /balance/current --concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+async def run_benchmark(url: str, path: str, token: str, concurrency: int, total_requests: int) -> dict:
+    """Send total_requests GETs with at most `concurrency` in flight"""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=30.0) as client:
+        async def one_request():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total_requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure concurrent-request throughput")
+    parser.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--path", default="/balance/current", help="Endpoint to hit")
+    parser.add_argument("--token", default="", help="JWT bearer token")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.url, args.path, args.token, args.concurrency, args.requests))
+    for key, value in results.items():
+        print(f"{key:>15}: {value}")
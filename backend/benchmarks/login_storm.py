@@ -0,0 +1,87 @@
+# backend/benchmarks/login_storm.py
+"""
+Login storm load test: non-auth latency while many logins hash passwords.
+
+Probes a cheap endpoint (default /health) at a steady rate, first on an idle
+server and then while --logins concurrent logins hammer /auth/login-json.
+With hashing on the event loop the probe latency jumps to the PBKDF2 time per
+queued login; with the hashing pool it should stay flat, and logins beyond the
+pool's capacity come back as 429 instead of queueing, e.g.:
+
+    python benchmarks/login_storm.py --url http://localhost:8000 \
+        --username alice --password '<password>' --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import collections
+import statistics
+import time
+
+import httpx
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "probes": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+async def probe(client: httpx.AsyncClient, path: str, interval: float, stop: asyncio.Event) -> list:
+    """GET path every `interval` seconds until stopped and return each latency"""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+async def run_benchmark(url: str, probe_path: str, username: str, password: str, logins: int, concurrency: int, interval: float) -> dict:
+    statuses = collections.Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120.0) as client:
+        # Baseline: the probe alone for about as many samples as the storm will take
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, probe_path, interval, stop))
+        await asyncio.sleep(max(interval * 50, 1.0))
+        stop.set()
+        baseline = await baseline_task
+
+        async def one_login():
+            async with semaphore:
+                response = await client.post("/auth/login-json", json={"username_or_email": username, "password": password})
+                statuses[response.status_code] += 1
+
+        stop = asyncio.Event()
+        storm_probe = asyncio.create_task(probe(client, probe_path, interval, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        during_storm = await storm_probe
+
+    return {
+        "idle": summarize(baseline),
+        "login_storm": summarize(during_storm),
+        "logins": {"elapsed_s": round(elapsed, 3), **{str(status): count for status, count in sorted(statuses.items())}},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure non-auth latency during a login storm")
+    parser.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--probe-path", default="/health", help="Non-auth endpoint to probe")
+    parser.add_argument("--username", required=True, help="Existing user to log in as")
+    parser.add_argument("--password", required=True, help="That user's password")
+    parser.add_argument("--logins", type=int, default=200, help="Total login requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Logins in flight")
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between probes")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.url, args.probe_path, args.username, args.password, args.logins, args.concurrency, args.interval))
+    for phase, stats in results.items():
+        print(f"{phase:>12}: " + ", ".join(f"{key}={value}" for key, value in stats.items()))
@@ -0,0 +1,83 @@
+# backend/benchmarks/projection_engine.py
+"""
+Projection engine benchmark: scalar month-by-month loops vs the vectorized closed form.
+
+The scalar side is the loop the graph service used before app.projection:
+add the monthly net 12 times a year for the linear series, add the yearly
+savings then compound for the projected revenue, one scenario at a time.
+Both sides evaluate the same growth rate x contribution change x horizon
+grid, and the results are checked against each other before timing, e.g.:
+
+    python benchmarks/projection_engine.py --rates 50 --changes 50 --horizons 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app" / "graph_microservice"))
+
+from app.projection import scenario_grid  # noqa: E402
+
+def scalar_grid(current_balance: float, monthly_net: float, growth_rates, contribution_changes, horizons):
+    """One Python loop per scenario, stepping month by month and year by year"""
+    linear = [[0.0] * len(horizons) for _ in contribution_changes]
+    compounded = [[[0.0] * len(horizons) for _ in contribution_changes] for _ in growth_rates]
+    for c, change in enumerate(contribution_changes):
+        net = monthly_net + change
+        for h, horizon in enumerate(horizons):
+            balance = current_balance
+            for _ in range(horizon + 1):
+                for _ in range(12):
+                    balance += net
+            linear[c][h] = balance
+            for r, rate in enumerate(growth_rates):
+                balance = current_balance
+                for _ in range(horizon + 1):
+                    balance = (balance + net * 12) * (1 + rate)
+                compounded[r][c][h] = balance
+    return linear, compounded
+
+def time_runs(iterations: int, run) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "min_ms": round(min(latencies) * 1000, 3),
+    }
+
+def run_benchmark(rates: int, changes: int, horizons: int, iterations: int) -> dict:
+    growth_rates = np.linspace(-0.05, 0.15, rates).tolist()
+    contribution_changes = np.linspace(-200.0, 500.0, changes).tolist()
+    horizon_list = np.linspace(0, 100, horizons).astype(int).tolist()
+    args = (10_000.0, 400.0, growth_rates, contribution_changes, horizon_list)
+
+    scalar_linear, scalar_compounded = scalar_grid(*args)
+    vector_linear, vector_compounded = scenario_grid(*args)
+    assert np.allclose(scalar_linear, vector_linear) and np.allclose(scalar_compounded, vector_compounded)
+
+    return {
+        "scenarios": rates * changes * horizons,
+        "scalar": time_runs(max(iterations // 20, 1), lambda: scalar_grid(*args)),
+        "vectorized": time_runs(iterations, lambda: scenario_grid(*args)),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare scalar projection loops with the vectorized engine")
+    parser.add_argument("--rates", type=int, default=50, help="Number of growth rates in the grid")
+    parser.add_argument("--changes", type=int, default=50, help="Number of monthly contribution changes in the grid")
+    parser.add_argument("--horizons", type=int, default=20, help="Number of horizons (spread over 0-100 years)")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs of the vectorized engine (scalar runs 1/20th)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rates, args.changes, args.horizons, args.iterations)
+    print(f"   scenarios: {results['scenarios']}")
+    for engine in ("scalar", "vectorized"):
+        print(f"{engine:>12}: " + ", ".join(f"{key}={value}" for key, value in results[engine].items()))
@@ -0,0 +1,75 @@
+# backend/benchmarks/summary_latency.py
+"""
+Dashboard load latency: the four-call pattern vs GET /balance/{id}/summary.
+
+The four-call pattern is what the dashboard did before the summary endpoint:
+/balance/current, /incomes/?balance_id=, /expenses/?balance_id= and
+/suggestions/{id}, fired concurrently the way the browser does. Each
+iteration measures the wall time until all four (or the one summary call)
+have returned, e.g.:
+
+    python benchmarks/summary_latency.py --url http://localhost:8000 \
+        --token <JWT> --balance-id 1 --iterations 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+async def time_iterations(iterations: int, load) -> list:
+    """Run `load` sequentially `iterations` times and return each wall time"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await load()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+async def run_benchmark(url: str, token: str, balance_id: int, iterations: int) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    async with httpx.AsyncClient(base_url=url, headers=headers, timeout=30.0) as client:
+        async def four_calls():
+            # 404 on cached suggestions is expected when none were generated yet
+            await asyncio.gather(
+                client.get("/balance/current"),
+                client.get("/incomes/", params={"balance_id": balance_id}),
+                client.get("/expenses/", params={"balance_id": balance_id}),
+                client.get(f"/suggestions/{balance_id}"),
+            )
+
+        async def summary_call():
+            response = await client.get(f"/balance/{balance_id}/summary")
+            response.raise_for_status()
+
+        # Warm up connections and server-side caches for both patterns
+        await four_calls()
+        await summary_call()
+
+        return {
+            "four_calls": summarize(await time_iterations(iterations, four_calls)),
+            "summary": summarize(await time_iterations(iterations, summary_call)),
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare dashboard load latency: four calls vs /summary")
+    parser.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    parser.add_argument("--token", default="", help="JWT bearer token")
+    parser.add_argument("--balance-id", type=int, required=True, help="Balance owned by the token's user")
+    parser.add_argument("--iterations", type=int, default=200, help="Dashboard loads per pattern")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.url, args.token, args.balance_id, args.iterations))
+    for pattern, stats in results.items():
+        print(f"{pattern:>12}: " + ", ".join(f"{key}={value}" for key, value in stats.items()))
@@ -1,28 +1,27 @@
 // src/hooks/useExpenses.ts
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { useMemo } from 'react';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { expenseService, GetExpensesParams } from '../services/expense.service';
-import { Expense, ExpenseCreate, ExpenseUpdate } from '../types/financial.types';
-import { QUERY_KEYS } from '../utils/constants';
+import { Expense, ExpenseCreate, ExpenseUpdate, Page } from '../types/financial.types';
+import { PAGINATION, QUERY_KEYS } from '../utils/constants';
 
-// Hook to get all expenses (with optional filtering)
-export const useGetExpenses = (params: GetExpensesParams = {}) => {
-  return useQuery({
-    queryKey: QUERY_KEYS.EXPENSE.LIST(params.balance_id),
-    queryFn: () => expenseService.getExpenses(params),
+// Hook to page through expenses (with optional filtering), one page per fetchNextPage()
+export const useGetExpenses = (params: GetExpensesParams = {}, enabled: boolean = true) => {
+  const limit = params.limit ?? PAGINATION.LIST_PAGE_SIZE;
+  return useInfiniteQuery({
+    queryKey: [...QUERY_KEYS.EXPENSE.LIST(params.balance_id), 'pages', limit],
+    queryFn: ({ pageParam }) => expenseService.getExpensesPage({ ...params, cursor: pageParam, limit }),
+    initialPageParam: params.cursor,
+    getNextPageParam: (lastPage: Page<Expense>) => lastPage.next_cursor ?? undefined,
+    enabled,
     staleTime: 2 * 60 * 1000, // 2 minutes
     gcTime: 10 * 60 * 1000, // 10 minutes
   });
 };
 
-// Hook to get expenses by balance ID
+// Hook to page through expenses by balance ID
 export const useGetExpensesByBalance = (balanceId: number, enabled: boolean = true) => {
-  return useQuery({
-    queryKey: QUERY_KEYS.EXPENSE.LIST(balanceId),
-    queryFn: () => expenseService.getExpensesByBalance(balanceId),
-    enabled: enabled && !!balanceId,
-    staleTime: 2 * 60 * 1000,
-    gcTime: 10 * 60 * 1000,
-  });
+  return useGetExpenses({ balance_id: balanceId }, enabled && !!balanceId);
 };
 
 // Hook to get a specific expense by ID
@@ -190,9 +189,17 @@ export const useGetTopCategories = (
 
 // Combined hook for expense operations
 export const useExpenseOperations = (balanceId?: number) => {
-  const { data: expenses, isLoading, error } = useGetExpensesByBalance(
-    balanceId!, 
-    !!balanceId
+  const {
+    data: expensesPages,
+    isLoading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGetExpensesByBalance(balanceId!, !!balanceId);
+  const expenses = useMemo(
+    () => expensesPages?.pages.flatMap(page => page.items) ?? [],
+    [expensesPages]
   );
   const { data: stats, isLoading: statsLoading } = useGetExpenseStats(
     balanceId!, 
@@ -221,8 +228,8 @@ export const useExpenseOperations = (balanceId?: number) => {
     deleteMutation.error;
 
   return {
-    // Data
-    expenses: expenses || [],
+    // Data (the pages loaded so far, newest first)
+    expenses,
     stats,
     topCategories: topCategories || [],
     
@@ -231,6 +238,11 @@ export const useExpenseOperations = (balanceId?: number) => {
     
     // Error states
     error: hasError,
+
+    // Pagination
+    loadMoreExpenses: () => fetchNextPage(),
+    hasMoreExpenses: !!hasNextPage,
+    isLoadingMoreExpenses: isFetchingNextPage,
     
     // Operations
     createExpense: createMutation.mutateAsync,
@@ -240,7 +252,7 @@ export const useExpenseOperations = (balanceId?: number) => {
     
     // Computed values
     totalExpenses: stats?.total || 0,
-    expenseCount: expenses?.length || 0,
+    expenseCount: stats?.count || 0,
     averageExpense: stats?.average || 0,
     
     // Individual mutation states
@@ -157,7 +157,7 @@ export const useFinancialOverview = (balanceId: number | undefined) => {
     totalIncome,
     totalExpenses,
     netCashFlow,
-    incomeSourcesCount: incomes?.length || 0,
+    incomeSourcesCount: incomeStats?.sources?.length || 0,
     expensesCategoriesCount: expenseStats?.categories?.length || 0,
     suggestionsCount: suggestions?.suggestions?.length || 0,
     lastUpdated: new Date(),
@@ -166,7 +166,7 @@ export const useFinancialOverview = (balanceId: number | undefined) => {
     totalIncome,
     totalExpenses,
     netCashFlow,
-    incomes,
+    incomeStats,
     expenseStats,
     suggestions,
   ]);
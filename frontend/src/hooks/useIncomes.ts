@@ -1,28 +1,27 @@
 // src/hooks/useIncomes.ts
-import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
+import { useMemo } from 'react';
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { incomeService, GetIncomesParams } from '../services/income.service';
-import { Income, IncomeCreate, IncomeUpdate } from '../types/financial.types';
-import { QUERY_KEYS } from '../utils/constants';
+import { Income, IncomeCreate, IncomeUpdate, Page } from '../types/financial.types';
+import { PAGINATION, QUERY_KEYS } from '../utils/constants';
 
-// Hook to get all incomes (with optional filtering)
-export const useGetIncomes = (params: GetIncomesParams = {}) => {
-  return useQuery({
-    queryKey: QUERY_KEYS.INCOME.LIST(params.balance_id),
-    queryFn: () => incomeService.getIncomes(params),
+// Hook to page through incomes (with optional filtering), one page per fetchNextPage()
+export const useGetIncomes = (params: GetIncomesParams = {}, enabled: boolean = true) => {
+  const limit = params.limit ?? PAGINATION.LIST_PAGE_SIZE;
+  return useInfiniteQuery({
+    queryKey: [...QUERY_KEYS.INCOME.LIST(params.balance_id), 'pages', limit],
+    queryFn: ({ pageParam }) => incomeService.getIncomesPage({ ...params, cursor: pageParam, limit }),
+    initialPageParam: params.cursor,
+    getNextPageParam: (lastPage: Page<Income>) => lastPage.next_cursor ?? undefined,
+    enabled,
     staleTime: 2 * 60 * 1000, // 2 minutes
     gcTime: 10 * 60 * 1000, // 10 minutes
   });
 };
 
-// Hook to get incomes by balance ID
+// Hook to page through incomes by balance ID
 export const useGetIncomesByBalance = (balanceId: number, enabled: boolean = true) => {
-  return useQuery({
-    queryKey: QUERY_KEYS.INCOME.LIST(balanceId),
-    queryFn: () => incomeService.getIncomesByBalance(balanceId),
-    enabled: enabled && !!balanceId,
-    staleTime: 2 * 60 * 1000,
-    gcTime: 10 * 60 * 1000,
-  });
+  return useGetIncomes({ balance_id: balanceId }, enabled && !!balanceId);
 };
 
 // Hook to get a specific income by ID
@@ -175,9 +174,17 @@ export const useGetIncomeStats = (balanceId: number, enabled: boolean = true) =>
 
 // Combined hook for income operations
 export const useIncomeOperations = (balanceId?: number) => {
-  const { data: incomes, isLoading, error } = useGetIncomesByBalance(
-    balanceId!, 
-    !!balanceId
+  const {
+    data: incomesPages,
+    isLoading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useGetIncomesByBalance(balanceId!, !!balanceId);
+  const incomes = useMemo(
+    () => incomesPages?.pages.flatMap(page => page.items) ?? [],
+    [incomesPages]
   );
   const { data: stats, isLoading: statsLoading } = useGetIncomeStats(
     balanceId!, 
@@ -200,8 +207,8 @@ export const useIncomeOperations = (balanceId?: number) => {
     deleteMutation.error;
 
   return {
-    // Data
-    incomes: incomes || [],
+    // Data (the pages loaded so far, newest first)
+    incomes,
     stats,
     
     // Loading states
@@ -209,6 +216,11 @@ export const useIncomeOperations = (balanceId?: number) => {
     
     // Error states
     error: hasError,
+
+    // Pagination
+    loadMoreIncomes: () => fetchNextPage(),
+    hasMoreIncomes: !!hasNextPage,
+    isLoadingMoreIncomes: isFetchingNextPage,
     
     // Operations
     createIncome: createMutation.mutateAsync,
@@ -218,7 +230,7 @@ export const useIncomeOperations = (balanceId?: number) => {
     
     // Computed values
     totalIncome: stats?.total || 0,
-    incomeCount: incomes?.length || 0,
+    incomeCount: stats?.count || 0,
     
     // Individual mutation states
     mutations: {
@@ -88,6 +88,9 @@ export const Dashboard: React.FC = () => {
     stats: incomeStats,
     totalIncome,
     isLoading: incomeLoading,
+    loadMoreIncomes,
+    hasMoreIncomes,
+    isLoadingMoreIncomes,
   } = useIncomeOperations(userBalance?.id);
   
   const {
@@ -96,6 +99,9 @@ export const Dashboard: React.FC = () => {
     totalExpenses,
     topCategories,
     isLoading: expenseLoading,
+    loadMoreExpenses,
+    hasMoreExpenses,
+    isLoadingMoreExpenses,
   } = useExpenseOperations(userBalance?.id);
   
   const {
@@ -548,7 +554,7 @@ export const Dashboard: React.FC = () => {
                 <Typography variant="subtitle2" color="success.main" gutterBottom>
                   Recent Income
                 </Typography>
-                {incomes.slice(0, 3).map((income, index) => (
+                {incomes.map((income) => (
                   <Box key={income.id} display="flex" justifyContent="space-between" py={0.5}>
                     <Typography variant="body2">{income.source}</Typography>
                     <Typography variant="body2" color="success.main">
@@ -561,6 +567,16 @@ export const Dashboard: React.FC = () => {
                     No income recorded yet
                   </Typography>
                 )}
+                {hasMoreIncomes && (
+                  <Button
+                    size="small"
+                    onClick={loadMoreIncomes}
+                    disabled={isLoadingMoreIncomes}
+                    sx={{ mt: 1 }}
+                  >
+                    {isLoadingMoreIncomes ? 'Loading...' : 'Load more'}
+                  </Button>
+                )}
               </Box>
               
               {/* Recent Expenses */}
@@ -568,7 +584,7 @@ export const Dashboard: React.FC = () => {
                 <Typography variant="subtitle2" color="error.main" gutterBottom>
                   Recent Expenses
                 </Typography>
-                {expenses.slice(0, 3).map((expense, index) => (
+                {expenses.map((expense) => (
                   <Box key={expense.id} display="flex" justifyContent="space-between" py={0.5}>
                     <Typography variant="body2">{expense.category}</Typography>
                     <Typography variant="body2" color="error.main">
@@ -581,6 +597,16 @@ export const Dashboard: React.FC = () => {
                     No expenses recorded yet
                   </Typography>
                 )}
+                {hasMoreExpenses && (
+                  <Button
+                    size="small"
+                    onClick={loadMoreExpenses}
+                    disabled={isLoadingMoreExpenses}
+                    sx={{ mt: 1 }}
+                  >
+                    {isLoadingMoreExpenses ? 'Loading...' : 'Load more'}
+                  </Button>
+                )}
               </Box>
             </Box>
           </CardContent>
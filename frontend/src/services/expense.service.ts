@@ -3,13 +3,14 @@ import { apiClient } from './api';
 import { 
   Expense, 
   ExpenseCreate, 
-  ExpenseUpdate 
+  ExpenseUpdate,
+  Page
 } from '../types/financial.types';
-import { API_ENDPOINTS } from '../utils/constants';
+import { API_ENDPOINTS, PAGINATION } from '../utils/constants';
 
 export interface GetExpensesParams {
   balance_id?: number;
-  skip?: number;
+  cursor?: string;
   limit?: number;
 }
 
@@ -20,17 +21,30 @@ export const expenseService = {
     return response.data;
   },
 
-  // Get all expenses with optional filtering
-  async getExpenses(params: GetExpensesParams = {}): Promise<Expense[]> {
-    const response = await apiClient.get<Expense[]>(API_ENDPOINTS.EXPENSE.LIST, { 
+  // Get one page of expenses (newest first) with optional filtering
+  async getExpensesPage(params: GetExpensesParams = {}): Promise<Page<Expense>> {
+    const response = await apiClient.get<Page<Expense>>(API_ENDPOINTS.EXPENSE.LIST, { 
       params 
     });
     return response.data;
   },
 
-  // Get expenses by balance ID
+  // Get every expense with optional filtering, following cursors at the maximum page size.
+  // Only for charts and stats that need all rows; lists should load one page at a time.
+  async getAllExpenses(params: GetExpensesParams = {}): Promise<Expense[]> {
+    const expenses: Expense[] = [];
+    let cursor = params.cursor;
+    do {
+      const page = await this.getExpensesPage({ ...params, cursor, limit: PAGINATION.MAX_PAGE_SIZE });
+      expenses.push(...page.items);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return expenses;
+  },
+
+  // Get every expense of a balance (for stats)
   async getExpensesByBalance(balanceId: number): Promise<Expense[]> {
-    return this.getExpenses({ balance_id: balanceId });
+    return this.getAllExpenses({ balance_id: balanceId });
   },
 
   // Get specific expense by ID
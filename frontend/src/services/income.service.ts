@@ -3,13 +3,14 @@ import { apiClient } from './api';
 import { 
   Income, 
   IncomeCreate, 
-  IncomeUpdate 
+  IncomeUpdate,
+  Page
 } from '../types/financial.types';
-import { API_ENDPOINTS } from '../utils/constants';
+import { API_ENDPOINTS, PAGINATION } from '../utils/constants';
 
 export interface GetIncomesParams {
   balance_id?: number;
-  skip?: number;
+  cursor?: string;
   limit?: number;
 }
 
@@ -20,17 +21,30 @@ export const incomeService = {
     return response.data;
   },
 
-  // Get all incomes with optional filtering
-  async getIncomes(params: GetIncomesParams = {}): Promise<Income[]> {
-    const response = await apiClient.get<Income[]>(API_ENDPOINTS.INCOME.LIST, { 
+  // Get one page of incomes (newest first) with optional filtering
+  async getIncomesPage(params: GetIncomesParams = {}): Promise<Page<Income>> {
+    const response = await apiClient.get<Page<Income>>(API_ENDPOINTS.INCOME.LIST, { 
       params 
     });
     return response.data;
   },
 
-  // Get incomes by balance ID
+  // Get every income with optional filtering, following cursors at the maximum page size.
+  // Only for charts and stats that need all rows; lists should load one page at a time.
+  async getAllIncomes(params: GetIncomesParams = {}): Promise<Income[]> {
+    const incomes: Income[] = [];
+    let cursor = params.cursor;
+    do {
+      const page = await this.getIncomesPage({ ...params, cursor, limit: PAGINATION.MAX_PAGE_SIZE });
+      incomes.push(...page.items);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return incomes;
+  },
+
+  // Get every income of a balance (for stats)
   async getIncomesByBalance(balanceId: number): Promise<Income[]> {
-    return this.getIncomes({ balance_id: balanceId });
+    return this.getAllIncomes({ balance_id: balanceId });
   },
 
   // Get specific income by ID
@@ -19,6 +19,12 @@ export interface Expense {
   created_at: string;
 }
 
+// Keyset-paginated list response (pass next_cursor back as `cursor`)
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface FinancialSuggestion {
   category: string;
   details: string;
@@ -73,6 +73,11 @@ export const VALIDATION = {
   EMAIL_MAX_LENGTH: 255,
 } as const;
 
+export const PAGINATION = {
+  LIST_PAGE_SIZE: 5, // Rows per "load more" in list views
+  MAX_PAGE_SIZE: 500, // Backend maximum; used when every row is needed (charts, stats)
+} as const;
+
 export const UI = {
   DRAWER_WIDTH: 240,
   HEADER_HEIGHT: 64,